@@ -0,0 +1,118 @@
+"""Cube/CUBE* timings on synthetic Product x Region x Year fact tables of 10^4-10^7 rows."""
+import pytest
+import excelfred as xl
+from conftest import run, sizes
+
+ROWS = sizes(10**4, 10**5, 10**6, 10**7)
+
+@pytest.mark.benchmark(group="cube-member")
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cubemember_by_caption(benchmark, cube_of_size, rows):
+    cube = cube_of_size(rows)
+    run(benchmark, xl.CUBEMEMBER, cube, "[Product].[Product P0999]")
+
+@pytest.mark.benchmark(group="cube-member")
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cubememberproperty(benchmark, cube_of_size, rows):
+    cube = cube_of_size(rows)
+    run(benchmark, xl.CUBEMEMBERPROPERTY, cube, "[Product].[P0500]", "caption")
+
+@pytest.mark.benchmark(group="cube-value")
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cubevalue_member(benchmark, cube_of_size, rows):
+    cube = cube_of_size(rows)
+    run(benchmark, xl.CUBEVALUE, cube, "[Product].[P0001]", "[Region].[R01]", "Sales", n=rows)
+
+@pytest.mark.benchmark(group="cube-value")
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cubevalue_set_cross_product(benchmark, cube_of_size, rows):
+    cube = cube_of_size(rows)
+    regions, years = xl.CUBESET(cube, "Region"), xl.CUBESET(cube, "Year")
+    run(benchmark, xl.CUBEVALUE, cube, regions, years, "Sales", n=rows)
+
+@pytest.mark.benchmark(group="cube-value")
+@pytest.mark.parametrize("workers", [1, 4])
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cubevalue_full_grid(benchmark, cube_of_size, rows, workers):
+    cube = cube_of_size(rows)
+    grid = [xl.CUBESET(cube, d) for d in ("Product", "Region", "Year")]
+    run(benchmark, xl.CUBEVALUE, cube, *grid, "Sales", workers=workers, chunk_size=1 << 18, n=rows)
+
+@pytest.mark.benchmark(group="cube-value")
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cubevalue_grid(benchmark, cube_of_size, rows):
+    cube = cube_of_size(rows)
+    run(benchmark, xl.CUBEVALUE_GRID, cube, "Sales", xl.CUBESET(cube, "Product"), xl.CUBESET(cube, "Year"), "[Region].[R01]", n=rows)
+
+@pytest.mark.benchmark(group="cube-value")
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cubevalue_last_non_empty(benchmark, cube_of_size, rows):
+    cube = cube_of_size(rows)
+    run(benchmark, xl.CUBEVALUE, cube, xl.CUBESET(cube, "Region"), "InventoryEnd", n=rows)
+
+@pytest.mark.benchmark(group="cube-value")
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cubevalue_kpi(benchmark, cube_of_size, rows):
+    cube = cube_of_size(rows)
+    kpi = xl.CUBEKPIMEMBER(cube, "Revenue KPI", "status")
+    run(benchmark, xl.CUBEVALUE, cube, xl.CUBESET(cube, "Region"), kpi, n=rows)
+
+@pytest.mark.benchmark(group="cube-out-of-core")
+@pytest.mark.parametrize("rows", sizes(10**4, 10**5, 10**6))
+def bench_cubevalue_out_of_core(benchmark, tmp_path, rows):
+    """Same cube streamed from year-sorted CSV chunk files; single-year queries skip chunks by min/max statistics."""
+    from conftest import build_cube
+    cube = build_cube(rows); df = cube.data.sort_values("Year", kind="stable"); step = max(rows // 8, 1); paths = []
+    for i in range(0, rows, step): paths.append(tmp_path / f"chunk_{i // step}.csv"); df.iloc[i:i + step].to_csv(paths[-1], index=False)
+    cube.add_data(paths, chunk_rows=max(step // 4, 1))
+    run(benchmark, xl.CUBEVALUE, cube, xl.CUBESET(cube, "Region"), "[Year].[2024]", "InventoryEnd", n=rows)
+
+@pytest.mark.benchmark(group="cube-set")
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cubeset_sort_by_measure(benchmark, cube_of_size, rows):
+    cube = cube_of_size(rows)
+    run(benchmark, xl.CUBESET, cube, "Product", "Top products", 6, "Sales", n=rows * 100)
+
+@pytest.mark.benchmark(group="cube-set")
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cuberankedmember(benchmark, cube_of_size, rows):
+    cube = cube_of_size(rows)
+    ranked = xl.CUBESET(cube, "Product", "Top products", 6, "Sales")
+    run(benchmark, xl.CUBERANKEDMEMBER, cube, ranked, 3)
+
+@pytest.mark.benchmark(group="cube-set")
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cubesetcount(benchmark, cube_of_size, rows):
+    cube = cube_of_size(rows)
+    run(benchmark, xl.CUBESETCOUNT, xl.CUBESET(cube, "Product"))
+
+@pytest.mark.benchmark(group="cube-member")
+@pytest.mark.parametrize("rows", ROWS)
+def bench_cubekpimember(benchmark, cube_of_size, rows):
+    cube = cube_of_size(rows)
+    run(benchmark, xl.CUBEKPIMEMBER, cube, "Revenue KPI", "status")
+
+@pytest.mark.benchmark(group="cube-concurrency")
+@pytest.mark.parametrize("threads", [1, 4])
+def bench_cubevalue_concurrent_readers(benchmark, threads):
+    """Stress: reader threads query while a writer republishes the data; every read must see one whole version."""
+    import threading
+    from conftest import build_cube
+    cube = build_cube(10**5); base = cube.data; doubled = base.assign(Sales=base["Sales"] * 2)
+    regions = xl.CUBESET(cube, "Region")
+    expected = {xl.CUBEVALUE(cube, regions, "Sales")}; cube.add_data(doubled, compact=False)
+    expected.add(xl.CUBEVALUE(cube, regions, "Sales")); cube.add_data(base, compact=False)
+    seen, stop = [], threading.Event()
+    def writer():
+        flip = False
+        while not stop.is_set(): cube.add_data(doubled if flip else base, compact=False); flip = not flip
+    def reader():
+        for _ in range(20): seen.append(xl.CUBEVALUE(cube, regions, "Sales"))
+    def stress():
+        w = threading.Thread(target=writer); w.start()
+        readers = [threading.Thread(target=reader) for _ in range(threads)]
+        for t in readers: t.start()
+        for t in readers: t.join()
+        stop.set(); w.join()
+    benchmark.pedantic(stress, rounds=1, iterations=1)
+    assert len(seen) == 20 * threads and set(seen) <= expected
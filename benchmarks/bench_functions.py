@@ -0,0 +1,146 @@
+"""Scalar timings for every exported function (inputs taken from its docstring examples) and 10^3/10^6-element timings for the array functions."""
+import numpy as np, pandas as pd, pytest
+import excelfred as xl
+from conftest import docstring_example, public_functions, run, sizes
+
+# functions whose docstrings have no self-contained example call
+SCALAR_CASES = {
+    "ACCRINT":         (("01-03-2008", "31-08-2008", "01-05-2008", 0.1, 1000, 2, 0), {}),
+    "ACCRINTM":        (("01-04-2008", "15-06-2008", 0.1, 1000, 3), {}),
+    "BITNAND":         ((5, 3), {}),
+    "CONFIDENCE_NORM": ((0.05, 2.5, 50), {}),
+    "CONFIDENCE_T":    ((0.05, 2.5, 50), {}),
+    "CUMIPMT":         ((0.05 / 12, 60, 10000, 1, 12, 0), {}),
+    "CUMPRINC":        ((0.05 / 12, 60, 10000, 1, 12, 0), {}),
+}
+
+@pytest.mark.benchmark(group="scalar")
+@pytest.mark.parametrize("name", public_functions())
+def bench_scalar(benchmark, name):
+    if name.startswith("CUBE"): pytest.skip("timed against synthetic cubes in bench_cube.py")
+    example = SCALAR_CASES.get(name) or docstring_example(name)
+    if example is None: pytest.skip(f"no runnable docstring example for {name}")
+    args, kwargs = example
+    benchmark(getattr(xl, name), *args, **kwargs)
+
+def _data(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.random(n), rng.random(n), rng.integers(0, 60, n)
+
+ARRAY_CASES = {
+    "AGGREGATE":    lambda x, y, i: ((9, 6, x), {}),
+    "ARRAYTOTEXT":  lambda x, y, i: ((x, 1), {}),
+    "AVEDEV":       lambda x, y, i: ((x.tolist(),), {}),
+    "AVERAGE":      lambda x, y, i: ((x.tolist(),), {}),
+    "AVERAGEA":     lambda x, y, i: ((x,), {}),
+    "AVERAGEIF":    lambda x, y, i: ((x, ">0.5"), {}),
+    "AVERAGEIFS":   lambda x, y, i: ((x, y, ">0.5"), {}),
+    "CEILING_MATH": lambda x, y, i: ((x * 100 - 50, 0.5), {}),
+    "COMBIN":       lambda x, y, i: ((i, i // 2), {}),
+    "COMBINA":      lambda x, y, i: ((i + 1, i // 2), {}),
+    "CONCAT":       lambda x, y, i: ((x,), {}),
+    "CORREL":       lambda x, y, i: ((x, y), {}),
+    "COUNT":        lambda x, y, i: ((x,), {}),
+    "COUNTA":       lambda x, y, i: ((x,), {}),
+    "COUNTBLANK":   lambda x, y, i: ((x,), {}),
+    "COUNTIF":      lambda x, y, i: ((x, ">0.5"), {}),
+    "COUNTIFS":     lambda x, y, i: ((x, ">0.5", y, "<0.5"), {}),
+    "COVARIANCE_P": lambda x, y, i: ((x, y), {}),
+    "COVARIANCE_S": lambda x, y, i: ((x, y), {}),
+}
+
+@pytest.mark.benchmark(group="array")
+@pytest.mark.parametrize("n", sizes(10**3, 10**6))
+@pytest.mark.parametrize("name", sorted(ARRAY_CASES))
+def bench_array(benchmark, name, n):
+    args, kwargs = ARRAY_CASES[name](*_data(n))
+    run(benchmark, getattr(xl, name), *args, n=n, **kwargs)
+
+@pytest.mark.benchmark(group="formula")
+@pytest.mark.parametrize("cached", [False, True], ids=["parse", "cached"])
+def bench_evaluate(benchmark, cached):
+    formula = '=CONVERT(x, "mi", "km") * 2 + BETA.DIST(0.5, 2, 3, TRUE) & "km"'
+    def call():
+        if not cached: xl._formula_cache.clear()
+        return xl.evaluate(formula, {"x": 3})
+    benchmark(call)
+
+@pytest.mark.benchmark(group="workbook")
+@pytest.mark.parametrize("full", [True, False], ids=["full", "incremental"])
+def bench_workbook_recalculate(benchmark, full):
+    """A 2000-cell running total plus 2000 leaf formulas; the incremental case edits the input of the last 10 links only."""
+    wb = xl.Workbook(); s = wb.add_sheet("S"); s["A1"] = 1
+    for i in range(2, 2001): s[f"A{i}"] = f"=A{i - 1} + 1"
+    for i in range(1, 2001): s[f"B{i}"] = f"=A{i} * 2"
+    wb.recalculate()
+    def edit():
+        s["A1990"] = "=A1989 + 2"
+        return wb.recalculate(full=full)
+    benchmark(edit)
+
+@pytest.mark.benchmark(group="workbook")
+@pytest.mark.parametrize("workers", [1, 4])
+def bench_workbook_parallel_levels(benchmark, workers):
+    """100 independent AGGREGATE cells over 10^4-value ranges form one dependency level; workers > 1 evaluates them in threads."""
+    rng = np.random.default_rng(0); wb = xl.Workbook(workers=workers); s = wb.add_sheet("S")
+    wb.names["Data"] = rng.random(10**4)
+    for i in range(1, 101): s[f"A{i}"] = f"=AGGREGATE({1 + i % 7}, 6, Data)"
+    run(benchmark, wb.recalculate, full=True, n=10**4)
+
+@pytest.mark.benchmark(group="reference")
+@pytest.mark.parametrize("n", sizes(10**3, 10**6))
+def bench_reference_values(benchmark, n):
+    """Parse (memoized) and resolve "B2:D<n>" to a NumPy view of a float frame."""
+    df = pd.DataFrame(np.random.default_rng(0).random((n, 4)))
+    benchmark(lambda: xl.Reference(f"Sheet1!$B$2:D{n}", df).values)
+
+@pytest.mark.benchmark(group="range")
+@pytest.mark.parametrize("wrap", [False, True], ids=["series", "range"])
+@pytest.mark.parametrize("n", sizes(10**3, 10**5))
+def bench_range_chain(benchmark, n, wrap):
+    """COUNTIF, AVERAGEIF and AGGREGATE chained over the same float column, passed as a Series or wrapped once in a Range."""
+    values = pd.Series(np.random.default_rng(0).random(n) * 100)
+    data = xl.Range(values) if wrap else values
+    benchmark(lambda: (xl.COUNTIF(data, ">50"), xl.AVERAGEIF(data, ">50"), xl.AGGREGATE(9, 6, data)))
+
+@pytest.mark.benchmark(group="spill")
+@pytest.mark.parametrize("name, make", [("ACOS", lambda rng, n: rng.random(n) * 2.2 - 1.1), ("BITAND", lambda rng, n: rng.integers(0, 2**20, n)),
+                                        ("CODE", lambda rng, n: np.array(["abc", "Z", "x"] * (n // 3 + 1))[:n])], ids=["kernel", "int-kernel", "per-cell"])
+@pytest.mark.parametrize("n", sizes(10**3, 10**5))
+def bench_spill(benchmark, name, make, n):
+    """One spilled call over n cells (ACOS has ~10% out-of-domain cells that take the scalar path)."""
+    rng = np.random.default_rng(0); args = (make(rng, n),) if name != "BITAND" else (make(rng, n), make(rng, n))
+    with xl.spilling: run(benchmark, getattr(xl, name), *args, n=n)
+
+@pytest.mark.benchmark(group="accessor")
+@pytest.mark.parametrize("how", ["apply", "accessor"])
+@pytest.mark.parametrize("n", sizes(10**3, 10**5))
+def bench_accessor_rows(benchmark, n, how):
+    """BASE(number, radix) per row of a two-column frame: df.apply(axis=1) against the df.xl row loop."""
+    rng = np.random.default_rng(0); df = pd.DataFrame({"number": rng.integers(0, 10**6, n), "radix": rng.integers(2, 37, n)})
+    if how == "apply": run(benchmark, lambda: df.apply(lambda r: xl.BASE(r["number"], r["radix"]), axis=1), n=n)
+    else: run(benchmark, lambda: df.xl.BASE(xl.col("number"), xl.col("radix")), n=n)
+
+@pytest.mark.benchmark(group="registry")
+@pytest.mark.parametrize("what", ["listing", "lookup"])
+def bench_registry(benchmark, what):
+    """`xl.C` prefix listing and an Excel-name lookup ("_xlfn.CHISQ.DIST.RT") against the prebuilt registry."""
+    if what == "listing": benchmark(lambda: xl.C)
+    else: benchmark(xl.registry.get, "_xlfn.CHISQ.DIST.RT")
+
+@pytest.mark.benchmark(group="memoization")
+@pytest.mark.parametrize("memoize", [False, True], ids=["plain", "memoized"])
+def bench_memoized_convert(benchmark, memoize):
+    """10^4 CONVERT(x, "mi", "km") calls over 50 distinct x values, with and without the LRU caches."""
+    xs = [float(v) for v in np.random.default_rng(0).integers(0, 50, 10**4)]
+    if memoize: xl.memoization.enable(["CONVERT"], maxsize=1024)
+    try: benchmark(lambda: [xl.CONVERT(x, "mi", "km") for x in xs])
+    finally: xl.memoization.disable()
+
+@pytest.mark.benchmark(group="bessel")
+@pytest.mark.parametrize("kind", ["I", "J", "K", "Y"])
+@pytest.mark.parametrize("n", sizes(10**3, 10**6))
+def bench_bessel_grid(benchmark, kind, n):
+    """BESSEL<kind> over an n-point x grid against three orders (one fractional, truncated): a single 3 x n ufunc batch."""
+    grid = np.linspace(0.001, 50, n)
+    run(benchmark, getattr(xl, "BESSEL" + kind), grid, [[0], [1.7], [3]], n=n)
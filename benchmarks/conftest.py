@@ -0,0 +1,97 @@
+"""
+Benchmarks for excelfred (needs `pip install pytest-benchmark`, runs offline).
+
+    python -m pytest benchmarks --benchmark-autosave
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:15%
+
+`--benchmark-autosave` stores every run as JSON under `.benchmarks/`, `--benchmark-compare` checks the
+current tree against the latest saved run and fails on slowdowns. Use `--benchmark-json=out.json` for a one-off file.
+
+Array and Cube sizes go up to `EXCELFRED_BENCH_MAX` elements/rows (default 10**6);
+set `EXCELFRED_BENCH_MAX=10000000` for the full 10^7-row Cube tables.
+"""
+import inspect, os, re
+import numpy as np, pandas as pd, pytest
+import excelfred as xl
+
+MAX_SIZE = int(os.environ.get("EXCELFRED_BENCH_MAX", 10**6))
+
+def sizes(*candidates):
+    """Parameters for the sizes that fit under EXCELFRED_BENCH_MAX, larger ones are reported as skipped."""
+    return [pytest.param(n, id=f"n={n:.0e}", marks=[] if n <= MAX_SIZE else pytest.mark.skip(reason=f"above EXCELFRED_BENCH_MAX={MAX_SIZE}")) for n in candidates]
+
+def run(benchmark, fn, *args, n=1, **kwargs):
+    """Times `fn(*args, **kwargs)`; big inputs get a single round so 10^6+ cases stay practical."""
+    if n >= 10**5: return benchmark.pedantic(fn, args=args, kwargs=kwargs, rounds=1, iterations=1)
+    return benchmark(fn, *args, **kwargs)
+
+def public_functions():
+    """Every exported Excel function (upper-case module-level functions) in name order."""
+    return sorted(name for name, obj in vars(xl).items() if inspect.isfunction(obj) and name.isupper() and not name.startswith("_"))
+
+def _calls_in(text, name):
+    """Finds the `NAME(...)` call snippets in `text`, matching parentheses outside string literals."""
+    for m in re.finditer(rf"\b{name}\(", text):
+        depth, quote, i = 0, None, m.end() - 1
+        while i < len(text):
+            ch = text[i]
+            if quote:
+                if ch == quote: quote = None
+            elif ch in "'\"": quote = ch
+            elif ch == "(": depth += 1
+            elif ch == ")":
+                depth -= 1
+                if depth == 0: yield text[m.end():i]; break
+            elif ch == "\n": break
+            i += 1
+
+def docstring_example(name):
+    """Returns (args, kwargs) of the first docstring example of `name` that runs, executing the docstring's own `x = ...` setup lines first."""
+    doc = inspect.getdoc(getattr(xl, name)) or ""
+    ns = {"np": np, "pd": pd, "xl": xl, **{k: v for k, v in vars(xl).items() if not k.startswith("_")}}
+    ns["_capture"] = lambda *a, **k: (a, k)
+    for line in doc.splitlines():
+        line = line.strip().split("  #")[0]
+        if re.match(r"^[A-Za-z_]\w*\s*=[^=]", line):
+            try: exec(line, ns)
+            except Exception: pass
+    for snippet in _calls_in(doc, name):
+        try:
+            args, kwargs = eval(f"_capture({snippet})", ns)
+            getattr(xl, name)(*args, **kwargs)
+            return args, kwargs
+        except Exception: continue
+    return None
+
+def build_cube(rows, n_products=1000, n_regions=10, seed=0):
+    """Synthetic Product x Region x Year sales cube with `rows` fact rows."""
+    rng = np.random.default_rng(seed)
+    products = np.array([f"P{i:04d}" for i in range(n_products)], dtype=object)
+    regions = np.array([f"R{i:02d}" for i in range(n_regions)], dtype=object)
+    years = np.arange(2015, 2025)
+    df = pd.DataFrame({ "Product": products[rng.integers(0, n_products, rows)],
+                        "Region": regions[rng.integers(0, n_regions, rows)],
+                        "Year": years[rng.integers(0, len(years), rows)],
+                        "Sales": rng.random(rows) * 1000,
+                        "Qty": rng.integers(1, 20, rows),
+                        "InventoryEnd": rng.integers(0, 100, rows) })
+    cube = xl.Cube("BenchCube")
+    cube.add_data(df)
+    cube.add_dimension("Product", {p: {"caption": f"Product {p}", "unique_name": f"[Product].[{p}]", "unary": 1} for p in products})
+    cube.add_dimension("Region", {r: {"caption": f"Region {r}", "unique_name": f"[Region].[{r}]", "unary": 1} for r in regions})
+    cube.add_dimension("Year", {int(y): {"caption": str(y), "unique_name": f"[Year].[{y}]", "unary": 1} for y in years})
+    cube.add_measure("Sales", "Sales", agg="sum")
+    cube.add_measure("Qty", "Qty", agg="sum")
+    cube.add_measure("InventoryEnd", "InventoryEnd", agg="last_non_empty", time_dim="Year")
+    cube.add_kpi("Revenue KPI", {"value": "Sales", "goal": 5000, "status": lambda c, ctx: c.evaluate_measure_vectorized("Sales", ctx) / 5000})
+    return cube
+
+_cubes = {}
+
+@pytest.fixture
+def cube_of_size():
+    """Builds (once per size per session) the synthetic cube for a row count."""
+    def get(rows):
+        if rows not in _cubes: _cubes.clear(); _cubes[rows] = build_cube(rows)
+        return _cubes[rows]
+    return get
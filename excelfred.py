@@ -13,10 +13,8 @@ def __getattr__(name):
      # from excelfred import ...
     """
     if len(name) == 1 and name.isalpha(): 
-        letter = name.upper(); funcs = []
-        for obj_name, obj_value in globals().items():
-            if callable(obj_value) and obj_name.upper().startswith(letter): funcs.append(obj_name)
-        return sorted(funcs) if funcs else f"No functions starting with '{letter}'"
+        letter = name.upper(); funcs = registry.listing(letter)
+        return list(funcs) if funcs else f"No functions starting with '{letter}'"
     raise AttributeError(f"module 'excelfred' has no attribute '{name}'")
 
 #A
@@ -362,7 +360,8 @@ def AGGREGATE(function_num: int, options: int, array, k: float = None, *, hidden
     import pandas as pd, numpy as np
     if not isinstance(function_num, int) or not (1 <= function_num <= 19): raise ValueError("#VALUE! 🚫 function_num must be integer 1..19")
     if not isinstance(options, int) or not (0 <= options <= 7): raise ValueError("#VALUE! 🚫 options must be integer 0..7")
-    s = pd.Series(array).reset_index(drop=True)
+    if isinstance(array, Range): s = pd.Series(array.numbers(), copy=False); cells = pd.Series(~array.blank.ravel())
+    else: s = pd.Series(array).reset_index(drop=True); cells = None
     n = len(s)
     def _validate_mask(name, mask):
         if mask is None: return pd.Series([False]*n)
@@ -376,12 +375,12 @@ def AGGREGATE(function_num: int, options: int, array, k: float = None, *, hidden
     ignore_subtotals = options in (4,5,6,7)
     coerced = pd.to_numeric(s, errors='coerce')  
     s = coerced
-    keep_mask = pd.Series([True]*n)
+    keep_mask = pd.Series([True]*n) if cells is None else cells.copy()
     if ignore_hidden: keep_mask &= ~hidden_mask
     if ignore_subtotals: keep_mask &= ~subtotal_mask
     if ignore_errors: keep_mask &= ~s.isna()
     data = s[keep_mask].to_numpy(dtype=float)
-    eff_mask = pd.Series([True]*n)
+    eff_mask = pd.Series([True]*n) if cells is None else cells.copy()
     if ignore_hidden: eff_mask &= ~hidden_mask
     if ignore_subtotals: eff_mask &= ~subtotal_mask
     eff_data = s[eff_mask]
@@ -614,13 +613,15 @@ def AREAS(*args) -> int:
         print(AREAS('A1:B2, C3:D4'))                            # 2
         print(AREAS(pd.DataFrame({"A": [1, 2], "B": [3, 4]})))  # 2 
         print(AREAS(pd.Series([1, 2, 3])))                      # 1 
+        print(AREAS(Reference("Sheet1!A1:B2,D4")))              # 2
     """
     import pandas as pd, numpy as np
     total = 0
     for arg in args:
-        if isinstance(arg, pd.DataFrame): total += len(arg.columns)
+        if isinstance(arg, Reference): total += len(arg.areas)
+        elif isinstance(arg, pd.DataFrame): total += len(arg.columns)
         elif isinstance(arg, pd.Series): total += 1
-        elif isinstance(arg, np.array): total += 1
+        elif isinstance(arg, np.ndarray): total += 1
         elif isinstance(arg, str):
             cleaned = arg.replace(" ", "")
             refs = cleaned.split(",")
@@ -628,40 +629,64 @@ def AREAS(*args) -> int:
         else: raise ValueError("🚫 #VALUE!") 
     return total
 
-def ARRAYTOTEXT(array, format=0) -> str:
+def ARRAYTOTEXT(array, format=0, chunk_size: int | None = None) -> str:
     """
     `=ARRAYTOTEXT(array, [format])` Returns a **text** representation of an **array**.
     
     Parameters:
-        array: Enter a list or an array
+        array: Enter a list or an array (also NumPy arrays, pandas Series and DataFrames)
         format: Decides Consice or Strict
         0 -> Enclosed with **Square**, seperated with **Commas**
         1 -> Enclosed with **Curly Brace**, seperated with **semi-colon**
+        chunk_size (optional): If given, returns a generator of text pieces built `chunk_size` cells at a time instead of one string
     
     *Example Inputs*:
 
-     ARRAYTOTEXT(["apple", "banana", "cherry"])             # "apple","banana","cherry"
+     ARRAYTOTEXT(["apple", "banana", "cherry"])             # ["apple,banana,cherry"]
      ARRAYTOTEXT(["apple", "banana", "cherry"], format=1)   # {"apple";"banana";"cherry"}
-     ARRAYTOTEXT([[1, 2], True, False], format=0)           # "1,2","1","0"
-     ARRAYTOTEXT([[1, 2], [3, 4], None], format=1)          # {"1,2";"3,4";""}
-     ARRAYTOTEXT(pd.Series(["X", "Y", "Z"]), format=True)  # {"X";"Y";"Z"}
-     ARRAYTOTEXT(np.array(["A", "B", "C"]), format=False)    # "A","B","C" 
-    """
-    rows = []
-    def to_excel_val(val):
-        if val is None: return "" if format == 0 else '""'
-        if isinstance(val, bool): return "1" if format == 0 and val else ("0" if format == 0 else ('"1"' if val else '"0"'))
-        if isinstance(val, (int, float)): return str(val) if format == 0 else f'"{val}"'
-        return str(val) if format == 0 else f'"{val}"'
-    if not isinstance(array, (list, tuple)): array = [[array]]
-    elif all(not isinstance(row, (list, tuple)) for row in array): array = [array]
-    for row in array:
-        if not isinstance(row, (list, tuple)): row = [row]
-        if format == 0: rows.append(f'"{",".join(to_excel_val(x) for x in row)}"')
-        else: rows.append(";".join(to_excel_val(x) for x in row)) 
-    if format == 0: return "[" + ",".join(rows) + "]"
-    elif format==1: return "{" + ";".join(rows) + "}"
-    else: raise ValueError("#VALUE!")
+     ARRAYTOTEXT([[1, 2], True, False], format=0)           # ["1,2","1","0"]
+     ARRAYTOTEXT([[1, 2], [3, 4], None], format=1)          # {"1";"2";"3";"4";""}
+     ARRAYTOTEXT(pd.Series(["X", "Y", "Z"]), format=True)   # {"X";"Y";"Z"}
+     ARRAYTOTEXT(np.array(["A", "B", "C"]), format=False)   # ["A,B,C"]
+     "".join(ARRAYTOTEXT(big_df, 1, chunk_size=100000))     # streamed, same text as ARRAYTOTEXT(big_df, 1)
+
+    `NumPy/pandas inputs are formatted column by column from their own dtype; None and NaN are blank cells, text in strict format has its quotes doubled.`
+    """
+    import io
+    if format not in (0, 1): raise ValueError("#VALUE!")
+    pieces = _arraytotext_pieces(array, format, chunk_size or 65536)
+    if chunk_size: return pieces
+    buf = io.StringIO()
+    for piece in pieces: buf.write(piece)
+    return buf.getvalue()
+
+def _arraytotext_pieces(array, format, chunk_size):
+    """Generator behind ARRAYTOTEXT, yields the text of `array` piece by piece."""
+    import numpy as np, pandas as pd
+    bools, blank = ("1", "0"), None
+    def cell(s):
+        if format == 0: return "" if s is None else s
+        return '""' if s is None else '"' + s.replace('"', '""') + '"'
+    def row_text(cells): return '"' + ",".join(map(cell, cells)) + '"' if format == 0 else ";".join(map(cell, cells))
+    sep = "," if format == 0 else ";"
+    yield "[" if format == 0 else "{"
+    if isinstance(array, pd.DataFrame) or (isinstance(array, np.ndarray) and array.ndim == 2):
+        first = True
+        for block in _text_row_blocks(array, chunk_size, bools, blank):
+            if not block: continue
+            yield ("" if first else sep) + sep.join(map(row_text, block)); first = False
+    else:
+        if isinstance(array, (np.ndarray, pd.Series, pd.Index)): rows = [array]
+        elif not isinstance(array, (list, tuple)): rows = [[array]]
+        elif all(not isinstance(row, (list, tuple)) for row in array): rows = [array]
+        else: rows = [row if isinstance(row, (list, tuple)) else [row] for row in array]
+        for r, row in enumerate(rows):
+            if r: yield sep
+            if format == 0: yield '"'
+            for c, chunk in enumerate(_text_chunks(row, chunk_size, bools, blank)):
+                yield ("" if c == 0 else sep) + sep.join(map(cell, chunk))
+            if format == 0: yield '"'
+    yield "]" if format == 0 else "}"
 
 def ASIN(*args: int | float | str) -> float:
     """
@@ -819,11 +844,12 @@ def AVEDEV(*args) -> float:
      print(AVEDEV("apple", "banana"))              # 🚫 #DIV/0!
     """
     import numpy as np
-    values = []
+    values, ranges = [], []
     def extract_numbers(item):
         if isinstance(item, (list, tuple)):
             for sub in item:
                 extract_numbers(sub)
+        elif isinstance(item, Range): numbers = item.numbers(); ranges.append(numbers[~np.isnan(numbers)])
         elif isinstance(item, bool): values.append(1 if item else 0)
         elif isinstance(item, (int, float)): values.append(item)
         elif isinstance(item, str):
@@ -836,8 +862,8 @@ def AVEDEV(*args) -> float:
                 except ValueError: pass
         elif item is None: pass
     for arg in args: extract_numbers(arg)
-    if not values: raise ValueError("🚫 #DIV/0!")
-    arr = np.array(values, dtype=float)
+    arr = np.concatenate([np.array(values, dtype=float)] + ranges)
+    if not arr.size: raise ValueError("🚫 #DIV/0!")
     mean_val = np.mean(arr)
     abs_dev = np.abs(arr - mean_val)
     return np.mean(abs_dev)
@@ -859,11 +885,13 @@ def AVERAGE(*args) -> float:
      print(AVERAGE("apple", "banana"))               # #DIV/0!
      print(AVERAGE([1, 2], (3, 4), "5"))             # 3
     """
-    values = []
+    import numpy as np
+    values, ranges = [], []
     def extract_numbers(item):
         if isinstance(item, (list, tuple)):
             for sub in item:
                 extract_numbers(sub)
+        elif isinstance(item, Range): numbers = item.numbers(); ranges.append(numbers[~np.isnan(numbers)])
         elif isinstance(item, bool): values.append(1 if item else 0)
         elif isinstance(item, (int, float)): values.append(item)
         elif isinstance(item, str):
@@ -876,8 +904,9 @@ def AVERAGE(*args) -> float:
                 except ValueError: pass 
         elif item is None: pass
     for arg in args: extract_numbers(arg)
-    if not values: raise ValueError("🚫 #DIV/0!")
-    return sum(values) / len(values)
+    n = len(values) + sum(r.size for r in ranges)
+    if not n: raise ValueError("🚫 #DIV/0!")
+    return (sum(values) + sum(float(r.sum()) for r in ranges)) / n
 
 def AVERAGEA(*values) -> float:
     """
@@ -894,9 +923,10 @@ def AVERAGEA(*values) -> float:
      print(AVERAGEA("apple", "banana"))                   # (0 + 0) / 2 = 0.0
     """
     import numpy as np
-    processed = []
+    processed, ranges = [], []
     for v in values:
-        if isinstance(v, (list, tuple, np.ndarray)): processed.extend(v)
+        if isinstance(v, Range): numbers = v.numbers(text=0.0, logicals=True); ranges.append(numbers[~np.isnan(numbers)])
+        elif isinstance(v, (list, tuple, np.ndarray)): processed.extend(v)
         else: processed.append(v)
     converted = []
     for v in processed:
@@ -904,6 +934,7 @@ def AVERAGEA(*values) -> float:
         elif isinstance(v, (int, float)) and not isinstance(v, bool): converted.append(v)     
         elif v is None: continue
         else: converted.append(0)
+    converted = np.concatenate([np.array(converted, dtype=float)] + ranges)
     if len(converted) == 0: return np.nan
     return np.mean(converted)
 
@@ -930,6 +961,10 @@ def AVERAGEIF(range_vals, criteria, average_range=None) -> float:
      print(AVERAGEIF([1, 2, 3], ">5"))                                   # No match → NaN
     """
     import pandas as pd, numpy as np
+    if isinstance(range_vals, Range) or isinstance(average_range, Range):
+        target = Range(range_vals if average_range is None else average_range).numbers()[Range(range_vals).match(criteria)]
+        target = target[~np.isnan(target)]
+        return target.mean() if target.size else np.nan
     range_vals = np.array(range_vals)
     if average_range is None: average_range = range_vals
     else: average_range = np.array(average_range)
@@ -962,6 +997,10 @@ def AVERAGEIFS(average_range, *criteria_pairs) -> float:
      print(AVERAGEIFS([100, 200, 300], [True, True, False], True))                 # (100 + 200) / 2 = 150
     """
     import pandas as pd, numpy as np
+    if isinstance(average_range, Range) or any(isinstance(r, Range) for r in criteria_pairs[::2]):
+        target = Range(average_range).numbers(); mask = ~np.isnan(target)
+        for i in range(0, len(criteria_pairs), 2): mask &= Range(criteria_pairs[i]).match(criteria_pairs[i + 1])
+        return target[mask].mean() if mask.any() else np.nan
     average_range = np.array(average_range)
     mask = np.ones(len(average_range), dtype=bool)
     
@@ -1043,13 +1082,45 @@ def BASE(number: int, radix: int, min_length: int = 0) -> str:
     if len(result.lstrip("-")) < min_length: result = ("-" if is_negative else "") + result.lstrip("-").zfill(min_length)
     return result
 
-def BESSELI(x, n) -> float:
+def _bessel(kind: str, x, n, errors: str):
+    """Shared BESSELI/J/K/Y: x and n broadcast, n is truncated toward zero, and the checks are masks over the whole batch.
+    Non-numeric cells are #VALUE!, n < 0, x <= 0 for K and Y, and overflow are #NUM!. One scipy ufunc call per batch,
+    with the integer-order kn/yn kernels for K and Y. Scalars return a float or raise, arrays follow `errors`."""
+    import numpy as np
+    from scipy import special
+    _check_errors_mode(errors)
+    def numbers(v):
+        try: return np.asarray(v, dtype=float)
+        except (TypeError, ValueError): return np.asarray(np.frompyfunc(lambda c: float(c) if isinstance(c, (int, float, np.number)) else np.nan, 1, 1)(np.asarray(v, dtype=object)), dtype=float)
+    xs, order = np.broadcast_arrays(numbers(x), np.trunc(numbers(n)))
+    numeric = np.isfinite(xs) & np.isfinite(order)
+    negative = numeric & (order < 0)
+    outside = numeric & ~negative & (xs <= 0) if kind in ("K", "Y") else np.zeros(xs.shape, dtype=bool)
+    ok = numeric & ~negative & ~outside
+    order = np.where(ok, np.minimum(order, 2**31 - 1), 0); xs = np.where(ok, xs, 1.0)
+    with np.errstate(all="ignore"):
+        if kind == "I": result = special.iv(order, xs)
+        elif kind == "J": result = special.jv(order, xs)
+        elif kind == "K": result = special.kn(order.astype(np.int64), xs)
+        else: result = special.yn(order.astype(np.int64), xs)
+    result = np.where(ok & np.isfinite(result), result, np.nan)
+    if np.ndim(x) == 0 and np.ndim(n) == 0:
+        if ok and np.isfinite(result): return float(result)
+        if not numeric: err = (ExcelError.VALUE, f"#VALUE! 🚫 BESSEL{kind} needs numeric x and n.")
+        elif negative: err = (ExcelError.NUM, "#NUM! 🚫 'n' should be above or equal to zero !")
+        elif outside: err = (ExcelError.NUM, f"#NUM! 🚫 BESSEL{kind} needs x > 0.")
+        else: err = (ExcelError.NUM, f"#NUM! 🚫 BESSEL{kind}({x}, {n}) is out of range.")
+        if errors == "return": return err[0]
+        raise ValueError(err[1])
+    return _wrap_like(_mark_errors(result, errors, (~numeric, ExcelError.VALUE), (np.isnan(result), ExcelError.NUM)), x, n)
+
+def BESSELI(x, n, *, errors: str = "raise") -> float:
     """
     `=BESSELI(x, n)` Returns the modified Bessel function **In(x)**
 
     Parameters:
         x (float): The value at which to evaluate the function.
-        n (int): The order of the Bessel function (must be >= 0).
+        n (int): The order of the Bessel function (must be >= 0), truncated to an integer like Excel does.
 
     *Example Input*:
 
@@ -1061,20 +1132,19 @@ def BESSELI(x, n) -> float:
         BESSELI(7, 3)   # 85.1754868428438
         BESSELI(20, 5)  # 23018392.213413667
         BESSELI(50, 2)  # 2.8164306402451954e+20
+        BESSELI(np.linspace(0, 5, 1_000_000), [[0], [1.7]])   # 2 x 10^6 grid, order 1.7 read as 1
 
     `Returns (float) The calculated Bessel I_n(x) value.`
     """
-    from scipy.special import iv
-    if n<0: raise ValueError("#VALUE! 🚫 'n' should be above or equal to zero !")
-    else: return iv(n, x)
+    return _bessel("I", x, n, errors)
 
-def BESSELJ(x, n) -> float:
+def BESSELJ(x, n, *, errors: str = "raise") -> float:
     """
     `=BESSELJ(x, n)` Returns the Bessel function of first kind **jn(x)**.
 
     Parameters:
         x (float): The value at which to evaluate the function.
-        n (int): The order of the Bessel function (must be >= 0).
+        n (int): The order of the Bessel function (must be >= 0), truncated to an integer like Excel does.
 
     *Example Input*:
 
@@ -1086,18 +1156,17 @@ def BESSELJ(x, n) -> float:
         BESSELJ(7, 3)   # -0.16755558799533432
         BESSELJ(20, 5)  # 0.15116976798239493
         BESSELJ(50, 2)  # -0.05971280079425883
+        BESSELJ([1, 2, "x"], [0, -1, 2], errors="return")   # [0.7651976865579666 #NUM! #VALUE!]
     """
-    from scipy.special import jv
-    if n<0: raise ValueError("#VALUE! 🚫 'n' should be above or equal to zero !")
-    else: return jv(n, x)
+    return _bessel("J", x, n, errors)
 
-def BESSELK(x, n) -> float:
+def BESSELK(x, n, *, errors: str = "raise") -> float:
     """
     `=BESSELK(x, n)` Returns the Bessel function of first kind **kn(x)**.
 
     Parameters:
         x (float): The value at which to evaluate the function.
-        n (int): The order of the Bessel function (must be >= 0).
+        n (int): The order of the Bessel function (must be >= 0), truncated to an integer like Excel does.
 
     *Example Input*:
 
@@ -1109,18 +1178,17 @@ def BESSELK(x, n) -> float:
        BESSELK(7, 3)   # 0.0007710751535668902
        BESSELK(20, 5)  # 1.0538660139974233e-09
        BESSELK(50, 2)  # 3.547931838858198e-23
+       BESSELK([0, 1], 0)  # [nan 0.42102443824070834], x must be > 0 (#NUM!)
     """    
-    from scipy.special import kv
-    if n<0: raise ValueError("#VALUE! 🚫 'n' should be above or equal to zero !")
-    else: return kv(n, x)
+    return _bessel("K", x, n, errors)
 
-def BESSELY(x, n) -> float:
+def BESSELY(x, n, *, errors: str = "raise") -> float:
     """
     `=BESSELY(x, n)` Returns the Bessel function of first kind **Yn(x)**.
 
     Parameters:
         x (float): The value at which to evaluate the function.
-        n (int): The order of the Bessel function (must be >= 0).
+        n (int): The order of the Bessel function (must be >= 0), truncated to an integer like Excel does.
 
     *Example Input*:
 
@@ -1132,10 +1200,9 @@ def BESSELY(x, n) -> float:
      BESSELY(7, 3)    # 0.26808060304231507
      BESSELY(20, 5)   # -0.10003576788953246
      BESSELY(50, 2)   # 0.09579316872759651
+     BESSELY(pd.Series([1.0, 2.0]), 1)   # Series keeps its index
     """
-    from scipy.special import yv
-    if n<0: raise ValueError("#VALUE! 🚫 'n' should be above or equal to zero !")
-    else: return yv(n, x)
+    return _bessel("Y", x, n, errors)
 
 def BIN2DEC(num: int | float | str) -> int:
     """
@@ -1415,32 +1482,45 @@ def BITXOR(number1: int, number2: int) -> int:
     return number1 ^ number2
 
 #C
-def CEILING_MATH(number: int | float, significant: int | float = 1, mode: int = 0) -> float:
+def CEILING_MATH(number: int | float, significant: int | float = 1, mode: int = 0, *, errors: str = "raise") -> float:
     """
     `=CEILING.MATH(number, [significant], [mode])`
     Rounds a number up, to the nearest integer or the nearest multiple of significance.
 
     Parameters:
-        number : The number to round
-        significant : Multiple to round to (default 1, must be > 0)
+        number : The number to round (scalar, list, NumPy array or pandas Series)
+        significant : Multiple to round to (default 1, must be >= 0)
         mode : int — For negative numbers: 
-                     0 = round away from zero (default)
-                     nonzero = round toward zero
+                     0 = round toward zero (default)
+                     nonzero = round away from zero
 
     *Example Input*:
 
         print(CEILING_MATH(4.3))             # 5
         print(CEILING_MATH(-4.3))            # -4
         print(CEILING_MATH(-4.3, 2))         # -4
-        print(CEILING_MATH(-4.3, 2, 1))      # -2
+        print(CEILING_MATH(-4.3, 2, 1))      # -6
         print(CEILING_MATH(4.3, 2))          # 6
         print(CEILING_MATH(4.3, 0.5))        # 4.5
+        print(CEILING_MATH([4.3, -4.3], 2, [0, 1]))   # [ 6. -6.]
+        print(CEILING_MATH([4.3, 1], [1, -1], errors="return"))   # [5.0 #NUM!]
+
+    `Arrays broadcast against each other; elements with a negative significant come back as NaN, or as ExcelError.NUM with errors="return".`
     """
     import numpy as np
-    if significant < 0: raise ValueError("#NUM! 🚫 significant must be positive")
-    if significant == 0: return 0.0
-    sign = np.sign(number) 
-    return np.floor(number / significant) * significant if sign < 0 and mode != 0 else np.ceil(np.abs(number) / significant) * significant * sign
+    _check_errors_mode(errors)
+    if np.ndim(number) == 0 and np.ndim(significant) == 0 and np.ndim(mode) == 0:
+        if significant < 0:
+            if errors == "return": return ExcelError.NUM
+            raise ValueError("#NUM! 🚫 significant must be positive")
+        if significant == 0: return 0.0
+    x = np.asarray(number, dtype=float); sig = np.asarray(significant, dtype=float); md = np.asarray(mode)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = x / sig
+        result = np.where((x < 0) & (md != 0), np.floor(q), np.ceil(q)) * sig
+    result = np.where(sig == 0, 0.0, result)
+    if result.ndim == 0: return float(result)
+    return _wrap_like(_mark_errors(result, errors, (np.broadcast_to(sig < 0, result.shape), ExcelError.NUM)), number, significant, mode)
 
 def CELL(info_type: str, reference: any) -> any:
     """
@@ -1475,13 +1555,18 @@ def CELL(info_type: str, reference: any) -> any:
         print(CELL("row", df.iloc[1,1]))            # 2
         print(CELL("type", df.iloc[0,0]))           # "v"
         print(CELL("width", df.iloc[0,0]))          # 2
+        print(CELL("address", Reference("B2:C3", df)))   # "$B$2" (first cell of a Reference, contents read from its data)
 
     """
     import pandas as pd, numpy as np
     info_type = info_type.lower()
+    if info_type == "column": info_type = "col"
     valid_info = {"address", "col", "contents", "format", "parentheses", "prefix", "protect", "row", "type", "width" }
     if info_type not in valid_info: raise ValueError("#VALUE! 🚫 Invalid info_type")
-    if isinstance(reference, pd.Series):
+    if isinstance(reference, Reference):
+        row_label, col_label = reference.row, reference.column
+        val = None if reference.data is None or row_label > reference.data.shape[0] or col_label > reference.data.shape[1] else reference.data.iat[row_label - 1, col_label - 1]
+    elif isinstance(reference, pd.Series):
         if len(reference) != 1: raise ValueError("#VALUE! 🚫 reference must be 1 cell")
         val = reference.iloc[0]; col_label = reference.name; row_label = reference.index[0]
     elif isinstance(reference, pd.DataFrame):
@@ -1500,7 +1585,7 @@ def CELL(info_type: str, reference: any) -> any:
             letters = chr(65 + rem) + letters
         return letters
     if info_type == "address": return f"${col_letter(col_label)}${row_label}"
-    elif info_type == "col": return (ord(col_letter(col_label)[0]) - 64)
+    elif info_type == "col": return _column_index(col_letter(col_label)) + 1
     elif info_type == "contents": return val
     elif info_type == "format":
         if isinstance(val, (int, float, np.number)): return "G"  # General
@@ -1715,17 +1800,18 @@ def COLUMN(reference: any) -> int | list:
      'Age': [25, 30], 'City': ['NY', 'LA'] })
      print("COLUMN(df) →", COLUMN(df))                  # [1, 2, 3]
      print("COLUMN(df['City']) →", COLUMN(df['City']))  # 3
+     print(COLUMN(Reference("C2:E9")))                  # [3, 4, 5]
 
-    `Parameter - Accepts reference in dataframe, series, array, list formats `
+    `Parameter - Accepts reference in dataframe, series, array, list formats or a Reference`
     """
     import pandas as pd, numpy as np
+    if isinstance(reference, Reference):
+        _, c1, _, c2 = reference.bounds()
+        return c1 + 1 if c1 == c2 else list(range(c1 + 1, c2 + 2))
     if isinstance(reference, str):
         reference = reference.strip().upper()
-        col_num = 0
-        for char in reference:
-            if not 'A' <= char <= 'Z': raise ValueError("#NUM! 🚫 Invalid column letter.")
-            col_num = col_num * 26 + (ord(char) - ord('A') + 1)
-        return col_num    
+        if not reference.isascii() or not reference.isalpha(): raise ValueError("#NUM! 🚫 Invalid column letter.")
+        return _column_index(reference) + 1
     if isinstance(reference, pd.Series):
         if reference.name is None: raise ValueError("#VALUE! 🚫 Series has no column name.")
         col_names = reference.to_frame().columns.tolist()
@@ -1744,10 +1830,12 @@ def COLUMNS(array: list | dict) -> int:
 
      print("COLUMNS(df) =>", COLUMNS(pd.DataFrame({'A': [1,2,3],'B': [4,5,6], 'C': [7,8,9]})))  # 3
      print("COLUMNS(lst) =>", COLUMNS([[1,2],[3,4]]))                                           # 2
+     print("COLUMNS(ref) =>", COLUMNS(Reference("B:D")))                                        # 3
     
-    `Parameter - Accepts reference in dataframe, series, array, list formats `
+    `Parameter - Accepts reference in dataframe, series, array, list formats or a Reference`
     """    
     import pandas as pd, numpy as np
+    if isinstance(array, Reference): return array.columns
     if isinstance(array, pd.DataFrame): return array.shape[1]
     elif isinstance(array, pd.Series): return 1    
     elif isinstance(array, np.ndarray): return 1 if array.ndim == 1 else array.shape[1] 
@@ -1757,7 +1845,7 @@ def COLUMNS(array: list | dict) -> int:
         else: return 1
     else: raise TypeError("#REF! 🚫 Unsupported type for COLUMNS function.")
 
-def COMBIN(number: int, number_chosen: int) -> int:
+def COMBIN(number: int, number_chosen: int, *, errors: str = "raise") -> int:
     """
     `=COMBIN(number, number_chosen)` Returns the **number of combinations** for a given number of items.
 
@@ -1772,14 +1860,48 @@ def COMBIN(number: int, number_chosen: int) -> int:
          print(COMBIN(8, 0))     # 1
          print(COMBIN(6, 6))     # 1
          print(COMBIN(6, 1))     # 6
+         print(COMBIN(np.array([10, 5, 3]), [2, 3, 4]))   # [45. 10. nan]
+         print(COMBIN([5, 5.5, 3], 4, errors="return"))   # [5.0 #VALUE! #NUM!]
+
+    `Scalars return an exact int. Arrays broadcast and return floats, exact up to 2**53, with NaN for invalid elements (ExcelError values with errors="return").
+    Scalars and array elements are checked alike: whole numbers such as 5.0 or "5" are accepted, fractions and other text are #VALUE!.`
     """
+    import numpy as np
     from scipy.special import comb
-    if not (isinstance(number, int) and isinstance(number_chosen, int)): raise ValueError("#VALUE! 🚫 Parameters must be integers.")
-    if number < 0 or number_chosen < 0: raise ValueError("#NUM! 🚫 Parameters must be non-negative.")
-    if number_chosen > number: raise ValueError("#NUM! 🚫 number_chosen cannot be greater than number.")
-    return int(comb(number, number_chosen, exact=True))
-
-def COMBINA(number: int, number_chosen: int) -> int:
+    _check_errors_mode(errors)
+    n, n_ok = _int_valued(number); k, k_ok = _int_valued(number_chosen)
+    if np.ndim(number) == 0 and np.ndim(number_chosen) == 0:
+        err = None
+        if not (n_ok and k_ok): err = (ExcelError.VALUE, "#VALUE! 🚫 Parameters must be integers.")
+        elif n < 0 or k < 0: err = (ExcelError.NUM, "#NUM! 🚫 Parameters must be non-negative.")
+        elif k > n: err = (ExcelError.NUM, "#NUM! 🚫 number_chosen cannot be greater than number.")
+        if err:
+            if errors == "return": return err[0]
+            raise ValueError(err[1])
+        n, k = (int(v) if isinstance(v, (int, np.integer)) else int(f) for v, f in ((number, n), (number_chosen, k)))   # Python ints stay exact past 2**53
+        return int(comb(n, k, exact=True))
+    whole = n_ok & k_ok
+    valid = whole & (n >= 0) & (k >= 0) & (k <= n)
+    result = _combin_array(n, k, valid)
+    return _wrap_like(_mark_errors(result, errors, (~np.broadcast_to(whole, result.shape), ExcelError.VALUE), (np.isnan(result), ExcelError.NUM)), number, number_chosen)
+
+def _combin_array(n, k, valid):
+    """Vectorized C(n, k) for whole-number float arrays. The size of each result is judged with gammaln: below 2**46 the float binomial is rounded to the exact integer, up to 2**53 the distinct (n, k) pairs go through exact integer comb, larger ones stay floating point and overflow becomes NaN."""
+    import numpy as np
+    from scipy.special import binom, comb, gammaln
+    n, k, valid = np.broadcast_arrays(n, k, valid)
+    n = np.where(valid, n, 0.0); k = np.where(valid, k, 0.0)
+    log_size = gammaln(n + 1) - gammaln(k + 1) - gammaln(n - k + 1)
+    result = binom(n, k)
+    result = np.where(log_size < 46 * np.log(2), np.rint(result), result)
+    exact_int = valid & (log_size >= 46 * np.log(2)) & (log_size < 53 * np.log(2) + 1)
+    if exact_int.any():
+        pairs, inverse = np.unique(np.stack([n[exact_int], k[exact_int]], axis=1), axis=0, return_inverse=True)
+        exact = np.array([float(comb(int(a), int(b), exact=True)) for a, b in pairs.tolist()])
+        result = result.copy(); result[exact_int] = exact[inverse.ravel()]
+    return np.where(valid & np.isfinite(result), result, np.nan)
+
+def COMBINA(number: int, number_chosen: int, *, errors: str = "raise") -> int:
     """
     `=COMBINA(number, number_chosen)` Returns the **number of combinations with repetitions** allowed.
 
@@ -1794,11 +1916,29 @@ def COMBINA(number: int, number_chosen: int) -> int:
          print(COMBINA(8, 0))     # 1
          print(COMBINA(6, 6))     # 462
          print(COMBINA(6, 1))     # 6
+         print(COMBINA([10, 0], 2))   # [55. nan]
+         print(COMBINA([10, 0], 2, errors="return"))   # [55.0 #NUM!]
+
+    `Scalars return an exact int. Arrays broadcast and return floats with NaN for invalid elements (ExcelError values with errors="return").
+    Scalars and array elements are checked alike: whole numbers such as 5.0 or "5" are accepted, fractions and other text are #VALUE!.`
     """
+    import numpy as np
     from scipy.special import comb
-    if not (isinstance(number, int) and isinstance(number_chosen, int)): raise ValueError("#VALUE! 🚫 Parameters must be integers.")
-    if number <= 0 or number_chosen < 0: raise ValueError("#NUM! 🚫 number must be > 0 and number_chosen must be non-negative.")
-    return int(comb(number + number_chosen - 1, number_chosen, exact=True))
+    _check_errors_mode(errors)
+    n, n_ok = _int_valued(number); k, k_ok = _int_valued(number_chosen)
+    if np.ndim(number) == 0 and np.ndim(number_chosen) == 0:
+        err = None
+        if not (n_ok and k_ok): err = (ExcelError.VALUE, "#VALUE! 🚫 Parameters must be integers.")
+        elif n <= 0 or k < 0: err = (ExcelError.NUM, "#NUM! 🚫 number must be > 0 and number_chosen must be non-negative.")
+        if err:
+            if errors == "return": return err[0]
+            raise ValueError(err[1])
+        n, k = (int(v) if isinstance(v, (int, np.integer)) else int(f) for v, f in ((number, n), (number_chosen, k)))
+        return int(comb(n + k - 1, k, exact=True))
+    whole = n_ok & k_ok
+    valid = whole & (n > 0) & (k >= 0)
+    result = _combin_array(n + k - 1, k, valid)
+    return _wrap_like(_mark_errors(result, errors, (~np.broadcast_to(whole, result.shape), ExcelError.VALUE), (np.isnan(result), ExcelError.NUM)), number, number_chosen)
 
 def COMPLEX(real_num: float, img_num: float, suffix: str="i") -> str:
     """
@@ -1829,7 +1969,7 @@ def COMPLEX(real_num: float, img_num: float, suffix: str="i") -> str:
     sign = "+" if img_num >= 0 else "-"
     return f"{real_str}{sign}{imag_str}{suffix}"
 
-def CONCAT(*args: any) -> str:
+def CONCAT(*args: any, chunk_size: int | None = None) -> str:
     """
     `=CONCAT(text1, ...)` **Concatenates** a list or a range of text strings.
 
@@ -1839,22 +1979,28 @@ def CONCAT(*args: any) -> str:
      print(CONCAT(1, 2, 3))                                # 123
      print(CONCAT(True, False))                            # TRUEFALSE
      print(CONCAT(np.array([1, None, "X"])))               # 1X
-     print(CONCAT(pd.Series([1, np.nan, 3])))              # 13
+     print(CONCAT(pd.Series([1, np.nan, 3])))              # 1.03.0
      print(CONCAT(range(3)," ", "Done"))                   # 012 Done
+     for piece in CONCAT(big_df, chunk_size=100000): out.write(piece)   # streamed export
 
-    `parameters - accepts any type of list arrays series ranges that in integer/float/string `
+    `parameters - accepts any type of list arrays series ranges that in integer/float/string, chunk_size (optional) returns a generator of text pieces instead of one string`
     """
+    import io
+    pieces = _concat_pieces(args, chunk_size or 65536)
+    if chunk_size: return pieces
+    buf = io.StringIO()
+    for piece in pieces: buf.write(piece)
+    return buf.getvalue()
+
+def _concat_pieces(args, chunk_size):
+    """Generator behind CONCAT, yields one joined text piece per chunk of cells."""
     import numpy as np, pandas as pd
-    result_parts = []
     for arg in args:
-        if isinstance(arg, (pd.Series, pd.DataFrame)): values = arg.values.flatten()
-        elif isinstance(arg, (np.ndarray, list, tuple, set, range)): values = np.array(arg, dtype=object).flatten()
-        else: values = [arg]
-        for v in values:
-            if v is None or (isinstance(v, float) and pd.isna(v)): continue
-            if isinstance(v, bool): result_parts.append("TRUE" if v else "FALSE")
-            else: result_parts.append(str(v))
-    return "".join(result_parts)
+        if isinstance(arg, (pd.Series, pd.DataFrame, pd.Index, np.ndarray, list, tuple, set, range)):
+            for chunk in _text_chunks(arg, chunk_size): yield "".join(filter(None, chunk))
+        elif arg is None or (isinstance(arg, float) and pd.isna(arg)): continue
+        elif isinstance(arg, (bool, np.bool_)): yield "TRUE" if arg else "FALSE"
+        else: yield str(arg)
 
 def CONFIDENCE_NORM(alpha, std_dev, size) -> float:
     """
@@ -2022,8 +2168,8 @@ def CORREL(array1, array2) -> float:
         CORREL([1, 2, 3, None, 5], [2, 4, None, 8, 10])            # ➜ 1.0
     """
     import numpy as np, pandas as pd
-    s1 = pd.Series(array1, dtype='float64')
-    s2 = pd.Series(array2, dtype='float64')
+    s1 = pd.Series(array1.numbers() if isinstance(array1, Range) else array1, dtype='float64')
+    s2 = pd.Series(array2.numbers() if isinstance(array2, Range) else array2, dtype='float64')
     valid_mask = ~(s1.isna() | s2.isna())
     s1 = s1[valid_mask]
     s2 = s2[valid_mask]
@@ -2155,12 +2301,12 @@ def COUNT(*args) -> int:
     *`Parameters: Multiple -> Any type`*
     """
     import pandas as pd, numpy as np
-    flat_items = []
+    flat_items = []; count = 0
     for arg in args:
-        if isinstance(arg, pd.DataFrame): flat_items.extend(arg.to_numpy().flatten())
+        if isinstance(arg, Range): count += arg.count_numbers()
+        elif isinstance(arg, pd.DataFrame): flat_items.extend(arg.to_numpy().flatten())
         elif isinstance(arg, (pd.Series, pd.Index, np.ndarray, list, tuple)): flat_items.extend(np.array(arg, dtype=object).flatten())
         else: flat_items.append(arg)
-    count = 0
     for item in flat_items:
         if isinstance(item, bool): count += 1
         elif isinstance(item, (int, float)): count += 1
@@ -2187,13 +2333,13 @@ def COUNTA(*args) -> int:
     *`Parameters: Multiple -> Any type`*
     """
     import pandas as pd, numpy as np
-    flat_items = []
+    flat_items = []; count = 0
     for arg in args:
-        if isinstance(arg, pd.DataFrame): flat_items.extend(arg.to_numpy().flatten())
+        if isinstance(arg, Range): count += arg.size - int(arg.blank.sum())
+        elif isinstance(arg, pd.DataFrame): flat_items.extend(arg.to_numpy().flatten())
         elif isinstance(arg, (pd.Series, pd.Index, np.ndarray, list, tuple)): flat_items.extend(np.array(arg, dtype=object).flatten())
         else: flat_items.append(arg)
 
-    count = 0
     for item in flat_items:
         if item is None: continue
         if isinstance(item, str) and item.strip() == "": continue
@@ -2216,12 +2362,12 @@ def COUNTBLANK(*args) -> int:
     *`Parameters: Multiple -> Any type`*
     """
     import pandas as pd, numpy as np
-    flat_items = []
+    flat_items = []; count = 0
     for arg in args:
-        if isinstance(arg, pd.DataFrame): flat_items.extend(arg.to_numpy().flatten())
+        if isinstance(arg, Range): count += int(arg.blank.sum())
+        elif isinstance(arg, pd.DataFrame): flat_items.extend(arg.to_numpy().flatten())
         elif isinstance(arg, (pd.Series, pd.Index, np.ndarray, list, tuple)): flat_items.extend(np.array(arg, dtype=object).flatten())
         else: flat_items.append(arg)
-    count = 0
     for item in flat_items:
         if item is None: count += 1
         elif isinstance(item, str) and item.strip() == "": count += 1
@@ -2246,6 +2392,7 @@ def COUNTIF(range_vals, criteria) -> int:
      print(COUNTIF(pd.Series([1, 2, 3, 4]), "<4"))          # 3
     """
     import pandas as pd, numpy as np
+    if isinstance(range_vals, Range): return int(range_vals.match(criteria).sum())
     if isinstance(range_vals, pd.DataFrame): arr = range_vals.to_numpy().flatten()
     elif isinstance(range_vals, (pd.Series, pd.Index, np.ndarray, list, tuple)): arr = np.array(range_vals, dtype=object).flatten()
     else: arr = [range_vals]
@@ -2279,14 +2426,15 @@ def COUNTIFS(*criteria_pairs) -> int:
     if len(criteria_pairs) % 2 != 0: raise ValueError("#VALUE!: 🚫 COUNTIFS requires pairs of (range, criteria).")
     mask = None
     for i in range(0, len(criteria_pairs), 2):
-        range_vals = criteria_pairs[i]
-        if isinstance(range_vals, pd.DataFrame): arr = range_vals.to_numpy().flatten()
-        elif isinstance(range_vals, (pd.Series, pd.Index, np.ndarray, list, tuple)): arr = np.array(range_vals, dtype=object).flatten()
-        else: arr = [range_vals]
-        criteria = criteria_pairs[i + 1]
-        if isinstance(criteria, str) and criteria.strip() and criteria[0] in "<>=": func = lambda v: eval(f"v{criteria}")
-        else: func = lambda v: v == criteria
-        current_mask = np.array([False if v is None else func(v) for v in arr])
+        range_vals, criteria = criteria_pairs[i], criteria_pairs[i + 1]
+        if isinstance(range_vals, Range): current_mask = range_vals.match(criteria)
+        else:
+            if isinstance(range_vals, pd.DataFrame): arr = range_vals.to_numpy().flatten()
+            elif isinstance(range_vals, (pd.Series, pd.Index, np.ndarray, list, tuple)): arr = np.array(range_vals, dtype=object).flatten()
+            else: arr = [range_vals]
+            if isinstance(criteria, str) and criteria.strip() and criteria[0] in "<>=": func = lambda v: eval(f"v{criteria}")
+            else: func = lambda v: v == criteria
+            current_mask = np.array([False if v is None else func(v) for v in arr])
         if mask is None: mask = current_mask
         else: mask = mask & current_mask
     return int(mask.sum()) if mask is not None else 0
@@ -2527,6 +2675,13 @@ def COUPPCD(settlement: str, maturity: str, frequency: int, basis: int = 0) -> s
     while coupon > sd: coupon -= pd.DateOffset(months=months)
     return coupon.strftime("%d-%m-%Y")
 
+def _covariance_series(array):
+    """Numeric Series for COVARIANCE.P/S: TRUE/FALSE and non-numeric cells become NaN."""
+    import numpy as np, pandas as pd
+    try: s = pd.Series(array, dtype="object")
+    except Exception: raise TypeError("Type Error: 🚫 array1/array2 must be array-like (list/Series/ndarray).")
+    return pd.to_numeric(s.map(lambda v: np.nan if isinstance(v, (bool, np.bool_)) else v), errors="coerce")
+
 def COVARIANCE_P(array1, array2) -> float:
     """
     `=COVARIANCE.P(array1, array2)` Returns the **population covariance** of two datasets.
@@ -2550,14 +2705,7 @@ def COVARIANCE_P(array1, array2) -> float:
         print(COVARIANCE_P(pd.Series([1, np.nan, 3]), pd.Series([4, 5, 6]))) # ➜ 0.5
     """
     import numpy as np, pandas as pd
-    try:
-        s1 = pd.Series(array1, dtype="object")
-        s2 = pd.Series(array2, dtype="object")
-    except Exception: raise TypeError("Type Error: 🚫 array1/array2 must be array-like (list/Series/ndarray).")
-    s1 = s1.map(lambda v: np.nan if isinstance(v, (bool, np.bool_)) else v)
-    s2 = s2.map(lambda v: np.nan if isinstance(v, (bool, np.bool_)) else v)
-    s1 = pd.to_numeric(s1, errors="coerce")
-    s2 = pd.to_numeric(s2, errors="coerce")
+    s1, s2 = (pd.Series(a.numbers(), copy=False) if isinstance(a, Range) else _covariance_series(a) for a in (array1, array2))
     valid = ~(s1.isna() | s2.isna())
     x = s1[valid].to_numpy(dtype=float); y = s2[valid].to_numpy(dtype=float)
     n = x.size
@@ -2588,14 +2736,7 @@ def COVARIANCE_S(array1, array2) -> float:
         print(COVARIANCE_S(np.array([1, 2, np.nan, 4]), pd.Series([2, 1, 3, 0])))   # ➜ -1.0
     """
     import numpy as np, pandas as pd
-    try:
-        s1 = pd.Series(array1, dtype="object")
-        s2 = pd.Series(array2, dtype="object")
-    except Exception: raise TypeError("Type Error: 🚫 array1/array2 must be array-like (list/Series/ndarray).")
-    s1 = s1.map(lambda v: np.nan if isinstance(v, (bool, np.bool_)) else v)
-    s2 = s2.map(lambda v: np.nan if isinstance(v, (bool, np.bool_)) else v)
-    s1 = pd.to_numeric(s1, errors="coerce")
-    s2 = pd.to_numeric(s2, errors="coerce")
+    s1, s2 = (pd.Series(a.numbers(), copy=False) if isinstance(a, Range) else _covariance_series(a) for a in (array1, array2))
     valid = ~(s1.isna() | s2.isna())
     x = s1[valid].to_numpy(dtype=float); y = s2[valid].to_numpy(dtype=float)
     n = x.size
@@ -2666,6 +2807,334 @@ def CSCH(*args: int | float | str) -> float:
             return 1 / sinh_val
     except AssertionError as ae: raise ValueError(str(ae))
 
+_MISSING = object()
+
+def _compact_frame(df, numeric: bool = False):
+    """Copy of a fact table with repeated text columns dictionary-encoded as categoricals. With `numeric`, integer columns
+    are also downcast to the smallest signed type and float columns to float32 where every value survives exactly."""
+    import numpy as np, pandas as pd
+    if not df.columns.is_unique: return df
+    cols = {}
+    for name, col in df.items():
+        kind = col.dtype.kind
+        try:
+            if kind == "O" or isinstance(col.dtype, pd.StringDtype):
+                if col.nunique(dropna=True) <= max(len(col) // 2, 1): col = col.astype("category")
+            elif numeric and kind in "iu": col = pd.to_numeric(col, downcast="integer")
+            elif numeric and kind == "f" and col.dtype.itemsize > 4:
+                small = col.astype(np.float32)
+                if np.array_equal(small.to_numpy(dtype=float), col.to_numpy(dtype=float), equal_nan=True): col = small
+        except TypeError: pass
+        cols[name] = col
+    return pd.DataFrame(cols, index=df.index)
+
+class _FactSource:
+    """Out-of-core fact table over CSV or Parquet chunk files. Scans read only the requested columns, one chunk at a time,
+    and learn each chunk's row count and per-column min/max (Parquet footers provide them up front), so later scans
+    skip chunks whose statistics cannot match. A CSV file is parsed in full on its first scan only; that scan also
+    records where each chunk starts in the file, so later scans seek straight to the chunks they keep. CSV files with
+    quoted line breaks have no usable line offsets and stay on full chunked reads, so pruning saves nothing there."""
+    def __init__(self, paths, chunk_rows: int = 1 << 20):
+        import os, pandas as pd
+        self.paths = [os.fspath(p) for p in ([paths] if isinstance(paths, (str, os.PathLike)) else paths)]
+        if not self.paths: raise ValueError("#VALUE! 🚫 No chunk files given")
+        self.chunk_rows = max(int(chunk_rows), 1); self.stats = {}; self._time = {}; self._offsets = {}
+        first = self.paths[0]
+        self.columns = pd.Index(_parquet_file(first).schema_arrow.names if _is_parquet(first) else pd.read_csv(first, nrows=0).columns)
+    def _units(self, f: int, path: str, columns: list):
+        """(chunk id, reader) per chunk of one file: Parquet row groups or CSV blocks of chunk_rows. Readers are called
+        only for chunks the scan keeps; CSV blocks are read from their recorded byte offsets once the file was seen."""
+        import pandas as pd
+        if _is_parquet(path):
+            pf = _parquet_file(path); meta = pf.metadata; names = pf.schema_arrow.names
+            for g in range(meta.num_row_groups):
+                if (f, g) not in self.stats:
+                    group = meta.row_group(g); minmax = {}
+                    for j, name in enumerate(names[:group.num_columns]):
+                        s = group.column(j).statistics
+                        if s is not None and s.has_min_max: minmax[name] = (s.min, s.max)
+                    self.stats[f, g] = {"rows": group.num_rows, "minmax": minmax}
+                yield (f, g), lambda g=g: pf.read_row_group(g, columns=columns).to_pandas()
+        elif self._offsets.get(f) is not None:
+            names = list(self.columns)
+            def read(pos):
+                with open(path, "rb") as fh:
+                    fh.seek(pos)
+                    return pd.read_csv(fh, header=None, names=names, usecols=columns, nrows=self.chunk_rows)
+            for k, pos in enumerate(self._offsets[f]): yield (f, k), lambda pos=pos: read(pos)
+        else:
+            rows = 0
+            with pd.read_csv(path, usecols=columns, chunksize=self.chunk_rows) as reader:
+                for k, frame in enumerate(reader): rows += len(frame); yield (f, k), lambda frame=frame: frame
+            if f not in self._offsets: self._offsets[f] = _csv_chunk_offsets(path, self.chunk_rows, rows)
+    def scan(self, columns: list, wanted: dict | None = None):
+        """Yields (first global row, frame of `columns`) per chunk in file order. Chunks whose known min/max exclude every
+        key of some dimension in `wanted` ({dim: keys}) are skipped."""
+        columns = list(dict.fromkeys(columns)); offset = 0
+        for c in columns:
+            if c not in self.columns: raise KeyError(c)
+        for f, path in enumerate(self.paths):
+            for cid, read in self._units(f, path, columns):
+                st = self.stats.get(cid)
+                if st is not None and wanted and not _chunk_may_match(st["minmax"], wanted): offset += st["rows"]; continue
+                frame = read()
+                if st is None: st = self.stats[cid] = {"rows": len(frame), "minmax": {}}
+                for c in columns:
+                    if c in st["minmax"]: continue
+                    try: lo, hi = frame[c].min(), frame[c].max()
+                    except TypeError: continue
+                    if lo == lo and hi == hi: st["minmax"][c] = (lo, hi)
+                yield offset, frame; offset += len(frame)
+    def time_rank(self, time_dim: str) -> tuple:
+        """(sorted distinct values of `time_dim`, total rows) from one scan of that column only, cached."""
+        import numpy as np, pandas as pd
+        hit = self._time.get(time_dim)
+        if hit is None:
+            seen = []; total = 0
+            for _, frame in self.scan([time_dim]): seen.append(np.asarray(frame[time_dim].dropna().unique(), dtype=object)); total += len(frame)
+            hit = self._time[time_dim] = (pd.Index(np.concatenate(seen) if seen else [], dtype=object).unique().sort_values(), total)
+        return hit
+    def aggregate(self, dims: list, keys: dict, col: str, time_dim: str | None, patterns: list, wanted: dict, workers: int = 1, executor: str = "thread") -> list:
+        """Streams the chunks through _cube_partial and folds the partials in chunk order, one merged partial per pattern.
+        At most `workers` chunks are in flight, so peak memory is bounded by the chunk size."""
+        import collections, numpy as np
+        vocab, total = self.time_rank(time_dim) if time_dim is not None else (None, 0)
+        acc = None; pending = collections.deque(); pool = None
+        def fold(part):
+            nonlocal acc
+            acc = part if acc is None else [_merge_cube_partials([a, p]) for a, p in zip(acc, part)]
+        if workers and workers > 1:
+            from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+            pool = (ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor)(max_workers=workers)
+        try:
+            for offset, frame in self.scan(dims + [col] + ([time_dim] if time_dim is not None else []), wanted):
+                n = len(frame); order = None
+                if vocab is not None:
+                    rank = vocab.get_indexer(np.asarray(frame[time_dim], dtype=object)).astype(np.int64); rank[rank < 0] = len(vocab)
+                    order = rank * max(total, 1) + offset + np.arange(n, dtype=np.int64)
+                job = ([_column_codes(frame[d], keys[d]) for d in dims], np.asarray(frame[col], dtype=float), order, patterns)
+                if pool is None: fold(_cube_partial(*job)); continue
+                pending.append(pool.submit(_cube_partial, *job))
+                if len(pending) >= workers: fold(pending.popleft().result())
+            while pending: fold(pending.popleft().result())
+        finally:
+            if pool is not None: pool.shutdown()
+        if acc is None:
+            empty = (np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0, dtype=np.int64), np.zeros(0))
+            acc = [empty] * len(patterns)
+        return acc
+    def memory_usage(self):
+        """Dtype and bytes per column of the first chunk, which bounds what a scan holds in memory at once."""
+        import pandas as pd
+        frame = next(self.scan(list(self.columns)))[1]
+        return pd.DataFrame({"dtype": [str(frame[c].dtype) for c in self.columns], "bytes": [int(frame[c].memory_usage(deep=True, index=False)) for c in self.columns]}, index=self.columns)
+
+def _csv_chunk_offsets(path: str, chunk_rows: int, rows: int):
+    """Byte offset of the first data line of every chunk_rows block, skipping blank lines as read_csv does. None when the
+    line count disagrees with the `rows` read_csv parsed (quoted line breaks), since the offsets would then be wrong."""
+    offsets = []; n = 0
+    with open(path, "rb") as fh:
+        fh.readline()
+        while True:
+            pos = fh.tell(); line = fh.readline()
+            if not line: break
+            if not line.strip(): continue
+            if n % chunk_rows == 0: offsets.append(pos)
+            n += 1
+    return offsets if n == rows else None
+
+def _is_parquet(path: str) -> bool: return str(path).lower().endswith((".parquet", ".pq"))
+
+def _parquet_file(path: str):
+    try: import pyarrow.parquet as pq
+    except ImportError: raise ImportError("#VALUE! 🚫 Parquet chunk files need pyarrow (pip install pyarrow); CSV chunks work without it")
+    return pq.ParquetFile(path)
+
+def _chunk_may_match(minmax: dict, wanted: dict) -> bool:
+    """False when a chunk's [min, max] of some dimension holds none of the wanted keys; unknown or incomparable stats keep the chunk."""
+    for d, ks in wanted.items():
+        bounds = minmax.get(d)
+        if bounds is None: continue
+        try:
+            if not any(bounds[0] <= k <= bounds[1] for k in ks): return False
+        except TypeError: continue
+    return True
+
+_member_expr_cache = {}
+
+def _parse_member_expression(expr: str) -> tuple:
+    """Splits "[Dim].[Member]" (or "[Dim].[Level].[Member]") into (dim, member); memoized since reports repeat the same expressions."""
+    parsed = _member_expr_cache.get(expr)
+    if parsed is None:
+        token = expr.strip()
+        if token.startswith("[") and token.endswith("]"): token = token[1:-1]
+        parts = token.split("].[")
+        parsed = (parts[0], parts[-1])
+        if len(_member_expr_cache) >= 65536: _member_expr_cache.clear()
+        _member_expr_cache[expr] = parsed
+    return parsed
+
+def _build_member_index(members: dict) -> tuple:
+    """Hash indexes of a dimension: lower-case caption -> key and unique_name -> key, first member wins like the old linear scans."""
+    by_caption = {}; by_unique = {}
+    for key, info in members.items():
+        by_caption.setdefault(str(info.get("caption", "")).lower(), key)
+        if "unique_name" in info: by_unique.setdefault(info["unique_name"], key)
+    return by_caption, by_unique
+
+def _freeze_dimension(members: dict, prev: tuple | None) -> tuple:
+    """Snapshot entry of a dimension: (frozen copy, size, by_caption, by_unique, live dict it was copied from). The copy
+    owns its member dicts, so later edits to the live cube never show through; `prev` is reused while the live dict is unchanged."""
+    if prev is not None and prev[4] is members and prev[1] == len(members): return prev
+    frozen = {key: dict(info) for key, info in members.items()}
+    return (frozen, len(frozen), *_build_member_index(frozen), members)
+
+def _resolve_member(cube, expr: str) -> tuple:
+    """Resolves a member expression against any cube-like object to (dim, key, info), raising #N/A like the CUBE functions."""
+    dim, mem = _parse_member_expression(expr)
+    if not hasattr(cube, "dimensions") or dim not in cube.dimensions: raise ValueError(f"#N/A 🚫 Dimension not found: {dim}")
+    members = cube.dimensions[dim]
+    if isinstance(cube, Cube): key = cube.find_member(dim, mem, expr.strip())
+    else:
+        by_caption, by_unique = _build_member_index(members)
+        key = mem if mem in members else by_caption.get(mem.lower(), by_unique.get(expr.strip(), _MISSING))
+        if key is _MISSING: key = None
+    if key is None and mem not in members: raise ValueError(f"#N/A 🚫 Member not found: {expr}")
+    return dim, key, members[key]
+
+_kpi_arity = None   # weakref.WeakKeyDictionary {KPI callable: 1 or 2}, created on first use
+_kpi_expr_cache = {}
+
+def _kpi_call_arity(func) -> int:
+    """2 if a KPI callable takes (cube, ctx), 1 if it takes (ctx); read once from its signature. Memoized weakly, so a
+    dropped KPI callable is not kept alive and a new callable can never inherit its entry."""
+    global _kpi_arity
+    if _kpi_arity is None:
+        import weakref
+        _kpi_arity = weakref.WeakKeyDictionary()
+    try: return _kpi_arity[func]
+    except (KeyError, TypeError): pass
+    import inspect
+    try: params = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError): params = None
+    if params is None or any(p.kind == p.VAR_POSITIONAL for p in params): arity = 2
+    else:
+        positional = [p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]; required = sum(p.default is p.empty for p in positional)
+        if required <= 2 <= len(positional): arity = 2
+        elif required <= 1 <= len(positional): arity = 1
+        else: raise ValueError("#VALUE! 🚫 KPI callable must accept (cube, ctx) or (ctx)")
+    try: _kpi_arity[func] = arity
+    except TypeError: pass   # not weakly referenceable (some builtins): read from the signature each time
+    return arity
+
+def _call_kpi(func, cube, ctx):
+    return func(cube, ctx) if _kpi_call_arity(func) == 2 else func(ctx)
+
+def _is_kpi_expression(text: str) -> bool:
+    """KPI string parts are measure names unless they start with "=" or reference a measure as [Name]."""
+    return text.lstrip().startswith("=") or "[" in text
+
+def _compile_kpi_expression(text: str) -> tuple:
+    """Parses a KPI expression such as "=([Sales] - [Cost]) / [Measures].[Sales] * 100" once into a tuple tree.
+    Supports numbers, measure references, + - * / ^, unary minus and parentheses with Excel precedence (memoized)."""
+    tree = _kpi_expr_cache.get(text)
+    if tree is not None: return tree
+    import re
+    body = text.strip()[1:] if text.strip().startswith("=") else text
+    tokens = []; pos = 0
+    pattern = re.compile(r"\s*(?:(\[[^\]]+\](?:\.\[[^\]]+\])?)|((?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|([-+*/^()]))")
+    while pos < len(body.rstrip()):
+        m = pattern.match(body, pos)
+        if m is None: raise ValueError(f"#NAME? 🚫 Invalid KPI expression: {text}")
+        ref, num, op = m.groups(); pos = m.end()
+        if ref:
+            parts = ref[1:-1].split("].[")
+            if len(parts) == 2 and parts[0].lower() != "measures": raise ValueError(f"#VALUE! 🚫 KPI expressions reference measures only: {ref}")
+            tokens.append(("ref", parts[-1]))
+        elif num: tokens.append(("num", float(num)))
+        else: tokens.append(("op", op))
+    tokens.append(("end", None)); at = [0]
+    def peek(): return tokens[at[0]]
+    def take(): at[0] += 1; return tokens[at[0] - 1]
+    def expr():
+        node = term()
+        while peek() in (("op", "+"), ("op", "-")): node = (take()[1], node, term())
+        return node
+    def term():
+        node = power()
+        while peek() in (("op", "*"), ("op", "/")): node = (take()[1], node, power())
+        return node
+    def power():
+        node = unary()
+        while peek() == ("op", "^"): take(); node = ("^", node, unary())
+        return node
+    def unary():
+        if peek() in (("op", "-"), ("op", "+")): return ("neg", unary()) if take()[1] == "-" else unary()
+        kind, value = take()
+        if kind in ("num", "ref"): return (kind, value)
+        if (kind, value) == ("op", "("):
+            node = expr()
+            if take() != ("op", ")"): raise ValueError(f"#NAME? 🚫 Unbalanced parentheses in KPI expression: {text}")
+            return node
+        raise ValueError(f"#NAME? 🚫 Invalid KPI expression: {text}")
+    tree = expr()
+    if peek()[0] != "end": raise ValueError(f"#NAME? 🚫 Invalid KPI expression: {text}")
+    if len(_kpi_expr_cache) >= 4096: _kpi_expr_cache.clear()
+    _kpi_expr_cache[text] = tree
+    return tree
+
+def _eval_kpi_expression(node, measure):
+    """Evaluates a compiled KPI expression over arrays of per-context values; `measure(name)` returns one measure's array.
+    Returns (values, marks): cells dividing by zero or taking an invalid power are NaN and listed in `marks` as
+    (mask, ExcelError) pairs for _mark_errors, so one bad context does not fail the others."""
+    import numpy as np
+    kind = node[0]
+    if kind == "num": return node[1], []
+    if kind == "ref": return measure(node[1]), []
+    if kind == "neg":
+        a, marks = _eval_kpi_expression(node[1], measure)
+        return -a, marks
+    (a, marks_a), (b, marks_b) = _eval_kpi_expression(node[1], measure), _eval_kpi_expression(node[2], measure); marks = marks_a + marks_b
+    if kind == "+": return np.add(a, b), marks
+    if kind == "-": return np.subtract(a, b), marks
+    if kind == "*": return np.multiply(a, b), marks
+    a = np.asarray(a, dtype=float); b = np.asarray(b, dtype=float)
+    if kind == "/":
+        zero = b == 0
+        return np.divide(a, b, out=np.full(np.broadcast(a, b).shape, np.nan), where=~zero), marks + [(zero, ExcelError.DIV0)]
+    with np.errstate(invalid="ignore"): out = np.power(a, b)
+    return out, marks + [(np.isnan(out) & ~np.isnan(a), ExcelError.NUM)]
+
+_KPI_ERROR_MESSAGES = {"#DIV/0!": "division by zero in KPI calculation", "#NUM!": "invalid power in KPI calculation"}
+
+def _kpi_total(values) -> float:
+    """Sum of per-context KPI values, raising the first context's error (#DIV/0!, #NUM!) when any context has one."""
+    cells = values.tolist()
+    for v in cells:
+        if isinstance(v, ExcelError): raise ValueError(f"{v.code} 🚫 {_KPI_ERROR_MESSAGES.get(v.code, 'error in KPI calculation')}")
+    return float(sum(cells, 0.0))
+
+def _check_kpi_parts(parts: dict):
+    """Validates KPI parts once when they are added: compiles expressions and fixes the calling convention of callables."""
+    for value in parts.values():
+        if callable(value): _kpi_call_arity(value)
+        elif isinstance(value, str) and _is_kpi_expression(value): _compile_kpi_expression(value)
+
+def _same_state(a: tuple, b: tuple) -> bool:
+    return len(a) == len(b) and a[0] is b[0] and a[1:] == b[1:]
+
+def _cube_view(cube):
+    """The current snapshot of a Cube, so one CUBE call reads a single consistent version; other cube-like objects as they are."""
+    return cube.snapshot() if isinstance(cube, Cube) else cube
+
+class _RegisteredKpi:
+    """Placeholder for a KPI callable saved by its Cube.kpi_registry name."""
+    __slots__ = ("name",)
+    def __init__(self, name): self.name = name
+    def resolve(self, registry):
+        if self.name not in registry: raise ValueError(f"#NAME? 🚫 KPI function not registered: {self.name}")
+        return registry[self.name]
+
 class Cube:
     """
     `A`**`OLAP`**`engine (or cube) for in-memory analytics.`
@@ -2680,7 +3149,12 @@ class Cube:
         dimensions (dict): Dimensions of the cube.
         measures_meta (dict): Measures and their metadata.
         kpis (dict): Key Performance Indicators.
-        data (DataFrame): Underlying fact table.
+        data (DataFrame): Underlying fact table. add_data(df) stores repeated text columns as categoricals;
+            add_data(df, compact="all") also downcasts numeric columns losslessly, compact=False keeps df as given.
+            add_data("sales.csv") or add_data([chunk files]) keeps the data out of core: CSV or Parquet chunks are
+            streamed per query, reading only the referenced columns and skipping chunks by min/max statistics.
+        version (int): Bumped by every add_* call. Each publishes an immutable snapshot(); CUBE functions read one
+            snapshot per call, so threads can query while another thread adds data without locks or torn reads.
 
     **Example Inputs**:
 
@@ -2695,7 +3169,8 @@ class Cube:
 
         # Create Database
         cube = Cube("SalesCube") 
-        cube.add_data(df) 
+        cube.add_data(df)             # or cube.add_data(["sales_2023.csv", "sales_2024.csv"], chunk_rows=500_000)
+        print(cube.memory_usage())    # dtype and bytes per column, Total last
 
         # Insert Dimensions
         cube.add_dimension("Product",
@@ -2720,25 +3195,133 @@ class Cube:
         cube.add_kpi("Revenue KPI", {
                     "value": "Sales",
                     "goal":  5000,
-                    "status": lambda c, ctx: c.evaluate_measure_vectorized("Sales", ctx) / 5000 })
+                    "status": lambda c, ctx: c.evaluate_measure_vectorized("Sales", ctx) / 5000,
+                    "trend": "=[Sales] / [Qty]" })   # "=..." expressions over [Measure] references are compiled once and evaluated for all contexts together
+
+        # Persist and reopen memory-mapped (lambda KPI parts must be registered before save and open)
+        Cube.register_kpi("revenue_status", cube.kpis["Revenue KPI"]["status"])
+        cube.save("sales_cube"); cube = Cube.open("sales_cube", mmap=True)
 
     `Now use CUBE series to display output by attached snippet in description of each functions`
     """
-    def __init__(self, name): self.name = name; self.dimensions = {}; self.measures_meta = {}; self.kpis = {}; self.data = None
-    def add_data(self, df): self.data = df
-    def add_dimension(self, name, members): self.dimensions[name] = members
-    def add_measure(self, name, column, agg="sum", time_dim=None): self.measures_meta[name] = { "column": column, "agg": agg, "time_dim": time_dim }
-    def add_kpi(self, name, parts): self.kpis[name] = parts
+    version = 0; _frozen = False; _snapshot = None
+    def __init__(self, name):
+        import threading
+        self.name = name; self.dimensions = {}; self.measures_meta = {}; self.kpis = {}; self.data = None; self._member_index = {}; self._row_cache = {}; self._write_lock = threading.RLock()
+    def __getstate__(self): return {k: v for k, v in self.__dict__.items() if k not in ("_write_lock", "_snapshot")}
+    def __setstate__(self, state):
+        import threading
+        self.__dict__.update(state); self._write_lock = threading.RLock()
+    def _state(self):
+        """Identity stamp of the published attributes, so direct assignments are picked up by the next snapshot."""
+        return (self.data, *(tuple(d) + tuple(map(id, d.values())) for d in (self.dimensions, self.measures_meta, self.kpis)))
+    def _publish(self):
+        """Freezes the current state into a new read-only snapshot and swaps it in with one reference assignment.
+        Caller holds the write lock; readers keep whichever snapshot they already took."""
+        prev = self._snapshot; snap = object.__new__(type(self)); snap.__dict__.update(self.__dict__)
+        snap._member_index = {name: _freeze_dimension(members, prev._member_index.get(name) if prev is not None else None) for name, members in self.dimensions.items()}
+        snap.dimensions = {name: entry[0] for name, entry in snap._member_index.items()}
+        snap.measures_meta = {name: dict(meta) for name, meta in self.measures_meta.items()}; snap.kpis = {name: dict(parts) for name, parts in self.kpis.items()}
+        snap._row_cache = dict(prev._row_cache) if prev is not None and prev.data is self.data else {}
+        self.version += 1; snap.version = self.version; snap._frozen = True; snap._stamp = self._state(); snap._snapshot = snap
+        self._snapshot = snap
+    def snapshot(self):
+        """Immutable, versioned view of the cube. Reads never lock; writers (add_*) publish a new version atomically."""
+        snap = self._snapshot
+        if snap is not None and (self._frozen or _same_state(snap._stamp, self._state())): return snap
+        with self._write_lock:
+            if self._snapshot is None or not _same_state(self._snapshot._stamp, self._state()): self._publish()
+            return self._snapshot
+    def _writable(self):
+        if self._frozen: raise ValueError("#VALUE! 🚫 Cube snapshots are read-only")
+        return self._write_lock
+    def add_data(self, df, compact=True, chunk_rows=1 << 20):
+        import os
+        if isinstance(df, (str, os.PathLike, list, tuple)): data = _FactSource(df, chunk_rows)
+        else: data = _compact_frame(df, numeric=(compact == "all")) if compact and df is not None else df
+        with self._writable(): self.data = data; self._row_cache = {}; self._publish()   # call again after editing the frame in place, cached row codes are rebuilt
+    def memory_usage(self):
+        """Bytes and dtype of every fact-table column (and the index), largest first, plus a Total row."""
+        import pandas as pd
+        if self.data is None: return pd.DataFrame(columns=["dtype", "bytes"])
+        if isinstance(self.data, _FactSource): report = self.data.memory_usage().sort_values("bytes", ascending=False, kind="stable")
+        else:
+            usage = self.data.memory_usage(deep=True)
+            report = pd.DataFrame({"dtype": [str(self.data.index.dtype) if c == "Index" else str(self.data[c].dtype) for c in usage.index], "bytes": usage.to_numpy()}, index=usage.index).sort_values("bytes", ascending=False, kind="stable")
+        report.loc["Total"] = ["", int(report["bytes"].sum())]
+        return report
+    def add_dimension(self, name, members):
+        index = (members, len(members), *_build_member_index(members))
+        with self._writable(): self.dimensions = {**self.dimensions, name: members}; self._member_index = {**self._member_index, name: index}; self._publish()
+    def find_member(self, dim, mem, expr=None):
+        """Returns the member key of `dim` matching `mem` by key, then lower-case caption, then the full unique_name `expr`, in O(1); None if absent.
+        Snapshots carry their indexes from _publish; a stale index (dimensions assigned directly) is rebuilt locally, never stored."""
+        members = self.dimensions.get(dim, {})
+        if mem in members: return mem
+        index = self._member_index.get(dim)
+        if index is None or index[0] is not members or index[1] != len(members): index = (members, len(members), *_build_member_index(members))
+        key = index[2].get(mem.lower(), _MISSING)
+        if key is _MISSING and expr is not None: key = index[3].get(expr, _MISSING)
+        return None if key is _MISSING else key
+    def add_measure(self, name, column, agg="sum", time_dim=None):
+        with self._writable(): self.measures_meta = {**self.measures_meta, name: { "column": column, "agg": agg, "time_dim": time_dim }}; self._publish()
+    def add_kpi(self, name, parts):
+        _check_kpi_parts(parts)
+        with self._writable(): self.kpis = {**self.kpis, name: parts}; self._publish()
+    kpi_registry = {}
+    @classmethod
+    def register_kpi(cls, name, func=None):
+        """Registers a KPI callable under `name` so saved cubes can refer to it (lambdas and closures cannot be pickled); usable as a decorator."""
+        if func is None: return lambda f: cls.register_kpi(name, f)
+        cls.kpi_registry[name] = func; return func
+    def save(self, path):
+        """Writes the cube to directory `path`: one .npy file per fact column (text as categorical codes) plus cube.pkl with
+        dimensions, measures, KPIs and column layout. KPI callables are stored by registry name, else pickled by reference."""
+        import os, pickle, numpy as np, pandas as pd
+        self = self.snapshot(); df = self.data; columns = []
+        if isinstance(df, _FactSource): raise ValueError("#VALUE! 🚫 Out-of-core cubes stay in their chunk files, save an in-memory cube")
+        os.makedirs(path, exist_ok=True)
+        if df is not None:
+            for i, (name, col) in enumerate(df.items()):
+                if col.dtype.kind in "biufcmM" and not isinstance(col.dtype, pd.api.extensions.ExtensionDtype): np.save(os.path.join(path, f"col_{i}.npy"), col.to_numpy()); columns.append((name, "array", None))
+                else:
+                    cat = col if isinstance(col.dtype, pd.CategoricalDtype) else col.astype("category")
+                    np.save(os.path.join(path, f"col_{i}.npy"), cat.cat.codes.to_numpy()); columns.append((name, "category", (list(cat.cat.categories), cat.cat.ordered)))
+            index = ("range", (df.index.start, df.index.stop, df.index.step)) if isinstance(df.index, pd.RangeIndex) else ("values", list(df.index))
+        else: index = None
+        by_func = {id(f): n for n, f in self.kpi_registry.items()}; kpis = {}
+        for kpi, parts in self.kpis.items():
+            kpis[kpi] = {}
+            for part, value in parts.items():
+                if not callable(value): kpis[kpi][part] = value; continue
+                if id(value) in by_func: kpis[kpi][part] = _RegisteredKpi(by_func[id(value)]); continue
+                try: pickle.dumps(value)
+                except Exception: raise ValueError(f"#VALUE! 🚫 KPI part {kpi}.{part} is not serializable, register it with Cube.register_kpi")
+                kpis[kpi][part] = value
+        meta = {"version": 1, "name": self.name, "dimensions": self.dimensions, "measures_meta": self.measures_meta, "kpis": kpis, "columns": columns, "index": index}
+        with open(os.path.join(path, "cube.pkl"), "wb") as f: pickle.dump(meta, f)
+    @classmethod
+    def open(cls, path, mmap=True):
+        """Reopens a cube written by save(). With mmap=True the columns are read-only memory maps shared between processes,
+        so opening costs only the metadata. cube.pkl is a pickle: open trusted cubes only."""
+        import os, pickle, numpy as np, pandas as pd
+        with open(os.path.join(path, "cube.pkl"), "rb") as f: meta = pickle.load(f)
+        cube = cls(meta["name"]); cube.measures_meta = meta["measures_meta"]
+        cube.kpis = {kpi: {part: (value.resolve(cls.kpi_registry) if isinstance(value, _RegisteredKpi) else value) for part, value in parts.items()} for kpi, parts in meta["kpis"].items()}
+        for name, members in meta["dimensions"].items(): cube.add_dimension(name, members)
+        if meta["index"] is None: return cube
+        cols = {}
+        for i, (name, kind, extra) in enumerate(meta["columns"]):
+            arr = np.load(os.path.join(path, f"col_{i}.npy"), mmap_mode="r" if mmap else None)
+            cols[name] = arr if kind == "array" else pd.Categorical.from_codes(arr, dtype=pd.CategoricalDtype(extra[0], ordered=extra[1]), validate=False)
+        how, spec = meta["index"]
+        index = pd.RangeIndex(*spec) if how == "range" else pd.Index(spec)
+        cube.add_data(pd.DataFrame(cols, index=index, copy=False), compact=False)
+        return cube
     def evaluate_measure_vectorized(self, measure, ctx):
+        """Plain sum of the measure column over the rows matching `ctx` ({dim: key}); streams chunks for out-of-core cubes."""
         meta = self.measures_meta[measure]
-        df = self.data
-        mask = None
-        for dim, key in ctx.items():
-            m = (df[dim] == key)
-            mask = m if mask is None else (mask & m)
-        sub = df if mask is None else df[mask]
-        if sub.empty: return 0.0
-        return float(sub[meta["column"]].sum())
+        return float(_cube_grid_values(self, {"column": meta["column"], "agg": "sum"}, [[(dim, key)] for dim, key in ctx.items()], unary=False)[0][0])
 
 def CUBEKPIMEMBER(cube: object, kpi_name: str, kpi_property: int | str, caption: str | None = None) -> dict:
     """
@@ -2768,6 +3351,7 @@ def CUBEKPIMEMBER(cube: object, kpi_name: str, kpi_property: int | str, caption:
     `Refer "Cube" Class in excelfred to understand database.`
     """
     if cube is None: raise ValueError("#NAME? 🚫 Invalid or missing connection.")
+    cube = _cube_view(cube)
     if not hasattr(cube, "kpis") or kpi_name not in cube.kpis: raise ValueError(f"#N/A 🚫 KPI not found: {kpi_name}")
     prop_map = {1:"value", 2:"goal", 3:"status", 4:"trend", 5:"weight"}
     if isinstance(kpi_property, int): prop = prop_map.get(kpi_property)
@@ -2778,13 +3362,8 @@ def CUBEKPIMEMBER(cube: object, kpi_name: str, kpi_property: int | str, caption:
     part = kpi_parts.get(prop)
     if prop in ("status", "trend") and callable(part):
         def wrapper(c, filters):
-            try:  val = part(c, filters)
-            except TypeError:  val = part(filters)
-            goal_val = kpi_parts.get("goal")
-            if isinstance(goal_val, str):  goal_val = c.evaluate_measure_vectorized(goal_val, filters)
-            elif callable(goal_val):
-                try: goal_val = goal_val(c, filters)
-                except TypeError: goal_val = goal_val(filters)
+            val = _call_kpi(part, c, filters)
+            goal_val = _kpi_goal_value(c, kpi_parts.get("goal"), filters)
             if goal_val is None or goal_val == 0: raise ValueError("#DIV/0! 🚫 goal is zero or missing")
             return float(val) / float(goal_val)
         part = wrapper
@@ -2810,24 +3389,10 @@ def CUBEMEMBER(cube: object, member_expression: str, caption: str | None = None)
     `Refer "Cube" Class in excelfred to understand database.`
     """
     if cube is None: raise ValueError("#NAME? 🚫 Invalid or missing connection.")
+    cube = _cube_view(cube)
     if not isinstance(member_expression, str): raise ValueError("#VALUE! 🚫 member_expression must be a string")
-    s = member_expression.strip()
-    try:
-        token = s
-        if token.startswith("[") and token.endswith("]"): token = token[1:-1]
-        parts = token.split("].[")
-        dim = parts[0]; mem = parts[-1]
-    except Exception: raise ValueError(f"#N/A 🚫 Invalid member expression: {member_expression}")
-    if not hasattr(cube, "dimensions") or dim not in cube.dimensions: raise ValueError(f"#N/A 🚫 Dimension not found: {dim}")
-    members = cube.dimensions.get(dim, {})
-    if mem in members:
-        info = members[mem]
-        return {"type": "member", "unique_name": member_expression, "dimension": dim, "key": mem, "caption": caption or info.get("caption", mem)}
-    for key, info in members.items():
-        if str(info.get("caption", "")).lower() == mem.lower(): return {"type": "member", "unique_name": member_expression, "dimension": dim, "key": key, "caption": caption or info.get("caption", key)}
-    for key, info in members.items():
-        if info.get("unique_name") == member_expression: return {"type": "member", "unique_name": member_expression, "dimension": dim, "key": key, "caption": caption or info.get("caption", key)}
-    raise ValueError(f"#N/A 🚫 Member not found: {member_expression}")
+    dim, key, info = _resolve_member(cube, member_expression)
+    return {"type": "member", "unique_name": member_expression, "dimension": dim, "key": key, "caption": caption or info.get("caption", key)}
 
 def CUBEMEMBERPROPERTY(cube: object, member_expression: str | dict, property_name: str) -> str:
     """
@@ -2847,6 +3412,7 @@ def CUBEMEMBERPROPERTY(cube: object, member_expression: str | dict, property_nam
     `Refer "Cube" Class in excelfred to understand database.`
     """
     if cube is None: raise ValueError("#NAME? 🚫 Invalid or missing connection.")
+    cube = _cube_view(cube)
     if not property_name: raise ValueError("#VALUE! 🚫 property_name is required")
     if isinstance(member_expression, dict) and member_expression.get("type") == "member":
         handle = member_expression; prop = property_name.strip().lower()
@@ -2855,23 +3421,7 @@ def CUBEMEMBERPROPERTY(cube: object, member_expression: str | dict, property_nam
         if prop in ("key",): return handle.get("key")
         raise ValueError(f"#N/A 🚫 Property not found: {property_name}")
     if isinstance(member_expression, str):
-        s = member_expression.strip()
-        try:
-            token = s
-            if token.startswith("[") and token.endswith("]"): token = token[1:-1]
-            parts = token.split("].[")
-            dim = parts[0]; mem = parts[-1]
-        except Exception: raise ValueError(f"#N/A 🚫 Invalid member expression: {member_expression}")
-        if not hasattr(cube, "dimensions") or dim not in cube.dimensions: raise ValueError(f"#N/A 🚫 Dimension not found: {dim}")
-        members = cube.dimensions.get(dim, {}); key = None; info = None
-        if mem in members: key = mem; info = members[mem]
-        else:
-            for k, v in members.items(): 
-                if str(v.get("caption", "")).lower() == mem.lower(): key = k; info = v; break
-            if not key:
-                for k, v in members.items():
-                    if v.get("unique_name") == member_expression: key = k; info = v; break
-        if not key: raise ValueError(f"#N/A 🚫 Member not found: {member_expression}")
+        dim, key, info = _resolve_member(cube, member_expression)
         prop = property_name.strip().lower()
         if prop in ("member_caption", "caption"): return info.get("caption", key)
         if prop in ("member_unique_name", "unique_name"): return info.get("unique_name", f"[{dim}].[{key}]")
@@ -2879,7 +3429,20 @@ def CUBEMEMBERPROPERTY(cube: object, member_expression: str | dict, property_nam
         raise ValueError(f"#N/A 🚫 Property not found: {property_name}")
     raise ValueError("#VALUE! 🚫 invalid member handle or expression")
 
-def CUBESET(cube: object, set_expression: str | list[str | dict] | tuple, caption: str | None = None, sort_order: int | None = None, sort_by: str | None = None) -> dict:  
+def _measure_scores(cube: object, measure: str, members_list: list):
+    """Scores every member of a set by `measure` with one grid pass per dimension (0.0 where the member has no data)."""
+    import numpy as np
+    scores = np.zeros(len(members_list)); meta = getattr(cube, "measures_meta", {}).get(measure); df = getattr(cube, "data", None)
+    if meta is None or df is None: return scores
+    by_dim = {}
+    for i, m in enumerate(members_list): by_dim.setdefault(m.get("dimension"), []).append(i)
+    for dim, idx in by_dim.items():
+        if dim not in df.columns: continue
+        try: scores[idx] = _cube_grid_values(cube, meta, [[(dim, members_list[i]["key"]) for i in idx]], unary=False)[0]
+        except Exception: continue
+    return scores
+
+def CUBESET(cube: object, set_expression: str | list[str | dict] | tuple, caption: str | None = None, sort_order: int | None = None, sort_by: str | None = None, top_n: int | None = None) -> dict:  
     """
     `=CUBESET(connection, set_expression, [caption], [sort_order], [sort_by])` Returns a **set** of members from a cube.
 
@@ -2889,6 +3452,7 @@ def CUBESET(cube: object, set_expression: str | list[str | dict] | tuple, captio
         [caption] (str, optional): A caption for the cell. If omitted, the set_expression is used.
         [sort_order] (int, optional): Sort order for the set. 1 = descending, 2 = ascending, 5 or 6 = sort by measure (requires sort_by).
         [sort_by] (str, optional): The measure name to sort by (required if sort_order is 5 or 6).
+        [top_n] (int, optional): Keep only the first top_n members after sorting (with any sort_order, or in set order without one); sort_order 5 or 6 selects them with a partial selection instead of a full sort.
     
     **SAMPLE CODE**:
 
@@ -2911,83 +3475,44 @@ def CUBESET(cube: object, set_expression: str | list[str | dict] | tuple, captio
     `Refer "Cube" Class in excelfred to understand database.`
     """    
     if cube is None: raise ValueError("#NAME? 🚫 Invalid or missing connection.")
+    cube = _cube_view(cube)
     members_list = []
     if isinstance(set_expression, (list, tuple)):
         for m in set_expression:
             if isinstance(m, dict) and m.get("type") == "member": members_list.append({"unique_name": m.get("unique_name"), "dimension": m.get("dimension"), "key": m.get("key"), "caption": m.get("caption")}); continue
             if not isinstance(m, str): raise ValueError("#VALUE! 🚫 set member must be string or member-handle")
-            s = m.strip()
-            try:
-                token = s
-                if token.startswith("[") and token.endswith("]"): token = token[1:-1]
-                parts = token.split("].[")
-                dim = parts[0]; mem = parts[-1]
-            except Exception: raise ValueError(f"#N/A 🚫 Invalid member in set: {m}")
-            if dim not in cube.dimensions: raise ValueError(f"#N/A 🚫 Dimension not found: {dim}")
-            members = cube.dimensions.get(dim, {})
-            if mem in members:
-                info = members[mem]
-                members_list.append({"unique_name": m, "dimension": dim, "key": mem, "caption": info.get("caption", mem)})
-            else:
-                found = False
-                for key, info in members.items():
-                    if str(info.get("caption","")).lower() == mem.lower() or info.get("unique_name")==m:
-                        members_list.append({"unique_name": m, "dimension": dim, "key": key, "caption": info.get("caption", key)})
-                        found = True; break
-                if not found: raise ValueError(f"#N/A 🚫 Member not found in set: {m}")
+            try: dim, key, info = _resolve_member(cube, m)
+            except ValueError as e:
+                if "Member not found" in str(e): raise ValueError(f"#N/A 🚫 Member not found in set: {m}")
+                raise
+            members_list.append({"unique_name": m, "dimension": dim, "key": key, "caption": info.get("caption", key)})
     elif isinstance(set_expression, str):
         s = set_expression.strip()
         if s in cube.dimensions:
             members_map = cube.dimensions.get(s, {})
             for key, info in members_map.items(): members_list.append({"unique_name": info.get("unique_name", f"[{s}].[{key}]"), "dimension": s, "key": key, "caption": info.get("caption", key)})
         else:
-            try:
-                token = s
-                if token.startswith("[") and token.endswith("]"): token = token[1:-1]
-                dim = token.split("].[")[0]
-            except Exception: dim = None
+            dim = _parse_member_expression(s)[0]
             if dim and dim in cube.dimensions:
                 members_map = cube.dimensions.get(dim, {})
                 for key, info in members_map.items(): members_list.append({"unique_name": info.get("unique_name", f"[{dim}].[{key}]"), "dimension": dim, "key": key, "caption": info.get("caption", key)})
             else: raise ValueError(f"#N/A 🚫 Invalid set expression: {set_expression}")
     else: raise ValueError("#VALUE! 🚫 set_expression must be string or list/tuple")
     if len(members_list) == 0: raise ValueError("#N/A 🚫 The set is empty.")
+    import numbers
+    if top_n is not None and (not isinstance(top_n, numbers.Integral) or isinstance(top_n, bool) or top_n < 1): raise ValueError("#VALUE! 🚫 top_n must be an integer >= 1")
     if sort_order in (1, 2): members_list = sorted(members_list, key=lambda x: str(x.get("caption","")), reverse=(sort_order==1))
     elif sort_order in (5, 6):
         if not sort_by: raise ValueError("#VALUE! 🚫 sort_by measure is required for this sort_order")
-        scores = []
-        for m in members_list:
-            try:
-                meta = cube.measures_meta.get(sort_by)
-                if meta is None: score = 0.0
-                else:
-                    col = meta.get("column"); agg = meta.get("agg","sum"); time_dim = meta.get("time_dim")
-                    df = cube.data if hasattr(cube, "data") else None
-                    if df is None: score = 0.0
-                    else:
-                        if m["dimension"] not in df.columns: score = 0.0
-                        else:
-                            sub = df[df[m["dimension"]] == m["key"]]
-                            if sub.shape[0] == 0: score = 0.0
-                            else:
-                                series_vals = sub[col].astype(float)
-                                if agg == "sum": score = float(series_vals.sum())
-                                elif agg == "avg":
-                                    vals = series_vals.dropna()
-                                    if vals.shape[0] == 0: score = 0.0
-                                    else: score = float(vals.mean())
-                                elif agg == "last_non_empty":
-                                    if time_dim and time_dim in sub.columns:
-                                        orded = sub.loc[series_vals.notna()].sort_values(by=time_dim)
-                                        score = float(orded.iloc[-1][col]) if orded.shape[0]>0 else 0.0
-                                    else: score = float(series_vals.sum())
-                                else: score = float(series_vals.sum())
-                scores.append(score)
-            except Exception: scores.append(0.0)
-        zipped = list(zip(members_list, scores))
-        zipped.sort(key=lambda x: x[1], reverse=(sort_order==6))
-        members_list = [z[0] for z in zipped]
-    else: pass
+        import numpy as np
+        key = _measure_scores(cube, sort_by, members_list)
+        if sort_order == 6: key = -key
+        if top_n is not None and top_n < len(members_list):
+            kth = np.partition(key, top_n - 1)[top_n - 1]; cand = np.flatnonzero(key <= kth)
+            order = cand[np.argsort(key[cand], kind="stable")][:top_n]
+        else: order = np.argsort(key, kind="stable")
+        members_list = [members_list[i] for i in order]
+    if top_n is not None: members_list = members_list[:top_n]
     return {"type": "set", "members": members_list, "caption": caption or (set_expression if isinstance(set_expression, str) else "set")}
 
 def CUBESETCOUNT(set_handle: dict | list | tuple) -> int:
@@ -3035,42 +3560,137 @@ def CUBERANKEDMEMBER(cube: object, set_handle: dict, rank: int, caption: str | N
     m = members[rank-1]
     return {"type":"member","unique_name": m.get("unique_name"), "dimension": m.get("dimension"), "key": m.get("key"), "caption": caption or m.get("caption")}
 
-def CUBEVALUE(cube: object, *member_expressions: object) -> float:
+def CUBEVALUE(cube: object, *member_expressions: object, errors: str = "raise", workers: int = 1, chunk_size: int | None = None, executor: str = "thread") -> float:
     """
     `=CUBEVALUE(connection, member_expression1, [member_expression2], ...)` Returns the **aggregated value** from the cube for the given members, set, or KPI.
 
     Parameters:
         cube (object): The cube connection object. Must not be None.
         member_expressions (object): One or more member expressions, sets, KPI handles, or measure names. Each argument defines a filter context for the value.
+        [workers] (int, optional): Measures over set cross-products are evaluated as one grid; with workers > 1 the fact rows are aggregated in chunks on a pool. Default 1 (serial).
+        [chunk_size] (int, optional): Fact rows per chunk (default 1,048,576). Results do not depend on `workers` for a given chunk_size.
+        [executor] (str, optional): "thread" (default) or "process" pool for workers > 1.
     
     **SAMPLE OUTPUT**:
 
      print(CUBEVALUE(cube, rank1, "Sales"))             # 2800.0
      print(CUBEVALUE(cube, rank1, kpi_value_handle))    # 2800.0
      print(CUBEVALUE(cube, product_set, "Sales"))       # 4300.0
+     print(CUBEVALUE(cube, rank1, "Profit", errors="return"))   # #N/A (ExcelError.NA instead of raising)
 
     `Refer "Cube Class" in excelfred to understand database`
     """
+    _check_errors_mode(errors)
+    if errors == "raise": return _cubevalue(cube, member_expressions, workers, chunk_size, executor)
+    try: return _cubevalue(cube, member_expressions, workers, chunk_size, executor)
+    except (ValueError, ZeroDivisionError) as e: return ExcelError.from_exception(e)
+
+def CUBEVALUE_GRID(cube: object, measure: str, row_set: object, col_set: object, *slicers: object, errors: str = "raise", workers: int = 1, chunk_size: int | None = None, executor: str = "thread") -> "pd.DataFrame":
+    """
+    `CUBEVALUE_GRID(connection, measure, row_set, col_set, [slicer1], ...)` Returns a **pivot matrix** of CUBEVALUE over every row × column member pair from a single pass over the fact table.
+
+    Parameters:
+        cube (object): The cube connection object. Must not be None.
+        measure (str): Measure name, "[Measures].[Name]" or None for the default measure.
+        row_set (object): Members of the rows: a CUBESET handle, a dimension name or a list of member expressions.
+        col_set (object): Members of the columns, same forms as row_set.
+        [slicers] (object, optional): Extra member expressions or sets applied to every cell, as in CUBEVALUE.
+        [errors] (str, optional): "raise" (default) or "return" to put ExcelError.DIV0 in avg cells without numeric data.
+        [workers], [chunk_size], [executor]: Pooled evaluation, as in CUBEVALUE.
+
+    Cell (i, j) equals `CUBEVALUE(cube, row_member_i, col_member_j, *slicers, measure)`, unary operators and last_non_empty included.
+    
+    **SAMPLE OUTPUT**:
+
+     print(CUBEVALUE_GRID(cube, "Sales", "Product", "Region"))
+     # >>>         United States  Europe
+     #     Bike           2100.0   700.0
+     #     Helmet          300.0   700.0
+     print(CUBEVALUE_GRID(cube, "Sales", product_set, "Region", "[Year].[2023]").to_numpy())   # [[1000. 700.] [300. 200.]]
+
+    `Refer "Cube Class" in excelfred to understand database`
+    """
+    import numpy as np, pandas as pd
+    _check_errors_mode(errors)
+    if cube is None: raise ValueError("#NAME? 🚫 Invalid or missing connection.")
+    cube = _cube_view(cube)
+    if not hasattr(cube, "measures_meta") or not hasattr(cube, "data"): raise ValueError("#N/A 🚫 cube missing measures or data")
+    axes = []
+    for axis in (row_set, col_set):
+        handle = axis if isinstance(axis, dict) and axis.get("type") == "set" else CUBESET(cube, axis)
+        members = handle.get("members", [])
+        if len(members) == 0: raise ValueError("#N/A 🚫 empty set")
+        axes.append(members)
+    rows, cols = axes
+    factors, measure_name, kpi_handle = _cube_factors(cube, slicers if measure is None else (*slicers, measure))
+    if kpi_handle is not None: raise ValueError("#VALUE! 🚫 CUBEVALUE_GRID evaluates measures, not KPI handles")
+    meta = _cube_measure_meta(cube, measure_name)
+    factors = [[(m["dimension"], m["key"]) for m in rows], [(m["dimension"], m["key"]) for m in cols], *factors]
+    try: values, no_data = _cube_grid_values(cube, meta, factors, workers, chunk_size, executor)
+    except (ZeroDivisionError, ValueError): raise
+    except Exception as e: raise ValueError(f"#VALUE! 🚫 {e}")
+    shape = (-1, len(cols), len(rows))
+    values = np.add.reduce(values.reshape(shape), axis=0, initial=0.0).T; no_data = no_data.reshape(shape).any(axis=0).T
+    if no_data.any() and errors == "raise": raise ValueError("#DIV/0! 🚫 no numeric data for average")
+    values = _mark_errors(values, errors, (no_data, ExcelError.DIV0))
+    return pd.DataFrame(values, index=[m.get("caption") for m in rows], columns=[m.get("caption") for m in cols])
+
+def _cubevalue(cube, member_expressions, workers=1, chunk_size=None, executor="thread"):
+    """CUBEVALUE body, raises ValueError carrying the Excel error code."""
     import pandas as pd
     if cube is None: raise ValueError("#NAME? 🚫 Invalid or missing connection.")
+    cube = _cube_view(cube)
     if not hasattr(cube, "measures_meta") or not hasattr(cube, "data"): raise ValueError("#N/A 🚫 cube missing measures or data")
+    factors, measure_name, kpi_handle = _cube_factors(cube, member_expressions)
+    if kpi_handle is not None:
+        kpi_name = kpi_handle.get("kpi_name"); kpi_part = kpi_handle.get("kpi_part")
+        if kpi_name is None or kpi_part is None: raise ValueError("#VALUE! 🚫 invalid KPI handle")
+        parts = None if hasattr(cube, "evaluate_kpi_part") else cube.kpis.get(kpi_name)
+        part = parts.get(kpi_part) if parts is not None else None
+        if isinstance(part, str):
+            values = _kpi_text_values(cube, part, factors)
+            return 0.0 if values is None else _kpi_total(values)
+        contexts = _expand_contexts(factors)
+        total = 0.0
+        for ctx in contexts:
+            try:
+                if hasattr(cube, "evaluate_kpi_part"): val = cube.evaluate_kpi_part(kpi_name, kpi_part, ctx)
+                else:
+                    parts = cube.kpis.get(kpi_name)
+                    if parts is None: raise ValueError(f"#N/A 🚫 KPI not found: {kpi_name}")
+                    part = parts.get(kpi_part)
+                    val = _call_kpi(part, cube, ctx) if callable(part) else float(part)
+                total += float(val)
+            except ZeroDivisionError: raise ValueError("#DIV/0! 🚫 division by zero in KPI calculation")
+            except ValueError: raise
+            except Exception as e: raise ValueError(f"#VALUE! 🚫 {e}")
+        return float(total)
+    meta = _cube_measure_meta(cube, measure_name)
+    try: values, no_data = _cube_grid_values(cube, meta, factors, workers, chunk_size, executor)
+    except (ZeroDivisionError, ValueError): raise
+    except Exception as e: raise ValueError(f"#VALUE! 🚫 {e}")
+    if no_data.any(): raise ValueError("#DIV/0! 🚫 no numeric data for average")
+    return float(sum(values.tolist(), 0.0))
+
+def _cube_measure_meta(cube, measure_name) -> dict:
+    """Metadata of the measure CUBEVALUE evaluates ("Value" or the only measure when none is named)."""
+    if measure_name is None:
+        if "Value" in cube.measures_meta: measure_name = "Value"
+        else:
+            if len(cube.measures_meta) == 1: measure_name = list(cube.measures_meta.keys())[0]
+            else: raise ValueError("#N/A 🚫 No measure specified and no default available")
+    meta = cube.measures_meta.get(measure_name)
+    if meta is None: raise ValueError(f"#N/A 🚫 Measure not found: {measure_name}")
+    if cube.data is None: raise ValueError("#N/A 🚫 Data not loaded in cube")
+    return meta
+
+def _cube_factors(cube, member_expressions) -> tuple:
+    """Parses CUBEVALUE arguments into (member factors, measure name, KPI handle); each factor lists the (dimension, key) pairs of one member or set."""
     def _resolve_member_inline(expr):
         if not isinstance(expr, str): raise ValueError("#VALUE! 🚫 member expression must be string")
-        s = expr.strip()
-        try:
-            t = s
-            if t.startswith("[") and t.endswith("]"): t = t[1:-1]
-            parts = t.split("].[")
-            dim = parts[0]; mem = parts[-1]
-        except Exception: raise ValueError(f"#N/A 🚫 Invalid member expression: {expr}")
-        if dim not in cube.dimensions: raise ValueError(f"#N/A 🚫 Dimension not found: {dim}")
-        members = cube.dimensions.get(dim, {})
-        if mem in members: return dim, mem, members[mem]
-        for key, info in members.items():
-            if str(info.get("caption","")).lower() == mem.lower() or info.get("unique_name") == expr: return dim, key, info
-        raise ValueError(f"#N/A 🚫 Member not found: {expr}")
+        return _resolve_member(cube, expr)
     measure_name = None; kpi_handle = None
-    contexts = [{}]  
+    factors = []
     for arg in member_expressions:
         if arg is None: continue
         if isinstance(arg, dict):
@@ -3080,18 +3700,12 @@ def CUBEVALUE(cube: object, *member_expressions: object) -> float:
                 if dim is None or key is None:
                     try: dim, key, _ = _resolve_member_inline(arg.get("unique_name"))
                     except Exception as e: raise ValueError(str(e))
-                for c in contexts: c[dim] = key
+                factors.append([(dim, key)])
                 continue
             if t == "set":
                 members = arg.get("members", [])
                 if len(members) == 0: raise ValueError("#N/A 🚫 empty set")
-                new_contexts = []
-                for mem in members:
-                    for c in contexts:
-                        copied = dict(c)
-                        copied[mem["dimension"]] = mem["key"]
-                        new_contexts.append(copied)
-                contexts = new_contexts
+                factors.append([(mem["dimension"], mem["key"]) for mem in members])
                 continue
             if t == "kpi": kpi_handle = arg; continue
             raise ValueError("#VALUE! 🚫 unsupported handle passed to CUBEVALUE")
@@ -3104,138 +3718,204 @@ def CUBEVALUE(cube: object, *member_expressions: object) -> float:
             if s in cube.measures_meta:
                 measure_name = s
                 continue
-            if s in cube.dimensions or (s.startswith("[") and s.strip("[]").split("].[")[0] in cube.dimensions):
+            # "[Dim]" alone is the whole dimension; "[Dim].[Member]" is that member (the baseline read it as the whole dimension too)
+            if s in cube.dimensions or (s.startswith("[") and "].[" not in s and _parse_member_expression(s)[0] in cube.dimensions):
                 try:
-                    if s in cube.dimensions: dim = s
-                    else:
-                        token = s
-                        if token.startswith("[") and token.endswith("]"): token = token[1:-1]
-                        dim = token.split("].[")[0]
+                    dim = s if s in cube.dimensions else _parse_member_expression(s)[0]
                     members_map = cube.dimensions.get(dim, {})
-                    members = [{"dimension": dim, "key": k, "caption": v.get("caption", k)} for k, v in members_map.items()]
-                    if len(members) == 0: raise ValueError("#N/A 🚫 The set is empty.")
-                    new_contexts = []
-                    for mem in members:
-                        for c in contexts:
-                            copied = dict(c)
-                            copied[mem["dimension"]] = mem["key"]
-                            new_contexts.append(copied)
-                    contexts = new_contexts
+                    if len(members_map) == 0: raise ValueError("#N/A 🚫 The set is empty.")
+                    factors.append([(dim, k) for k in members_map])
                     continue
                 except Exception as e: raise ValueError(str(e))
             try:
                 dim, key, info = _resolve_member_inline(s)
             except Exception as e: raise ValueError(str(e))
-            for c in contexts: c[dim] = key
+            factors.append([(dim, key)])
             continue
-        raise ValueError("#VALUE! 🚫 unsupported argument type for CUBEVALUE",info)
-    if kpi_handle is not None:
-        kpi_name = kpi_handle.get("kpi_name"); kpi_part = kpi_handle.get("kpi_part")
-        if kpi_name is None or kpi_part is None: raise ValueError("#VALUE! 🚫 invalid KPI handle")
-        total = 0.0
-        for ctx in contexts:
-            try:
-                if hasattr(cube, "evaluate_kpi_part"): val = cube.evaluate_kpi_part(kpi_name, kpi_part, ctx)
-                else:
-                    parts = cube.kpis.get(kpi_name)
-                    if parts is None: raise ValueError(f"#N/A 🚫 KPI not found: {kpi_name}")
-                    part = parts.get(kpi_part)
-                    if isinstance(part, str):
-                        meta = cube.measures_meta.get(part)
-                        if meta is None: val = 0.0
-                        else:
-                            col = meta.get("column"); agg = meta.get("agg","sum"); time_dim = meta.get("time_dim")
-                            df = cube.data
-                            if df is None: val = 0.0
-                            else:
-                                mask = None
-                                for d,k in ctx.items():
-                                    if d not in df.columns: raise ValueError(f"#N/A 🚫 Dimension column not found in data: {d}")
-                                    m = (df[d]==k)
-                                    mask = m if mask is None else (mask & m)
-                                sub = df if mask is None else df[mask]
-                                if sub.shape[0]==0: val = 0.0
-                                else:
-                                    series_vals = sub[col].astype(float)
-                                    if agg=="sum": val = float(series_vals.sum())
-                                    elif agg=="avg":
-                                        vals = series_vals.dropna()
-                                        if vals.shape[0]==0: raise ValueError("#DIV/0! 🚫 no numeric data for average")
-                                        val = float(vals.mean())
-                                    elif agg=="last_non_empty":
-                                        if time_dim and time_dim in sub.columns:
-                                            orded = sub.loc[series_vals.notna()].sort_values(by=time_dim)
-                                            val = float(orded.iloc[-1][col]) if orded.shape[0]>0 else 0.0
-                                        else: val = float(series_vals.sum())
-                                    else: val = float(series_vals.sum())
-                    elif callable(part):
-                        try: val = part(cube, ctx)
-                        except TypeError: val = part(ctx)
-                    else: val = float(part)
-                total += float(val)
-            except ZeroDivisionError: raise ValueError("#DIV/0! 🚫 division by zero in KPI calculation")
-            except Exception as e:
-                msg = str(e)
-                if msg.startswith("#"): raise
-                raise ValueError(f"#VALUE! 🚫 {msg}")
-        return float(total)
-    if measure_name is None:
-        if "Value" in cube.measures_meta: measure_name = "Value"
-        else:
-            if len(cube.measures_meta) == 1: measure_name = list(cube.measures_meta.keys())[0]
-            else: raise ValueError("#N/A 🚫 No measure specified and no default available")
-    def _eval_one_context(ctx):
-        try:
-            meta = cube.measures_meta.get(measure_name)
-            if meta is None: raise ValueError(f"#N/A 🚫 Measure not found: {measure_name}")
-            col = meta.get("column"); agg = meta.get("agg","sum"); time_dim = meta.get("time_dim")
-            df = cube.data
-            if df is None: raise ValueError("#N/A 🚫 Data not loaded in cube")
-            mask = None
-            for d,k in ctx.items():
-                if d not in df.columns: raise ValueError(f"#N/A 🚫 Dimension column not found in data: {d}")
-                m = (df[d] == k)
-                mask = m if mask is None else (mask & m)
-            sub = df if mask is None else df[mask]
-            if sub.shape[0] == 0: return 0.0
-            mul = None
-            unary_present = False
-            for d,k in ctx.items():
-                info = cube.dimensions.get(d, {}).get(k, {})
-                if info and info.get("unary", 1) != 1:
-                    unary_present = True
-                    break
-            if unary_present:
-                mul = (pd.Series(1, index=sub.index))
-                for d,k in ctx.items():
-                    info = cube.dimensions.get(d, {}).get(k, {})
-                    u = info.get("unary", 1)
-                    if u == -1: mul = mul * -1
-                    elif u == 0: mul = mul * 0
-                    else: mul = mul * 1
-                series_vals = sub[col].astype(float) * mul
-            else: series_vals = sub[col].astype(float)
-            if agg == "sum": return float(series_vals.sum())
-            if agg == "avg":
-                vals = series_vals.dropna()
-                if vals.shape[0] == 0: raise ValueError("#DIV/0! 🚫 no numeric data for average")
-                return float(vals.mean())
-            if agg == "last_non_empty":
-                if time_dim is None or time_dim not in sub.columns: return float(series_vals.sum())
-                ordered = sub.loc[series_vals.notna()].sort_values(by=time_dim)
-                if ordered.shape[0] == 0: return 0.0
-                return float(ordered.iloc[-1][col])
-            return float(series_vals.sum())
-        except ZeroDivisionError: raise
-        except Exception as e:
-            msg = str(e)
-            if msg.startswith("#"): raise
-            raise ValueError(f"#VALUE! 🚫 {msg}")
-    result = 0.0
-    for ctx in contexts:
-        val = _eval_one_context(ctx)
-        result += float(val)
-    return float(result)
+        raise ValueError("#VALUE! 🚫 unsupported argument type for CUBEVALUE")
+    return factors, measure_name, kpi_handle
+
+def _kpi_measure_values(cube, measure: str, factors: list):
+    """Per-context values of `measure` for a KPI part (unary operators are not applied), None if the measure is unknown."""
+    meta = cube.measures_meta.get(measure)
+    if meta is None or cube.data is None: return None
+    try: values, no_data = _cube_grid_values(cube, meta, factors, unary=False)
+    except (ZeroDivisionError, ValueError): raise
+    except Exception as e: raise ValueError(f"#VALUE! 🚫 {e}")
+    if no_data.any(): raise ValueError("#DIV/0! 🚫 no numeric data for average")
+    return values
+
+def _kpi_text_values(cube, text: str, factors: list):
+    """Per-context values of a string KPI part: a measure name, or a compiled expression such as "=[Sales] * 1.1".
+    None when there is no data (or `text` names no measure and is no expression). Contexts whose expression divides
+    by zero or takes an invalid power hold ExcelError values (the array is then an object array)."""
+    if text in cube.measures_meta or not _is_kpi_expression(text): return _kpi_measure_values(cube, text, factors)
+    if cube.data is None: return None
+    import numpy as np
+    tree = _compile_kpi_expression(text); cache = {}
+    def measure(name):
+        if name not in cache:
+            cache[name] = _kpi_measure_values(cube, name, factors)
+            if cache[name] is None: raise ValueError(f"#N/A 🚫 Measure not found: {name}")
+        return cache[name]
+    values, marks = _eval_kpi_expression(tree, measure)
+    values = np.broadcast_to(np.asarray(values, dtype=float), (_cube_cell_count(factors),))
+    marks = [(m, e) for m, e in marks if np.any(m)]
+    return _mark_errors(values, "return", *marks) if marks else values
+
+def _kpi_goal_value(cube, goal, filters: dict):
+    """A KPI goal for one filter context ({dim: key}): string goals are measure names or compiled expressions, as in
+    CUBEVALUE; callables are called; constants are returned as they are."""
+    if isinstance(goal, str):
+        values = _kpi_text_values(cube, goal, [[(dim, key)] for dim, key in filters.items()])
+        if values is None: raise ValueError(f"#N/A 🚫 Measure not found: {goal}")
+        return _kpi_total(values)
+    return _call_kpi(goal, cube, filters) if callable(goal) else goal
+
+def _cube_cell_count(factors: list) -> int:
+    import math
+    return math.prod(len(f) for f in factors)
+
+def _expand_contexts(factors: list) -> list:
+    """Cross-joins member factors into context dicts in CUBEVALUE order (later factors vary slowest, later assignments win)."""
+    contexts = [{}]
+    for factor in factors: contexts = [{**c, dim: key} for dim, key in factor for c in contexts]
+    return contexts
+
+_CUBE_CHUNK_ROWS = 1 << 20
+
+def _column_codes(column, keys: list):
+    """Position of every value of `column` in `keys` (-1 if absent); categorical columns are mapped through their categories at integer speed."""
+    import numpy as np, pandas as pd
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        lut = np.append(pd.Index(keys).get_indexer(column.cat.categories), -1).astype(np.int64)
+        return lut[column.cat.codes.to_numpy()]
+    return pd.Index(keys).get_indexer(np.asarray(column)).astype(np.int64)
+
+def _cube_cached(cube, key, stamp, build):
+    """Returns build() memoized in the Cube's row cache under `key` while `stamp` is unchanged; other cube objects just build."""
+    cache = getattr(cube, "_row_cache", None)
+    if not isinstance(cache, dict): return build()
+    hit = cache.get(key)
+    if hit is None or len(hit[0]) != len(stamp) or any(a is not b and not (type(a) is int and a == b) for a, b in zip(hit[0], stamp)): hit = cache[key] = (stamp, build())
+    return hit[1]
+
+def _cube_row_codes(cube, dim: str, keys: list):
+    """Codes of fact column `dim` against `keys` (-1 for other values), remapped from a factorisation over all members of the dimension cached until data or members change."""
+    import numpy as np, pandas as pd
+    df = cube.data; members = getattr(cube, "dimensions", {}).get(dim)
+    if members is None or not all(k in members for k in keys): return _column_codes(df[dim], keys)
+    def build():
+        full = list(members)
+        return {k: i for i, k in enumerate(full)}, _column_codes(df[dim], full)
+    position, codes = _cube_cached(cube, ("codes", dim), (df, members, len(members)), build)
+    remap = np.full(len(position) + 1, -1, dtype=np.int64); remap[[position[k] for k in keys]] = np.arange(len(keys))
+    return remap[codes]
+
+def _cube_time_order(cube, time_dim: str):
+    """Per-row position of the fact table in a stable sort by `time_dim` (missing times last), cached like the row codes; the largest position is the last_non_empty row."""
+    import numpy as np, pandas as pd
+    df = cube.data
+    def build():
+        rank = pd.factorize(df[time_dim], sort=True)[0].astype(np.int64)
+        if rank.size: rank[rank < 0] = rank.max() + 1
+        order = np.empty(rank.shape[0], dtype=np.int64); order[np.argsort(rank, kind="stable")] = np.arange(rank.shape[0])
+        return order
+    return _cube_cached(cube, ("time", time_dim), (df,), build)
+
+def _cube_partial(row_codes: list, values, time_order, patterns: list) -> list:
+    """Partial aggregates of one row chunk for every grid pattern: (group ids, sum, rows, non-empty rows, last time position, value there)."""
+    import numpy as np
+    import math
+    present = ~np.isnan(values); weights = np.where(present, values, 0.0); out = []
+    for dims, radix in patterns:
+        gid = np.zeros(values.shape[0], dtype=np.int64); ok = np.ones(values.shape[0], dtype=bool)
+        for d, r in zip(dims, radix): gid = gid * r + row_codes[d]; ok &= row_codes[d] >= 0
+        if ok.all(): vals, pres, w, t_all = values, present, weights, time_order
+        else: gid = gid[ok]; vals = values[ok]; pres = present[ok]; w = weights[ok]; t_all = None if time_order is None else time_order[ok]
+        space = math.prod(radix)
+        if space <= max(2 * gid.shape[0], 1 << 16):
+            rows = np.bincount(gid, minlength=space); uids = np.flatnonzero(rows); inv = gid; n = space
+        else: uids, inv = np.unique(gid, return_inverse=True); n = uids.shape[0]; rows = np.bincount(inv, minlength=n)
+        sums = np.bincount(inv, weights=w, minlength=n); filled = np.bincount(inv, weights=pres, minlength=n)
+        last = np.full(n, -1, dtype=np.int64); last_val = np.zeros(n)
+        if time_order is not None:
+            g = inv[pres]; t = t_all[pres]
+            np.maximum.at(last, g, t); top = t == last[g]; last_val[g[top]] = vals[pres][top]
+        if n != uids.shape[0]: rows, sums, filled, last, last_val = rows[uids], sums[uids], filled[uids], last[uids], last_val[uids]
+        out.append((uids, sums, rows, filled, last, last_val))
+    return out
+
+def _merge_cube_partials(partials: list) -> tuple:
+    """Merges per-chunk partial aggregates of one pattern in chunk order."""
+    import numpy as np
+    if len(partials) == 1: return partials[0]
+    uids, inv = np.unique(np.concatenate([p[0] for p in partials]), return_inverse=True); n = uids.shape[0]
+    sums = np.bincount(inv, weights=np.concatenate([p[1] for p in partials]), minlength=n)
+    rows = np.bincount(inv, weights=np.concatenate([p[2] for p in partials]), minlength=n)
+    filled = np.bincount(inv, weights=np.concatenate([p[3] for p in partials]), minlength=n)
+    t = np.concatenate([p[4] for p in partials]); val = np.concatenate([p[5] for p in partials])
+    last = np.full(n, -1, dtype=np.int64); np.maximum.at(last, inv, t)
+    top = (t == last[inv]) & (t >= 0); last_val = np.zeros(n); last_val[inv[top]] = val[top]
+    return uids, sums, rows, filled, last, last_val
+
+def _cube_grid_values(cube, meta: dict, factors: list, workers: int = 1, chunk_size: int | None = None, executor: str = "thread", unary: bool = True) -> tuple:
+    """Evaluates a measure over the cross product of `factors` as an integer grid of dimension codes: one chunked
+    group-by over the fact rows, then a lookup per grid cell. Returns (cell values, avg cells without numeric data)
+    in CUBEVALUE context order. Chunks do not depend on `workers`, so pooled and serial runs are identical.
+    Out-of-core cubes stream their own chunk files instead (chunk_size is then the source's chunk_rows)."""
+    import numpy as np, pandas as pd
+    df = cube.data; col = meta.get("column"); agg = meta.get("agg","sum"); time_dim = meta.get("time_dim")
+    dims = list(dict.fromkeys(d for factor in factors for d, _ in factor))
+    for d in dims:
+        if d not in df.columns: raise ValueError(f"#N/A 🚫 Dimension column not found in data: {d}")
+    keys = {d: list(dict.fromkeys(k for factor in factors for dd, k in factor if dd == d)) for d in dims}; code_of = {d: {k: i for i, k in enumerate(keys[d])} for d in dims}
+    sizes = [len(f) for f in factors]; n_cells = int(np.prod(sizes, dtype=np.int64)); cell = np.arange(n_cells, dtype=np.int64)
+    cell_codes = {d: np.full(n_cells, -1, dtype=np.int64) for d in dims}; stride = 1
+    for factor, size in zip(factors, sizes):
+        axis = (cell // stride) % size; stride *= size
+        for d in dict.fromkeys(dd for dd, _ in factor):
+            codes = np.array([code_of[d][k] if dd == d else -2 for dd, k in factor], dtype=np.int64)[axis]
+            cell_codes[d] = np.where(codes != -2, codes, cell_codes[d])
+    mult = np.ones(n_cells)
+    for d in dims if unary else ():
+        signs = np.array([{-1: -1.0, 0: 0.0}.get(cube.dimensions.get(d, {}).get(k, {}).get("unary", 1), 1.0) for k in keys[d]])
+        if np.any(signs != 1.0): mult = np.where(cell_codes[d] >= 0, mult * signs[np.maximum(cell_codes[d], 0)], mult)
+    constrained = np.zeros(n_cells, dtype=np.int64)
+    for i, d in enumerate(dims): constrained |= (cell_codes[d] >= 0).astype(np.int64) << i
+    pattern_ids = np.unique(constrained).tolist(); patterns = []
+    for p in pattern_ids:
+        pdims = [i for i in range(len(dims)) if p >> i & 1]; patterns.append((pdims, [len(keys[dims[i]]) for i in pdims]))
+    timed = agg == "last_non_empty" and time_dim is not None and time_dim in df.columns
+    if workers and workers > 1 and executor not in ("thread", "process"): raise ValueError('#VALUE! 🚫 executor must be "thread" or "process"')
+    if isinstance(df, _FactSource):
+        always = set(range(len(dims))).intersection(*(pdims for pdims, _ in patterns))
+        merged = df.aggregate(dims, keys, col, time_dim if timed else None, patterns, {dims[i]: keys[dims[i]] for i in always}, workers, executor)
+    else:
+        row_codes = [_cube_row_codes(cube, d, keys[d]) for d in dims]
+        values = np.asarray(df[col], dtype=float)
+        time_order = _cube_time_order(cube, time_dim) if timed else None
+        step = int(chunk_size or _CUBE_CHUNK_ROWS); bounds = [(i, min(i + step, values.shape[0])) for i in range(0, max(values.shape[0], 1), step)]
+        jobs = [([c[a:b] for c in row_codes], values[a:b], None if time_order is None else time_order[a:b], patterns) for a, b in bounds]
+        if workers and workers > 1 and len(jobs) > 1:
+            from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+            with (ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor)(max_workers=workers) as pool: chunks = list(pool.map(_cube_partial, *zip(*jobs)))
+        else: chunks = [_cube_partial(*job) for job in jobs]
+        merged = [_merge_cube_partials([c[j] for c in chunks]) for j in range(len(patterns))]
+    result = np.zeros(n_cells); no_data = np.zeros(n_cells, dtype=bool)
+    for j, (pdims, radix) in enumerate(patterns):
+        uids, sums, rows, filled, _, last_val = merged[j]
+        if uids.shape[0] == 0: continue
+        sel = np.flatnonzero(constrained == pattern_ids[j]); gid = np.zeros(sel.shape[0], dtype=np.int64)
+        for i, r in zip(pdims, radix): gid = gid * r + cell_codes[dims[i]][sel]
+        at = np.minimum(np.searchsorted(uids, gid), uids.shape[0] - 1); hit = uids[at] == gid
+        s = np.where(hit, sums[at], 0.0) * mult[sel]; f = np.where(hit, filled[at], 0.0)
+        if agg == "avg":
+            no_data[sel] = hit & (f == 0)
+            s = np.where(hit & (f > 0), s / np.where(f > 0, f, 1.0), 0.0)
+        elif agg == "last_non_empty" and timed: s = np.where(f > 0, last_val[at], 0.0)
+        result[sel] = s
+    return result, no_data
 
 def CUMIPMT(rate, n_per, pv, start_period, end_period, payment_type=0) -> float:
     """
@@ -3330,3 +4010,1492 @@ def CUMPRINC(rate, n_per, pv, start_period, end_period, payment_type=0) -> float
     total_payments = pmt * (end_period - start_period + 1)
     return float(total_payments - total_interest)
 
+
+#Infrastructure: shared helpers and engines behind the functions above
+
+# Text serialization helpers
+def _text_cells(col, bools=("TRUE", "FALSE"), blank=None) -> list:
+    """Formats a 1-D array as a list of cell text. bool/int/float dtypes skip the per-cell type checks; None, NaN and NaT become `blank`."""
+    import numpy as np
+    col = np.asarray(col)
+    kind = col.dtype.kind
+    if kind == "b": return np.where(col, bools[0], bools[1]).tolist()
+    if kind in "iu": return list(map(str, col.tolist()))
+    if kind == "f":
+        out = list(map(str, col.tolist() if col.dtype == np.float64 else col))   # float32 cells print from their own dtype ("0.1", not the widened double)
+        for i in np.flatnonzero(np.isnan(col)).tolist(): out[i] = blank
+        return out
+    if kind in "mM":
+        import pandas as pd
+        return [blank if v is pd.NaT else str(v) for v in pd.Index(col)]   # as Timestamp/Timedelta print: "2024-01-02 10:30:00"
+    if kind in "US": return col.astype(str).tolist()
+    out = []
+    for v in (col.tolist() if kind == "O" else col):
+        if v is None or (isinstance(v, float) and v != v): out.append(blank)
+        elif isinstance(v, (bool, np.bool_)): out.append(bools[0] if v else bools[1])
+        else: out.append(str(v))
+    return out
+
+def _text_row_blocks(arg, chunk_size=65536, bools=("TRUE", "FALSE"), blank=None):
+    """Yields lists of row tuples of cell text for a DataFrame or 2-D ndarray, `chunk_size` cells at a time. Each column keeps its own dtype until formatted."""
+    import pandas as pd
+    if isinstance(arg, pd.DataFrame): cols = [arg.iloc[:, j].to_numpy() for j in range(arg.shape[1])]
+    else: cols = [arg[:, j] for j in range(arg.shape[1])]
+    n_rows = arg.shape[0]; step = max(1, chunk_size // max(1, len(cols)))
+    for start in range(0, n_rows, step):
+        if not cols: yield [()] * min(step, n_rows - start); continue
+        yield list(zip(*[_text_cells(c[start:start + step], bools, blank) for c in cols]))
+
+def _text_chunks(arg, chunk_size=65536, bools=("TRUE", "FALSE"), blank=None):
+    """Yields `arg` flattened in row-major order as lists of cell text, `chunk_size` cells at a time."""
+    import numpy as np, pandas as pd
+    if isinstance(arg, pd.DataFrame) or (isinstance(arg, np.ndarray) and arg.ndim == 2):
+        for block in _text_row_blocks(arg, chunk_size, bools, blank): yield [c for row in block for c in row]
+        return
+    if isinstance(arg, (pd.Series, pd.Index)): flat = arg.to_numpy()
+    elif isinstance(arg, np.ndarray): flat = arg.ravel()
+    elif isinstance(arg, range): flat = np.arange(arg.start, arg.stop, arg.step)
+    else: flat = np.array(list(arg) if isinstance(arg, set) else arg, dtype=object).ravel()
+    for start in range(0, flat.shape[0], chunk_size): yield _text_cells(flat[start:start + chunk_size], bools, blank)
+
+
+# Array argument helpers
+def _wrap_like(result, *args):
+    """Returns an array `result` as a pandas Series when a Series argument has the same length, so column-wise calls keep their index."""
+    import pandas as pd
+    for a in args:
+        if isinstance(a, pd.Series) and getattr(result, "shape", None) == (len(a),): return pd.Series(result, index=a.index, name=a.name)
+    return result
+
+def _int_valued(x):
+    """Returns (float array, mask) where mask marks elements that are finite whole numbers; Excel integer arguments are validated with it.
+    Scalars and arrays follow the same rule. Text is coerced like pd.to_numeric does ("5" is 5), anything non-numeric is NaN and invalid."""
+    import numpy as np, pandas as pd
+    arr = np.asarray(x)
+    if arr.dtype.kind not in "biuf": arr = pd.to_numeric(pd.Series(arr.ravel(), dtype=object), errors="coerce").to_numpy(dtype=float, na_value=np.nan).reshape(arr.shape)
+    arr = arr.astype(float)
+    return arr, np.isfinite(arr) & (arr == np.floor(arr))
+
+
+# Profiling
+def _excel_error_code(exc) -> str:
+    """Returns the Excel error code ("#VALUE!", "#N/A", ...) named in an exception message, or the exception's type name."""
+    import re
+    m = re.search(r"#(?:DIV/0!|N/A|NAME\?|NULL!|NUM!|REF!|VALUE!|SPILL!|CALC!)", str(exc))
+    return m.group(0) if m else type(exc).__name__
+
+class _Profiler:
+    """
+    Opt-in call-timing for every public excelfred function, exposed as `excelfred.profiling`.
+
+    `enable()` adds a counting layer to each function in the module, `disable()` takes it off again,
+    so nothing is wrapped (and nothing is paid) while profiling is off. Call functions through the module
+    (`xl.CONCAT`) to be counted; names imported with `from excelfred import ...` before enabling keep the original.
+
+    **SAMPLE CODE**:
+
+     import excelfred as xl
+     xl.profiling.enable()
+     xl.COMBIN(10, 2); xl.CONCAT(range(1000))
+     print(xl.profiling.report())   # DataFrame: calls, total_s, mean_s, max_s, elements + one column per error code
+     xl.profiling.disable()
+    """
+    def __init__(self): self._names = set(); self._stats = {}; self._errors = {}
+    @property
+    def enabled(self) -> bool: return bool(self._names)
+    def enable(self, functions=None):
+        """Installs the counting wrappers, on all public functions or only on the given names."""
+        g = globals()
+        names = functions or [n for n, f in g.items() if n.isupper() and callable(f) and not isinstance(f, type) and not n.startswith("_")]
+        for name in names:
+            if name in self._names: continue
+            stats, errors = self._stats.setdefault(name, [0, 0.0, 0.0, 0]), self._errors.setdefault(name, {})
+            _dispatch_add(name, "profiling", lambda func, stats=stats, errors=errors: self._wrap(func, stats, errors)); self._names.add(name)
+        return self
+    def _wrap(self, func, stats, errors):
+        import functools, time
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try: return func(*args, **kwargs)
+            except Exception as e:
+                code = _excel_error_code(e); errors[code] = errors.get(code, 0) + 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                stats[0] += 1; stats[1] += elapsed
+                if elapsed > stats[2]: stats[2] = elapsed
+                stats[3] += sum(map(_element_count, args)) + sum(map(_element_count, kwargs.values()))
+        return wrapper
+    def disable(self):
+        """Removes the counting wrappers; collected counters are kept until `reset()`."""
+        for name in self._names: _dispatch_remove(name, "profiling")
+        self._names = set()
+        return self
+    def reset(self):
+        """Zeroes every counter, installed wrappers keep counting into the same slots."""
+        for stats in self._stats.values(): stats[:] = [0, 0.0, 0.0, 0]
+        for errors in self._errors.values(): errors.clear()
+        return self
+    def report(self):
+        """Returns a DataFrame indexed by function name, slowest total time first."""
+        import pandas as pd
+        rows = []
+        for name, (calls, total, worst, elements) in self._stats.items():
+            if calls == 0: continue
+            rows.append({"function": name, "calls": calls, "total_s": total, "mean_s": total / calls, "max_s": worst, "elements": elements, **self._errors.get(name, {})})
+        cols = ["calls", "total_s", "mean_s", "max_s", "elements"]
+        if not rows: return pd.DataFrame(columns=cols, index=pd.Index([], name="function"))
+        df = pd.DataFrame(rows).set_index("function").sort_values("total_s", ascending=False)
+        codes = [c for c in df.columns if c not in cols]
+        df[codes] = df[codes].fillna(0).astype(int)
+        return df[cols + sorted(codes)]
+
+def _element_count(value) -> int:
+    """Number of input cells in an argument: array size for NumPy/pandas, length for sequences, 1 for scalars."""
+    if hasattr(value, "size") and hasattr(value, "shape"): return int(value.size)
+    if isinstance(value, (list, tuple, set, range)): return len(value)
+    return 1
+
+profiling = _Profiler()
+
+
+# Excel error values
+class ExcelError:
+    """
+    An Excel error value (`#VALUE!`, `#NUM!`, `#DIV/0!`, `#N/A`, ...) returned instead of raising under `errors="return"`.
+    There is exactly one instance per code, so check with `is` or `isinstance`; arrays carry them as object cells.
+
+    Only the array functions BESSELI/J/K/Y, CEILING_MATH, COMBIN, COMBINA and CUBEVALUE/CUBEVALUE_GRID take `errors`
+    themselves, and they mark the bad elements of an array result one by one. Every other function raises when called
+    directly; call it as `registry[name](..., errors="return")`, through `evaluate(..., errors="return")` or through
+    `df.xl` to get its ExcelError for the whole call instead.
+
+    **SAMPLE CODE**:
+
+     COMBIN(-1, 2, errors="return")                # #NUM!
+     COMBIN(-1, 2, errors="return") is ExcelError.NUM   # True
+     COMBIN([5, 5.5, 3], 4, errors="return")       # [5 #VALUE! #NUM!]
+     registry["BIN2DEC"]("2", errors="return")     # #VALUE!
+    """
+    __slots__ = ("code",)
+    _instances = {}
+    def __new__(cls, code: str):
+        inst = cls._instances.get(code)
+        if inst is None:
+            inst = super().__new__(cls); inst.code = code
+            cls._instances[code] = inst
+        return inst
+    def __repr__(self): return self.code
+    __str__ = __repr__
+    def __reduce__(self): return (ExcelError, (self.code,))
+    @classmethod
+    def from_exception(cls, exc) -> "ExcelError":
+        """Maps a raised excelfred error to its singleton; anything without an Excel code becomes #VALUE! (#DIV/0! for ZeroDivisionError)."""
+        if isinstance(exc, ZeroDivisionError): return cls.DIV0
+        code = _excel_error_code(exc)
+        return cls(code) if code.startswith("#") else cls.VALUE
+
+ExcelError.NULL = ExcelError("#NULL!"); ExcelError.DIV0 = ExcelError("#DIV/0!"); ExcelError.VALUE = ExcelError("#VALUE!"); ExcelError.REF = ExcelError("#REF!")
+ExcelError.NAME = ExcelError("#NAME?"); ExcelError.NUM = ExcelError("#NUM!"); ExcelError.NA = ExcelError("#N/A")
+
+def _check_errors_mode(errors):
+    if errors not in ("raise", "return"): raise ValueError("#VALUE! 🚫 errors must be 'raise' or 'return'")
+
+def _mark_errors(result, errors, *marks):
+    """Applies per-element errors to a float array result in one pass. `marks` are (mask, ExcelError) pairs, earlier pairs win.
+    errors="raise" leaves NaN in the bad cells, errors="return" gives an object array holding the ExcelError values."""
+    import numpy as np
+    if errors == "return":
+        out = result.astype(object)
+        for mask, err in reversed(marks): out[np.broadcast_to(mask, out.shape)] = err
+        return out
+    bad = np.zeros(result.shape, dtype=bool)
+    for mask, _ in marks: bad |= mask
+    return np.where(bad, np.nan, result)
+
+
+# Formula evaluation
+_formula_cache = {}
+
+def evaluate(formula: str, context=None, errors: str = "raise"):
+    """
+    Evaluates Excel formula text against excelfred functions. The formula is tokenized and parsed once; the tree is cached
+    by formula text, so re-running the same formula over new data skips parsing entirely.
+
+    `context` resolves references and names: a dict ({"A1": 5, "Sales": series, "Sheet2": df}) or a DataFrame whose columns
+    are A, B, C... and whose first row is row 1. Dotted names map to the Python ones (BETA.DIST -> BETA_DIST).
+    With errors="return", a raised error comes back as its ExcelError instead.
+
+    **SAMPLE CODE**:
+
+     import excelfred as xl, pandas as pd
+     df = pd.DataFrame({"k": [4, 6, 8], "grp": ["a", "b", "b"], "v": [10, 20, 30]})
+     xl.evaluate('=AVERAGEIFS(C:C, A:A, ">5")', df)              # 25.0
+     xl.evaluate('=COUNTIF(B1:B3, "b") & " rows"', df)           # "2 rows"
+     xl.evaluate("=BETA.DIST(x, 2, 3, TRUE)", {"x": 0.5})        # 0.6875
+     xl.evaluate('=CONVERT(1, "mi", "km") * 2')                  # 3.218688
+    """
+    _check_errors_mode(errors)
+    tree = _formula_tree(formula)
+    if errors == "raise": return _eval_formula(tree, context)
+    try: return _eval_formula(tree, context)
+    except Exception as e: return ExcelError.from_exception(e)
+
+def _formula_tree(formula: str) -> tuple:
+    """Compiled tree of formula text, parsed once and memoized by text."""
+    tree = _formula_cache.get(formula)
+    if tree is None:
+        tree = _compile_formula(formula)
+        if len(_formula_cache) >= 4096: _formula_cache.clear()
+        _formula_cache[formula] = tree
+    return tree
+
+def _formula_tokens(text: str) -> list:
+    """Splits formula text into (kind, value) tokens: str, num, bool, err, func, ref, name and op."""
+    import re
+    pattern = re.compile(r"""\s*(?:
+        (?P<str>"(?:[^"]|"")*")
+      | (?P<err>\#(?:NULL!|DIV/0!|VALUE!|REF!|NAME\?|NUM!|N/A|SPILL!|CALC!))
+      | (?P<func>(?:_xlfn\.)?[A-Za-z][\w.]*)\s*(?=\()
+      | (?P<ref>(?:(?:'(?:[^']|'')+'|[A-Za-z_][\w.]*)!)?(?:\$?[A-Za-z]{1,3}\$?\d+(?::\$?[A-Za-z]{1,3}\$?\d+)?|\$?[A-Za-z]{1,3}:\$?[A-Za-z]{1,3}|\$?\d+:\$?\d+)(?![\w.]))
+      | (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<bool>TRUE|FALSE)(?![\w.])
+      | (?P<name>[A-Za-z_\\][\w.]*)
+      | (?P<op><>|<=|>=|[-+*/^&%=<>(),;{}])
+    )""", re.X | re.I)
+    body = text.strip(); body = body[1:] if body.startswith("=") else body; tokens = []; pos = 0; end = len(body.rstrip())
+    while pos < end:
+        m = pattern.match(body, pos)
+        if m is None: raise ValueError(f"#NAME? 🚫 Invalid formula near: {body[pos:pos + 20]}")
+        kind = m.lastgroup; value = m.group(kind); pos = m.end()
+        if kind == "str": value = value[1:-1].replace('""', '"')
+        elif kind == "num": value = int(value) if value.isdigit() else float(value)
+        elif kind == "bool": value = value.upper() == "TRUE"
+        elif kind == "err": value = ExcelError(value.upper())
+        elif kind == "func": value = value.upper().removeprefix("_XLFN.")
+        elif kind == "ref":
+            sheet, _, addr = value.rpartition("!")
+            if sheet.startswith("'"): sheet = sheet[1:-1].replace("''", "'")
+            value = (sheet or None, addr.replace("$", "").upper())
+        tokens.append((kind, value))
+    tokens.append(("end", None))
+    return tokens
+
+def _compile_formula(text: str) -> tuple:
+    """Parses formula text into a tuple tree with Excel precedence: comparisons, &, + -, * /, ^, postfix %, unary minus."""
+    tokens = _formula_tokens(text); at = [0]
+    def peek(): return tokens[at[0]]
+    def take(): at[0] += 1; return tokens[at[0] - 1]
+    def expect(op):
+        if take() != ("op", op): raise ValueError(f"#NAME? 🚫 Expected '{op}' in formula: {text}")
+    def binary(next_level, ops):
+        def level():
+            node = next_level()
+            while peek()[0] == "op" and peek()[1] in ops: node = ("op", take()[1], node, next_level())
+            return node
+        return level
+    def percent():
+        node = unary()
+        while peek() == ("op", "%"): take(); node = ("pct", node)
+        return node
+    def unary():
+        if peek() in (("op", "-"), ("op", "+")): return ("neg", unary()) if take()[1] == "-" else unary()
+        return primary()
+    def primary():
+        kind, value = take()
+        if kind in ("str", "num", "bool", "err"): return ("lit", value)
+        if kind == "ref": return ("ref", *value)
+        if kind == "name": return ("name", value)
+        if kind == "func":
+            expect("("); args = []
+            if peek() != ("op", ")"):
+                while True:
+                    args.append(("missing",) if peek() in (("op", ","), ("op", ")")) else comparison())
+                    if peek() != ("op", ","): break
+                    take()
+            expect(")")
+            while args and args[-1] == ("missing",): args.pop()
+            return ("call", value.replace(".", "_"), value, tuple(args))
+        if (kind, value) == ("op", "("):
+            node = comparison(); expect(")")
+            return node
+        if (kind, value) == ("op", "{"):
+            rows = [[]]
+            while True:
+                rows[-1].append(comparison())
+                sep = take()
+                if sep == ("op", "}"): break
+                if sep == ("op", ";"): rows.append([])
+                elif sep != ("op", ","): raise ValueError(f"#NAME? 🚫 Invalid array constant in formula: {text}")
+            return ("array", tuple(tuple(r) for r in rows))
+        raise ValueError(f"#NAME? 🚫 Invalid formula: {text}")
+    power = binary(percent, ("^",)); term = binary(power, ("*", "/")); additive = binary(term, ("+", "-"))
+    concat = binary(additive, ("&",)); comparison = binary(concat, ("=", "<>", "<", ">", "<=", ">="))
+    tree = comparison()
+    if peek()[0] != "end": raise ValueError(f"#NAME? 🚫 Invalid formula: {text}")
+    return tree
+
+def _eval_formula(node: tuple, context):
+    """Evaluates a compiled formula tree; scalar ExcelError operands propagate like in Excel."""
+    kind = node[0]
+    if kind == "lit": return node[1]
+    if kind == "ref": return _formula_reference(context, node[1], node[2])
+    if kind == "name": return _formula_name(context, node[1])
+    if kind == "missing": return None
+    if kind == "array":
+        rows = [[_eval_formula(item, context) for item in row] for row in node[1]]
+        return rows[0] if len(rows) == 1 else rows
+    if kind == "call":
+        func = registry.get(node[1])
+        if func is None: raise ValueError(f"#NAME? 🚫 Unknown function: {node[2]}")
+        positions = func.reference_args
+        args = [_formula_reference_object(context, arg[1], arg[2]) if arg[0] == "ref" and (positions is None or i in positions) else _eval_formula(arg, context) for i, arg in enumerate(node[3])]
+        for a in args:
+            if isinstance(a, ExcelError): return a
+        return func(*args)
+    if kind in ("neg", "pct"):
+        a = _eval_formula(node[1], context)
+        if isinstance(a, ExcelError): return a
+        a = _formula_number(a)
+        return -a if kind == "neg" else a / 100
+    a = _eval_formula(node[2], context); b = _eval_formula(node[3], context)
+    if isinstance(a, ExcelError): return a
+    if isinstance(b, ExcelError): return b
+    return _formula_operator(node[1], a, b)
+
+def _formula_operator(op: str, a, b):
+    import operator, numpy as np
+    if op == "&":
+        if _formula_scalar(a) and _formula_scalar(b): return _formula_text(a) + _formula_text(b)
+        return np.frompyfunc(lambda x, y: _formula_text(x) + _formula_text(y), 2, 1)(_formula_array(a), _formula_array(b))
+    if op in ("=", "<>", "<", ">", "<=", ">="):
+        compare = {"=": operator.eq, "<>": operator.ne, "<": operator.lt, ">": operator.gt, "<=": operator.le, ">=": operator.ge}[op]
+        if isinstance(a, str) and isinstance(b, str): a, b = a.lower(), b.lower()
+        return compare(_formula_array(a), _formula_array(b))
+    a = _formula_number(a); b = _formula_number(b)
+    if op == "+": return a + b
+    if op == "-": return a - b
+    if op == "*": return a * b
+    if op == "/":
+        if np.any(np.asarray(b) == 0): raise ValueError("#DIV/0! 🚫 division by zero in formula")
+        return a / b
+    with np.errstate(invalid="ignore"): out = np.power(a, b) if not (_formula_scalar(a) and _formula_scalar(b)) else float(a) ** b
+    if isinstance(out, complex) or np.any(np.isnan(out) & ~np.isnan(np.asarray(a, dtype=float))): raise ValueError("#NUM! 🚫 invalid power in formula")
+    return out
+
+def _formula_scalar(value) -> bool:
+    return not (hasattr(value, "shape") or isinstance(value, (list, tuple)))
+
+def _formula_array(value):
+    """Array constants (lists) as NumPy arrays for element-wise operators; scalars, arrays and pandas objects unchanged."""
+    import numpy as np
+    return np.array(value, dtype=object) if isinstance(value, (list, tuple)) else value
+
+def _formula_number(value):
+    """Numeric operand: None is 0, TRUE/FALSE are 1/0 and numeric text is parsed; other text is #VALUE!."""
+    import numpy as np
+    if value is None: return 0
+    if isinstance(value, bool): return int(value)
+    if isinstance(value, str):
+        try: return float(value)
+        except ValueError: raise ValueError(f"#VALUE! 🚫 Text in arithmetic: {value}")
+    if isinstance(value, (list, tuple)):
+        try: return np.array(value, dtype=float)
+        except (TypeError, ValueError): raise ValueError("#VALUE! 🚫 Text in arithmetic array")
+    return value
+
+def _formula_text(value) -> str:
+    """Cell text of a value for the & operator: TRUE/FALSE, whole floats without ".0", blanks as ""."""
+    import numpy as np
+    if value is None or (isinstance(value, float) and value != value): return ""
+    if isinstance(value, (bool, np.bool_)): return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer(): return str(int(value))
+    return str(value)
+
+def _column_index(letters: str) -> int:
+    """Zero-based column position of Excel column letters (A -> 0, AA -> 26)."""
+    n = 0
+    for ch in letters: n = n * 26 + ord(ch) - 64
+    return n - 1
+
+def _column_letters(index: int) -> str:
+    """Excel column letters of a zero-based column position (0 -> A, 26 -> AA)."""
+    letters = ""
+    index += 1
+    while index: index, rem = divmod(index - 1, 26); letters = chr(65 + rem) + letters
+    return letters
+
+def _a1_bounds(addr: str) -> tuple:
+    """Zero-based inclusive (first row, first col, last row, last col) of an A1 address ("B2", "A2:C5", "C:C", "2:3");
+    whole columns leave the rows None and whole rows the columns. Memoized."""
+    hit = _reference_cache.get(addr)
+    if hit is not None: return hit
+    import re
+    m = re.fullmatch(r"([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?", addr)
+    if m is None or not (m.group(1) or m.group(2)): raise ValueError(f"#REF! 🚫 Invalid reference: {addr}")
+    c1, r1, c2, r2 = m.groups()
+    if c2 is None and r2 is None:
+        if not (c1 and r1): raise ValueError(f"#REF! 🚫 Invalid reference: {addr}")
+        c2, r2 = c1, r1
+    if bool(c1) != bool(c2) or bool(r1) != bool(r2) or (r1 and min(int(r1), int(r2)) < 1): raise ValueError(f"#REF! 🚫 Invalid reference: {addr}")
+    rows = (min(int(r1), int(r2)) - 1, max(int(r1), int(r2)) - 1) if r1 else (None, None)
+    cols = (min(_column_index(c1), _column_index(c2)), max(_column_index(c1), _column_index(c2))) if c1 else (None, None)
+    if len(_reference_cache) >= 65536: _reference_cache.clear()
+    hit = _reference_cache[addr] = (rows[0], cols[0], rows[1], cols[1])
+    return hit
+
+def _a1_slice(df, addr: str):
+    """Resolves an A1 address against a DataFrame whose first row is row 1, in the shapes Sheet._reference gives:
+    a cell is a Python scalar, a one-column or one-row range a list, a wider range a list of rows. Blank (NaN) cells
+    and cells past the data read as None."""
+    import numpy as np, pandas as pd
+    r1, c1, r2, c2 = _a1_bounds(addr); n_rows, n_cols = df.shape
+    if ":" not in addr:
+        if r1 >= n_rows or c1 >= n_cols: return None
+        value = df.iat[r1, c1]
+        if pd.isna(value): return None
+        return value.item() if isinstance(value, np.generic) else value
+    r1 = 0 if r1 is None else r1; r2 = n_rows - 1 if r2 is None else r2; c1 = 0 if c1 is None else c1; c2 = n_cols - 1 if c2 is None else c2
+    block = df.iloc[r1:r2 + 1, c1:c2 + 1].astype(object); width = c2 - c1 + 1
+    rows = [row + [None] * (width - len(row)) for row in block.where(block.notna(), None).to_numpy().tolist()]
+    rows += [[None] * width for _ in range(r2 - r1 + 1 - len(rows))]
+    if c1 == c2: return [row[0] for row in rows]
+    return rows[0] if r1 == r2 else rows
+
+def _context_get(context, key: str):
+    """Looks `key` up in a dict context, exactly and then case-insensitively."""
+    if key in context: return context[key]
+    folded = key.upper()
+    for k, v in context.items():
+        if isinstance(k, str) and k.upper() == folded: return v
+    return _MISSING
+
+def _formula_reference(context, sheet, addr: str):
+    import pandas as pd
+    if isinstance(context, Sheet): return context._reference(sheet, addr)
+    if sheet is not None:
+        target = _context_get(context, sheet) if isinstance(context, dict) else _MISSING
+        if target is _MISSING: raise ValueError(f"#REF! 🚫 Sheet not found: {sheet}")
+        return _formula_reference(target, None, addr)
+    if isinstance(context, dict):
+        value = _context_get(context, addr)
+        if value is not _MISSING: return value
+    if isinstance(context, pd.DataFrame): return _a1_slice(context, addr)
+    raise ValueError(f"#REF! 🚫 Reference not found: {addr}")
+
+_REFERENCE_ARGS = {"AREAS": None, "CELL": (1,), "COLUMN": (0,), "COLUMNS": (0,)}   # argument positions that take the reference itself (None: all)
+
+def _formula_reference_object(context, sheet, addr: str) -> "Reference":
+    """A Reference for a formula argument, bound to the DataFrame the context maps it to (unbound for other contexts)."""
+    import pandas as pd
+    frame = context
+    if sheet is not None: frame = _context_get(context, sheet) if isinstance(context, dict) else None
+    return Reference(addr if sheet is None else f"'{sheet.replace(chr(39), chr(39) * 2)}'!{addr}", frame if isinstance(frame, pd.DataFrame) else None)
+
+def _formula_name(context, name: str):
+    import pandas as pd
+    if isinstance(context, Sheet): context = context.workbook.names
+    value = _context_get(context, name) if isinstance(context, dict) else _MISSING
+    if value is _MISSING and isinstance(context, pd.DataFrame) and name in context.columns: value = context[name]
+    if value is _MISSING: raise ValueError(f"#NAME? 🚫 Name not defined: {name}")
+    return value
+
+
+# Workbook
+class Workbook:
+    """
+    Sheets of cells holding constants or excelfred formulas, recalculated through a dependency graph.
+
+    Every formula is parsed once; its references become edges of a DAG. An edit marks the cell dirty, and the next read
+    (or `recalculate()`) re-evaluates only the formulas downstream of the edits, in topological order. Cells on a circular
+    reference, and the cells reading them, are left uncalculated while the rest of the workbook is; reading one of them
+    raises `#REF!` naming the cycle. With `iterative=True` the cells in and after the cycle are instead re-evaluated until no value moves by more than `max_change`, or `max_iterations` passes are done (Excel's settings).
+    With `workers` > 1, independent function-calling cells of one dependency level are evaluated concurrently: in threads
+    (NumPy-heavy calls such as AGGREGATE, CUBEVALUE or the distributions release the GIL) or, with executor="process",
+    in worker processes that receive the formula and the values it reads. Results are identical for any worker count.
+
+    **SAMPLE CODE**:
+
+     from excelfred import Workbook
+     wb = Workbook(); s = wb.add_sheet("Model")
+     s["A1"] = 100; s["A2"] = 0.2
+     s["B1"] = "=A1 * (1 + A2)"; s["B2"] = "=CONVERT(B1, \"km\", \"m\") & \" m\""
+     print(s["B2"])         # 120000 m
+     s["A1"] = 50           # marks A1 dirty; reading B2 recalculates B1 and B2 only
+     print(s["B2"])         # 60000 m
+     wb.names["Rate"] = 0.1; s["C1"] = "=A1 * Rate"
+     loop = Workbook(iterative=True); t = loop.add_sheet("S"); t["A1"] = "=B1 / 2 + 1"; t["B1"] = "=A1"
+     print(t["A1"])         # converges to ~2
+     big = Workbook(workers=4)   # or wb.recalculate(workers=4, executor="process")
+    """
+    def __init__(self, iterative: bool = False, max_iterations: int = 100, max_change: float = 0.001, workers: int = 1, executor: str = "thread"):
+        self.sheets = {}; self.names = _WorkbookNames(self); self.iterative = iterative; self.max_iterations = max_iterations; self.max_change = max_change
+        self.workers = workers; self.executor = executor
+        self._formulas = {}; self._values = {}; self._precedents = {}; self._dependents = {}; self._ranges = {}; self._dirty = set(); self._calculating = False
+        self._circular = {}   # {cell on or after a cycle: the cycle}, filled when iterative is off
+    def add_sheet(self, name: str) -> "Sheet":
+        if _context_get(self.sheets, name) is not _MISSING: raise ValueError(f"#VALUE! 🚫 Sheet already exists: {name}")
+        sheet = self.sheets[name] = Sheet(self, name)
+        self._dirty.update(f for f, (cells, rects) in self._precedents.items() if any(k[0] == name for k in cells) or any(r[0] == name for r in rects))
+        return sheet
+    def __getitem__(self, name: str) -> "Sheet":
+        sheet = _context_get(self.sheets, name)
+        if sheet is _MISSING: raise ValueError(f"#REF! 🚫 Sheet not found: {name}")
+        return sheet
+    def _set(self, key: tuple, value):
+        """Stores a constant or formula in cell `key` = (sheet, row, col) and rewires its precedents."""
+        old = self._precedents.pop(key, None)
+        if old is not None:
+            for k in old[0]: self._dependents[k].discard(key)
+            for rect in old[1]: self._ranges[rect[0]].discard((*rect[1:], key))
+        if isinstance(value, str) and value.startswith("=") and len(value) > 1:
+            tree = _formula_tree(value); cells, rects = _formula_precedents(tree, key[0])
+            self._formulas[key] = (value, tree, any(node[0] == "call" for node in _formula_nodes(tree))); self._precedents[key] = (cells, rects)
+            for k in cells: self._dependents.setdefault(k, set()).add(key)
+            for rect in rects: self._ranges.setdefault(rect[0], set()).add((*rect[1:], key))
+        else:
+            self._formulas.pop(key, None)
+            if value is None: self._values.pop(key, None)
+            else: self._values[key] = value
+        self._dirty.add(key)
+    def _dependents_of(self, key: tuple):
+        """Formula cells that read `key` directly or through a range."""
+        out = list(self._dependents.get(key, ()))
+        if key[0] is not None:
+            for r1, c1, r2, c2, f in self._ranges.get(key[0], ()):
+                if (r1 is None or r1 <= key[1] <= r2) and (c1 is None or c1 <= key[2] <= c2): out.append(f)
+        return out
+    def recalculate(self, full: bool = False, workers: int | None = None, executor: str | None = None) -> int:
+        """Re-evaluates the formulas downstream of the edits since the last calculation (every formula with full=True)
+        level by level in dependency order; returns how many formula evaluations were done. Within a level no cell
+        reads another, so with workers > 1 the function-calling cells of a level run in a pool while plain arithmetic
+        stays inline; values are stored per level, so results do not depend on `workers` or scheduling. Cells on or after a
+        circular reference are skipped (iterated with iterative=True); cells still on a cycle are re-checked every time."""
+        workers = self.workers if workers is None else workers; executor = executor or self.executor
+        if executor not in ("thread", "process"): raise ValueError('#VALUE! 🚫 executor must be "thread" or "process"')
+        seeds = set(self._formulas) if full else self._dirty
+        if not seeds: return 0
+        seeds = seeds | self._circular.keys()   # new formulas reading a cycle cell join it rather than reading a stale value
+        dirty = {k for k in seeds if k in self._formulas}; succ = {}; todo = list(seeds); seen = set(seeds)
+        while todo:
+            k = todo.pop(); succ[k] = self._dependents_of(k)
+            for f in succ[k]:
+                if f not in seen: seen.add(f); dirty.add(f); todo.append(f)
+        for k in seen: self._circular.pop(k, None)
+        indegree = dict.fromkeys(dirty, 0)
+        for k in dirty:
+            for f in succ.get(k, ()): indegree[f] += 1
+        level = sorted(k for k, d in indegree.items() if d == 0); count = 0; pool = None; self._calculating = True
+        try:
+            while level:
+                pooled = [k for k in level if self._formulas[k][2]] if workers and workers > 1 else []
+                if len(pooled) < 2: pooled = []
+                if pooled and pool is None:
+                    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+                    pool = (ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor)(max_workers=workers)
+                if executor == "thread": futures = {k: pool.submit(self._evaluate_cell, k) for k in pooled}
+                else: futures = {k: pool.submit(_evaluate_detached, self._formulas[k][1], self._detached_context(k)) for k in pooled}
+                for k in level:
+                    if k not in futures: self._values[k] = self._evaluate_cell(k)
+                for k, future in futures.items(): self._values[k] = future.result()
+                count += len(level); following = []
+                for k in level:
+                    for f in succ.get(k, ()):
+                        indegree[f] -= 1
+                        if indegree[f] == 0: following.append(f)
+                level = sorted(following)
+            left = sorted(k for k, d in indegree.items() if d > 0)
+            if left and not self.iterative: self._circular.update(_find_cycles(left, succ)); left = []
+            for _ in range(self.max_iterations if left else 0):
+                moved = 0.0
+                for k in left:
+                    old = self._values.get(k); new = self._values[k] = self._evaluate_cell(k); count += 1
+                    try: moved = max(moved, abs(float(new) - float(0 if old is None else old)))
+                    except (TypeError, ValueError): moved = moved if new == old else float("inf")
+                if moved <= self.max_change: break
+        finally:
+            self._calculating = False
+            if pool is not None: pool.shutdown()
+        self._dirty = set()
+        return count
+    def _check_circular(self, sheet: str, r1: int, c1: int, r2: int, c2: int):
+        """Raises #REF! naming the cycle when the cells read include one on or after a circular reference."""
+        if (r1, c1) == (r2, c2): hits = [self._circular.get((sheet, r1, c1))]
+        else: hits = [cycle for k, cycle in self._circular.items() if k[0] == sheet and r1 <= k[1] <= r2 and c1 <= k[2] <= c2]
+        for cycle in hits:
+            if cycle is not None: raise ValueError(f"#REF! 🚫 Circular reference: {' -> '.join(_cell_name(k) for k in cycle)}")
+    def _calculate_pending(self):
+        if self._dirty and not self._calculating: self.recalculate()
+    def _evaluate_cell(self, key: tuple):
+        """Value of a formula cell; raised errors become the cell's ExcelError, as Excel shows them in the cell."""
+        try: return _eval_formula(self._formulas[key][1], self.sheets.get(key[0]) or Sheet(self, key[0]))
+        except Exception as e: return ExcelError.from_exception(e)
+    def _detached_context(self, key: tuple) -> dict:
+        """The values a formula cell reads, as a plain dict context ({addr: value, sheet: {addr: value}, name: value}) for a process worker."""
+        sheet = self.sheets.get(key[0]) or Sheet(self, key[0]); context = {}
+        for node in _formula_nodes(self._formulas[key][1]):
+            if node[0] == "name":
+                value = _context_get(self.names, node[1])
+                if value is not _MISSING: context[node[1]] = value
+            elif node[0] == "ref":
+                try: value = sheet._reference(node[1], node[2])
+                except ValueError: continue
+                (context if node[1] is None else context.setdefault(node[1], {}))[node[2]] = value
+        return context
+
+class _WorkbookNames(dict):
+    """Workbook defined names ({name: constant}, case-insensitive); assigning one marks the formulas using it dirty."""
+    def __init__(self, workbook): super().__init__(); self._workbook = workbook
+    def __setitem__(self, name, value):
+        for k in [k for k in self if k.upper() == name.upper() and k != name]: super().__delitem__(k)
+        super().__setitem__(name, value); self._workbook._dirty.add((None, name.upper()))
+    def __delitem__(self, name): super().__delitem__(name); self._workbook._dirty.add((None, name.upper()))
+
+class Sheet:
+    """
+    One worksheet of a `Workbook`. `sheet["B2"] = 5` stores a constant, `sheet["B2"] = "=B1*2"` a formula (`None` clears
+    the cell); a sequence assigned to a range fills it row by row. `sheet["B2"]` and `sheet["A1:C3"]` read values after
+    recalculating pending edits; one-row or one-column ranges come back as lists, wider ones as lists of rows.
+    """
+    def __init__(self, workbook: Workbook, name: str): self.workbook = workbook; self.name = name; self.n_rows = 0; self.n_cols = 0
+    def __repr__(self): return f"Sheet({self.name!r}, {self.n_rows}x{self.n_cols})"
+    def __setitem__(self, addr: str, value):
+        r1, c1, r2, c2 = _a1_bounds(addr.replace("$", "").upper())
+        if r1 is None or c1 is None: raise ValueError(f"#REF! 🚫 Assign to cells or bounded ranges, not {addr}")
+        if (r1, c1) == (r2, c2) and ":" not in addr: cells = [((r1, c1), value)]
+        else:
+            rows = [list(row) if isinstance(row, (list, tuple)) else [row] for row in value] if r1 != r2 and c1 != c2 else [list(value)]
+            if r1 != r2 and c1 == c2: rows = [[v] for v in rows[0]]
+            if len(rows) != r2 - r1 + 1 or any(len(row) != c2 - c1 + 1 for row in rows): raise ValueError(f"#VALUE! 🚫 Values do not fit {addr}")
+            cells = [((r1 + i, c1 + j), v) for i, row in enumerate(rows) for j, v in enumerate(row)]
+        for (r, c), v in cells:
+            self.workbook._set((self.name, r, c), v)
+            if v is not None: self.n_rows = max(self.n_rows, r + 1); self.n_cols = max(self.n_cols, c + 1)
+    def __getitem__(self, addr: str): return self._reference(None, addr.replace("$", "").upper())
+    def formula(self, addr: str) -> str | None:
+        """Formula text stored in a cell, None for constants and blanks."""
+        r1, c1, _, _ = _a1_bounds(addr.replace("$", "").upper())
+        entry = self.workbook._formulas.get((self.name, r1, c1))
+        return None if entry is None else entry[0]
+    def _reference(self, sheet: str | None, addr: str):
+        """Current value of a cell (None if blank) or range, read from this or another sheet of the workbook without recalculating."""
+        wb = self.workbook
+        if not wb._calculating: wb._calculate_pending()
+        target = self if sheet is None else wb[sheet]
+        r1, c1, r2, c2 = _a1_bounds(addr); values = wb._values; name = target.name
+        if ":" not in addr:
+            if wb._circular: wb._check_circular(name, r1, c1, r1, c1)
+            return values.get((name, r1, c1))
+        r1 = 0 if r1 is None else r1; r2 = target.n_rows - 1 if r2 is None else r2; c1 = 0 if c1 is None else c1; c2 = target.n_cols - 1 if c2 is None else c2
+        if wb._circular: wb._check_circular(name, r1, c1, r2, c2)
+        rows = [[values.get((name, r, c)) for c in range(c1, c2 + 1)] for r in range(r1, r2 + 1)]
+        if c1 == c2: return [row[0] for row in rows]
+        return rows[0] if r1 == r2 else rows
+
+def _formula_nodes(tree: tuple):
+    """Yields every node of a compiled formula tree."""
+    stack = [tree]
+    while stack:
+        node = stack.pop(); kind = node[0]; yield node
+        if kind == "call": stack.extend(node[3])
+        elif kind == "array": stack.extend(item for row in node[1] for item in row)
+        elif kind in ("neg", "pct"): stack.append(node[1])
+        elif kind == "op": stack.extend(node[2:])
+
+def _formula_precedents(tree: tuple, sheet: str) -> tuple:
+    """(cell and name keys, range rectangles) a compiled formula reads. Cells are (sheet, row, col), names (None, NAME),
+    rectangles (sheet, r1, c1, r2, c2) with None for the open side of whole rows or columns."""
+    cells = set(); rects = set()
+    for node in _formula_nodes(tree):
+        if node[0] == "ref":
+            r1, c1, r2, c2 = _a1_bounds(node[2]); owner = node[1] or sheet
+            if ":" not in node[2]: cells.add((owner, r1, c1))
+            else: rects.add((owner, r1, c1, r2, c2))
+        elif node[0] == "name": cells.add((None, node[1].upper()))
+    return cells, rects
+
+def _evaluate_detached(tree: tuple, context: dict):
+    """Process-pool task: one formula against the values it reads."""
+    try: return _eval_formula(tree, context)
+    except Exception as e: return ExcelError.from_exception(e)
+
+def _find_cycles(left: list, succ: dict) -> dict:
+    """{cell: cycle} for the cells Kahn's algorithm could not order: the cycle the cell is on or reads through, in
+    reference order (each cell reads the next, first key repeated last). Every such cell has an unordered precedent,
+    so walking precedents always ends on a cycle; cells met on the way share it."""
+    pending = set(left); preds = {k: [] for k in left}; found = {}
+    for k in left:
+        for f in succ.get(k, ()):
+            if f in pending: preds[f].append(k)
+    for start in left:
+        path = [start]; where = {start: 0}; cycle = found.get(start)
+        while cycle is None:
+            k = min(preds[path[-1]])
+            if k in where: cycle = path[where[k]:] + [k]
+            elif k in found: cycle = found[k]
+            else: where[k] = len(path); path.append(k)
+        for k in path: found.setdefault(k, cycle)
+    return found
+
+def _cell_name(key: tuple) -> str:
+    return f"{key[0]}!{_column_letters(key[2])}{key[1] + 1}"
+
+
+# References
+_reference_cache = {}
+
+def _parse_reference(text: str, a1: bool = True, origin: tuple = (1, 1)) -> tuple:
+    """(sheet, areas) of reference text: A1 ("$B$2:D1000", "A:A", "2:5") or R1C1 ("R2C3:R10C5", "R[-1]C", "C3" relative
+    to the 1-based `origin` cell), optionally sheet-qualified, areas separated by commas. Areas are zero-based inclusive
+    (r1, c1, r2, c2) with None on the open side of whole rows or columns. Memoized."""
+    key = (text, a1, origin); hit = _reference_cache.get(key)
+    if hit is not None: return hit
+    import re
+    sheet = None; areas = []
+    for part in re.split(r",(?=(?:[^']*'[^']*')*[^']*$)", text):
+        owner, _, addr = part.strip().rpartition("!")
+        if owner:
+            owner = owner[1:-1].replace("''", "'") if owner.startswith("'") else owner
+            if sheet is not None and owner != sheet: raise ValueError(f"#REF! 🚫 Areas on different sheets: {text}")
+            sheet = owner
+        addr = addr.replace("$", "").upper()
+        areas.append(_a1_bounds(addr) if a1 else _r1c1_bounds(addr, origin))
+    hit = (sheet, tuple(areas))
+    if len(_reference_cache) >= 65536: _reference_cache.clear()
+    _reference_cache[key] = hit
+    return hit
+
+def _r1c1_bounds(addr: str, origin: tuple) -> tuple:
+    """Zero-based inclusive bounds of an R1C1 area; R[n]/C[n] are offsets from `origin`, a bare R or C is the origin's row or column."""
+    import re
+    part = r"(R(?:\[-?\d+\]|\d+)?)?(C(?:\[-?\d+\]|\d+)?)?"
+    m = re.fullmatch(part + r"(?::" + part + r")?", addr)
+    if m is None or not (m.group(1) or m.group(2)): raise ValueError(f"#REF! 🚫 Invalid reference: {addr}")
+    def index(token, base):
+        if token is None: return None
+        n = base if len(token) == 1 else base + int(token[2:-1]) if token[1] == "[" else int(token[1:])
+        if n < 1: raise ValueError(f"#REF! 🚫 Reference before row/column 1: {addr}")
+        return n - 1
+    r1, c1, r2, c2 = (index(m.group(1), origin[0]), index(m.group(2), origin[1]), index(m.group(3), origin[0]), index(m.group(4), origin[1]))
+    if m.group(3) is None and m.group(4) is None: r2, c2 = r1, c1
+    if (r1 is None) != (r2 is None) or (c1 is None) != (c2 is None): raise ValueError(f"#REF! 🚫 Invalid reference: {addr}")
+    return (None if r1 is None else min(r1, r2), None if c1 is None else min(c1, c2), None if r1 is None else max(r1, r2), None if c1 is None else max(c1, c2))
+
+class Reference:
+    """
+    A parsed cell reference bound, optionally, to the DataFrame it points into (columns A, B, C... and first row = row 1).
+    Accepts A1 or R1C1 text (a1=False, relative parts taken from `origin`), absolute `$` parts, whole columns/rows,
+    sheet prefixes and several comma-separated areas. Parsing is memoized. `values` is a NumPy view of the frame, so
+    resolving "B2:D1000" copies nothing when the columns share a dtype. COLUMN, COLUMNS, AREAS and CELL read its
+    positions directly, and evaluate() passes one to them for reference arguments.
+
+    **SAMPLE CODE**:
+
+     from excelfred import Reference, COLUMN, COLUMNS, AREAS, CELL
+     df = pd.DataFrame(np.arange(12).reshape(4, 3))
+     ref = Reference("Sheet1!$B$2:C4", df)
+     ref.values                       # [[4 5] [7 8] [10 11]] (view of df)
+     COLUMN(ref), COLUMNS(ref)        # [2, 3], 2
+     AREAS(Reference("A1:B2,D4"))     # 2
+     CELL("address", ref)             # $B$2
+     Reference("R2C2:R[2]C[1]", df, a1=False, origin=(2, 2)).address()   # $B$2:$C$4
+    """
+    __slots__ = ("text", "sheet", "areas", "data")
+    def __init__(self, text: str, data=None, a1: bool = True, origin: tuple = (1, 1)):
+        self.text = text; self.data = data; self.sheet, self.areas = _parse_reference(text, a1, tuple(origin))
+    def __repr__(self): return f"Reference({self.address()!r})"
+    def bounds(self, area: int = 0) -> tuple:
+        """Zero-based inclusive (r1, c1, r2, c2) of one area, open sides closed by the data shape (Excel's sheet size without data)."""
+        r1, c1, r2, c2 = self.areas[area]
+        n_rows, n_cols = self.data.shape if self.data is not None else (1048576, 16384)
+        if r1 is None: r1, r2 = 0, n_rows - 1
+        if c1 is None: c1, c2 = 0, n_cols - 1
+        return r1, c1, r2, c2
+    @property
+    def row(self) -> int: return self.bounds()[0] + 1
+    @property
+    def column(self) -> int: return self.bounds()[1] + 1
+    @property
+    def rows(self) -> int: r1, _, r2, _ = self.bounds(); return r2 - r1 + 1
+    @property
+    def columns(self) -> int: _, c1, _, c2 = self.bounds(); return c2 - c1 + 1
+    @property
+    def values(self):
+        """First area as a NumPy array: a view of the column for one column, of the shared block for same-dtype columns."""
+        if self.data is None: raise ValueError(f"#REF! 🚫 Reference has no data: {self.text}")
+        r1, c1, r2, c2 = self.bounds()
+        if r2 >= self.data.shape[0] or c2 >= self.data.shape[1]: raise ValueError(f"#REF! 🚫 Reference outside the data: {self.text}")
+        if c1 == c2: return self.data.iloc[:, c1].to_numpy()[r1:r2 + 1]
+        return self.data.iloc[:, c1:c2 + 1].to_numpy()[r1:r2 + 1]
+    def __array__(self, dtype=None, copy=None):
+        values = self.values
+        return values if dtype is None else values.astype(dtype, copy=False)
+    def address(self, a1: bool = True) -> str:
+        """Absolute address text of all areas, sheet-qualified when the reference names a sheet."""
+        parts = []
+        for r1, c1, r2, c2 in self.areas:
+            if a1:
+                start = ("" if c1 is None else f"${_column_letters(c1)}") + ("" if r1 is None else f"${r1 + 1}")
+                end = ("" if c2 is None else f"${_column_letters(c2)}") + ("" if r2 is None else f"${r2 + 1}")
+            else:
+                start = ("" if r1 is None else f"R{r1 + 1}") + ("" if c1 is None else f"C{c1 + 1}")
+                end = ("" if r2 is None else f"R{r2 + 1}") + ("" if c2 is None else f"C{c2 + 1}")
+            parts.append(start if start == end and r1 is not None and c1 is not None else f"{start}:{end}")
+        prefix = "" if self.sheet is None else (f"'{self.sheet}'!" if not self.sheet.replace("_", "").isalnum() else f"{self.sheet}!")
+        return ",".join(prefix + p for p in parts)
+
+
+# Range
+_RANGE_FUNCTIONS = frozenset({"AGGREGATE", "AVEDEV", "AVERAGE", "AVERAGEA", "AVERAGEIF", "AVERAGEIFS", "CORREL", "COUNT", "COUNTA", "COUNTBLANK",
+                               "COUNTIF", "COUNTIFS", "COVARIANCE_P", "COVARIANCE_S"})   # functions reading Range buffers directly
+
+class Range:
+    """
+    A 2-D block of cells stored column by column as typed NumPy arrays (float, int, bool, datetime, or object for text),
+    plus a blank mask and an error mask. Columns coming from NumPy-typed data (DataFrame columns, arrays, a bound
+    `Reference`) are kept as views. Text columns are scanned once, when the Range is built. Counting, criteria and
+    aggregate functions (COUNT, COUNTA, COUNTBLANK, COUNTIF(S), AVERAGE(A/IF/IFS), AVEDEV, AGGREGATE, CORREL,
+    COVARIANCE_P/S) read these buffers directly, so chaining them over one Range never re-boxes cells into Python
+    objects. Called through `registry` or a formula, any other function gets the cells as Python values (`tolist()`);
+    calling one of those directly with a Range is not supported, pass `r.tolist()` instead. Cells follow Excel's range rules:
+    NaN, None and "" are blank, ExcelError values are errors, and neither text nor TRUE/FALSE counts as a number.
+    Python lists keep their cells as they are (TRUE next to 2 stays a logical) and a scalar is a 1x1 Range.
+
+    **SAMPLE CODE**:
+
+     from excelfred import Range, COUNTIF, AVERAGEIF, AGGREGATE
+     r = Range(df[["Qty", "Price"]])          # or Range(Reference("B2:C1000", df)), Range([[1, "x"], [None, 3]])
+     COUNTIF(r, ">5"); AVERAGEIF(Range(df["Qty"]), ">5", Range(df["Price"])); AGGREGATE(9, 6, r)
+     r.numbers()                               # float view of a numeric column, NaN where blank, text or error
+     r.shape, r.blank.sum(), r.errors.any()
+    """
+    __slots__ = ("columns", "blank", "errors", "shape")
+    def __init__(self, data):
+        import numpy as np, pandas as pd
+        if isinstance(data, Range): self.columns, self.blank, self.errors, self.shape = data.columns, data.blank, data.errors, data.shape; return
+        if isinstance(data, Reference):
+            r1, c1, r2, c2 = data.bounds()
+            if data.data is None or r2 >= data.data.shape[0] or c2 >= data.data.shape[1]: raise ValueError(f"#REF! 🚫 Reference is outside the data: {data.text}")
+            data = data.data.iloc[r1:r2 + 1, c1:c2 + 1]
+        if isinstance(data, pd.DataFrame): raw = [data.iloc[:, j] for j in range(data.shape[1])]; n_rows = data.shape[0]
+        elif isinstance(data, (pd.Series, pd.Index)): raw = [data]; n_rows = len(data)
+        else:
+            arr = data if isinstance(data, np.ndarray) else np.array(data if isinstance(data, (list, tuple)) else [data], dtype=object)   # lists stay Python cells, so TRUE next to 2 is not read as 1
+            if arr.ndim == 0: arr = arr.reshape(1, 1)
+            if arr.ndim == 1: arr = arr[:, None]
+            if arr.ndim != 2: raise ValueError("#VALUE! 🚫 Range data must be 1-D or 2-D")
+            raw = [arr[:, j] for j in range(arr.shape[1])]; n_rows = arr.shape[0]
+        columns = []; blank = np.zeros((n_rows, len(raw)), dtype=bool); errors = np.zeros((n_rows, len(raw)), dtype=bool)
+        for j, col in enumerate(raw):
+            values = col.to_numpy() if isinstance(col, (pd.Series, pd.Index)) and col.dtype.kind in "biufmM" else np.asarray(col)
+            if values.dtype.kind in "biufmM":
+                if values.dtype.kind == "f": blank[:, j] = np.isnan(values)
+                elif values.dtype.kind in "mM": blank[:, j] = np.isnat(values)
+                columns.append(values); continue
+            values = np.asarray(col, dtype=object)
+            err = np.fromiter((isinstance(v, ExcelError) for v in values), dtype=bool, count=n_rows)
+            empty = np.fromiter((v is None or (isinstance(v, float) and v != v) or (isinstance(v, str) and v == "") for v in values), dtype=bool, count=n_rows)
+            rest = ~(err | empty); errors[:, j] = err; blank[:, j] = empty
+            if all(isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool) for v in values[rest]):
+                numbers = np.full(n_rows, np.nan); numbers[rest] = values[rest].astype(float); columns.append(numbers)
+            else: columns.append(values)
+        self.columns = tuple(columns); self.blank = blank; self.errors = errors; self.shape = (n_rows, len(columns))
+    def __repr__(self): return f"Range({self.shape[0]}x{self.shape[1]}, dtypes={[str(c.dtype) for c in self.columns]})"
+    def __len__(self): return self.shape[0]
+    @property
+    def size(self) -> int: return self.shape[0] * self.shape[1]
+    def _flat(self, parts: list):
+        """Row-major flattening of per-column arrays; one column is returned as is (no copy)."""
+        import numpy as np
+        return parts[0] if len(parts) == 1 else np.column_stack(parts).ravel()
+    def numbers(self, text=None, logicals: bool = False):
+        """Cells as a flat float array in reading order, NaN for blanks, errors and (as Excel does for ranges) TRUE/FALSE.
+        `logicals=True` reads TRUE/FALSE as 1/0 and `text` replaces text cells (AVERAGEA uses both, with 0).
+        A float column is returned without copying."""
+        import numpy as np
+        parts = []
+        for j, col in enumerate(self.columns):
+            kind = col.dtype.kind
+            if kind == "f": parts.append(col)
+            elif kind in "iu" or (kind == "b" and logicals): parts.append(col.astype(float))
+            elif kind in "bmM": parts.append(np.full(self.shape[0], np.nan))
+            else:
+                out = np.full(self.shape[0], np.nan); ok = ~(self.blank[:, j] | self.errors[:, j])
+                for i in np.flatnonzero(ok):
+                    v = col[i]
+                    if isinstance(v, (bool, np.bool_)):
+                        if logicals: out[i] = float(v)
+                    elif isinstance(v, (int, float, np.integer, np.floating)): out[i] = float(v)
+                    elif text is not None: out[i] = text
+                parts.append(out)
+        return self._flat(parts) if parts else np.zeros(0)
+    def cells(self):
+        """Flat object array of the cells in reading order, None for blanks (the slow path for per-cell Python logic)."""
+        import numpy as np
+        if not self.columns: return np.zeros(0, dtype=object)
+        out = self._flat([c.astype(object) for c in self.columns]).copy(); out[self.blank.ravel()] = None
+        return out
+    @property
+    def values(self):
+        """2-D array of the cells: the column itself for one column, a typed stack for same-dtype columns, else object."""
+        import numpy as np
+        if len(self.columns) == 1: return self.columns[0][:, None]
+        if len({c.dtype for c in self.columns}) == 1: return np.column_stack(self.columns)
+        return np.column_stack([c.astype(object) for c in self.columns])
+    def tolist(self):
+        """Cells as Python values, None for blanks: a flat list for one column, else a list of rows."""
+        rows = self.cells().reshape(self.shape).tolist()
+        return [row[0] for row in rows] if self.shape[1] == 1 else rows
+    def __array__(self, dtype=None, copy=None):
+        values = self.values
+        if 1 in self.shape: values = values.ravel()
+        return values if dtype is None else values.astype(dtype)
+    def count_numbers(self) -> int:
+        """Cells holding a number or date, Excel COUNT over a range (TRUE/FALSE and text are not counted)."""
+        import numpy as np
+        total = 0
+        for j, col in enumerate(self.columns):
+            if col.dtype.kind in "iufmM": total += int(self.shape[0] - self.blank[:, j].sum())
+            elif col.dtype.kind == "O": total += sum(isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, (bool, np.bool_)) for v in col[~(self.blank[:, j] | self.errors[:, j])])
+        return total
+    def match(self, criteria):
+        """Flat boolean mask (reading order) of the cells meeting an Excel criteria: a value, or ">5", "<=2.5", "<>x", "=abc".
+        Numeric columns compare with NumPy; text compares case-insensitively; "<>" also matches blanks, as in Excel."""
+        import numpy as np, operator
+        op, operand = "=", criteria
+        if isinstance(criteria, str):
+            for prefix in (">=", "<=", "<>", ">", "<", "="):
+                if criteria.startswith(prefix): op, operand = prefix, criteria[len(prefix):]; break
+            try: operand = float(operand)
+            except ValueError: pass
+            if isinstance(operand, str) and operand.upper() in ("TRUE", "FALSE") and op in ("=", "<>"): operand = operand.upper() == "TRUE"
+        compare = {"=": operator.eq, "<>": operator.ne, ">": operator.gt, "<": operator.lt, ">=": operator.ge, "<=": operator.le}[op]
+        numeric = isinstance(operand, (int, float, np.integer, np.floating)) and not isinstance(operand, (bool, np.bool_))
+        parts = []
+        for j, col in enumerate(self.columns):
+            kind = col.dtype.kind; empty = self.blank[:, j]
+            if kind == "b": hit = compare(col, operand) if isinstance(operand, (bool, np.bool_)) else np.full(self.shape[0], op == "<>")
+            elif kind in "iuf":
+                if numeric:
+                    with np.errstate(invalid="ignore"): hit = compare(col, operand) & ~empty
+                else: hit = np.full(self.shape[0], op == "<>")
+            elif kind in "mM": hit = np.full(self.shape[0], op == "<>")
+            else:
+                key = operand.lower() if isinstance(operand, str) else operand
+                def test(v):
+                    if isinstance(v, ExcelError) or v is None: return False
+                    if numeric: return isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool) and compare(v, operand)
+                    if isinstance(key, str): return isinstance(v, str) and compare(v.lower(), key)
+                    return type(v) is type(key) and compare(v, key)
+                hit = np.fromiter((test(v) for v in col), dtype=bool, count=self.shape[0])
+            if op == "<>": hit = hit | empty
+            parts.append(hit)
+        return self._flat(parts) if parts else np.zeros(0, dtype=bool)
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame({_column_letters(j): c for j, c in enumerate(self.columns)}, copy=False)
+
+
+# Wrapper layers
+_DISPATCH_ORDER = ("memoization", "spilling", "profiling")   # wrapper layers, innermost first
+_dispatch_originals = {}   # name -> the undecorated function while any layer is installed
+_dispatch_layers = {}      # name -> {layer: factory(inner) -> wrapper}
+
+def _dispatch_add(name: str, layer: str, factory):
+    """Installs one wrapper layer on a module function. Profiling, spilling and memoization all go through this stack, so
+    they compose in a fixed order (memoization around the scalar function, spilling around that, profiling outermost)
+    whatever order they are enabled and disabled in. A layer rebinds the module global, so it applies to calls through
+    the module (`xl.CHAR`), `registry` and `evaluate`; names imported with `from excelfred import ...` before it was
+    installed keep the function they were bound to."""
+    if name not in _dispatch_originals: _dispatch_originals[name] = globals()[name]
+    _dispatch_layers.setdefault(name, {})[layer] = factory
+    _dispatch_rebuild(name)
+
+def _dispatch_remove(name: str, layer: str):
+    layers = _dispatch_layers.get(name, {})
+    if layers.pop(layer, None) is not None: _dispatch_rebuild(name)
+
+def _dispatch_rebuild(name: str):
+    func = _dispatch_originals[name]; layers = _dispatch_layers.get(name, {})
+    for layer in _DISPATCH_ORDER:
+        if layer in layers: func = layers[layer](func)
+    globals()[name] = func
+    if not layers: del _dispatch_originals[name]; _dispatch_layers.pop(name, None)
+
+def _dispatch_original(name: str):
+    """The function without any profiling, spilling or memoization layer."""
+    return _dispatch_originals.get(name) or globals()[name]
+
+
+# Spilling
+_SPILL_FUNCTIONS = ("ABS", "ACOS", "ACOSH", "ACOT", "ACOTH", "ADDRESS", "ARABIC", "ASIN", "ASINH", "ATAN", "ATAN2", "ATANH", "BAHTTEXT", "BASE",
+                    "BIN2DEC", "BIN2HEX", "BIN2OCT", "BITAND", "BITLSHIFT", "BITNAND", "BITNOR", "BITOR", "BITRSHIFT", "BITXAND", "BITXOR",
+                    "CHAR", "CODE", "COMPLEX", "CONVERT", "COS", "COSH", "COT", "COTH", "CSC", "CSCH")   # scalar functions that spill
+_spill_kernels = {}
+
+def _spill_kernel_table() -> dict:
+    """name -> (input kind, arity, kernel, domain). Kernels compute whole arrays and run only when the call has `arity`
+    arguments (None: any number); cells outside `domain`, calls with another argument count, and every cell of a
+    function without a kernel go through the scalar function, so results and error codes match a cell-by-cell call."""
+    import numpy as np
+    if _spill_kernels: return _spill_kernels
+    nonzero_sin = lambda x: np.sin(x) != 0
+    def bits(op):
+        def kernel(a, b):
+            width = np.left_shift(np.int64(1), np.maximum(np.frexp(a.astype(float))[1], np.frexp(b.astype(float))[1])) - 1
+            return ~op(a, b) & width
+        return kernel
+    small = lambda a, b: (a < 2**52) & (b < 2**52)
+    _spill_kernels.update({
+        "ABS": ("f", None, lambda *xs: sum(np.abs(x) for x in xs), None),
+        "ACOS": ("f", 1, np.arccos, lambda x: np.abs(x) <= 1), "ASIN": ("f", 1, np.arcsin, lambda x: np.abs(x) <= 1),
+        "ACOSH": ("f", 1, np.arccosh, lambda x: x >= 1), "ATANH": ("f", 1, np.arctanh, lambda x: np.abs(x) < 1),
+        "ACOT": ("f", 1, lambda x: np.where(x == 0, np.pi / 2, np.arctan(1 / np.where(x == 0, 1, x))), None),
+        "ACOTH": ("f", 1, lambda x: 0.5 * np.log((x + 1) / (x - 1)), lambda x: np.abs(x) > 1),
+        "ASINH": ("f", 1, np.arcsinh, None), "ATAN": ("f", 1, np.arctan, None), "ATAN2": ("f", 2, np.arctan2, None),
+        "COS": ("f", 1, np.cos, None), "COSH": ("f", 1, np.cosh, None),
+        "COT": ("f", 1, lambda x: np.cos(x) / np.sin(x), nonzero_sin), "CSC": ("f", 1, lambda x: 1 / np.sin(x), nonzero_sin),
+        "COTH": ("f", 1, lambda x: np.cosh(x) / np.sinh(x), lambda x: x != 0), "CSCH": ("f", 1, lambda x: 1 / np.sinh(x), lambda x: np.sinh(x) != 0),
+        "BITAND": ("i", 2, np.bitwise_and, lambda a, b: (a >= 0) & (b >= 0)), "BITOR": ("i", 2, np.bitwise_or, lambda a, b: (a >= 0) & (b >= 0)),
+        "BITXOR": ("i", 2, np.bitwise_xor, lambda a, b: (a >= 0) & (b >= 0)),
+        "BITNAND": ("i", 2, bits(np.bitwise_and), lambda a, b: (a >= 0) & (b >= 0) & small(a, b)),
+        "BITNOR": ("i", 2, bits(np.bitwise_or), lambda a, b: (a >= 0) & (b >= 0) & small(a, b)),
+        "BITXAND": ("i", 2, bits(np.bitwise_xor), lambda a, b: (a >= 0) & (b >= 0) & small(a, b)),
+        "BITLSHIFT": ("i", 2, np.left_shift, lambda a, s: (a >= 0) & (s >= 0) & (a < 2**31) & (s < 32)),
+        "BITRSHIFT": ("i", 2, np.right_shift, lambda a, s: (a >= 0) & (s >= 0) & (s < 63)),
+        "CHAR": ("i", 1, lambda n: np.array([chr(i) for i in range(256)], dtype=object)[n], lambda n: (n >= 1) & (n <= 255)),
+    })
+    return _spill_kernels
+
+def _spill_array(value) -> bool:
+    import numpy as np, pandas as pd
+    return isinstance(value, (list, tuple, np.ndarray, pd.Series, pd.DataFrame, Range))
+
+def _spill_broadcast(args: list) -> list:
+    """Excel array broadcasting: a size-1 axis repeats, longer axes win and the cells a shorter array does not reach are #N/A.
+    1-D inputs line up with the last axis (a row, like the {1,2,3} constant); pass an (n, 1) array or a DataFrame for a column."""
+    import numpy as np
+    arrays = []
+    for a in args:
+        try: arrays.append(np.asarray(a.to_numpy() if hasattr(a, "to_numpy") else a))
+        except ValueError: raise ValueError("#VALUE! 🚫 ragged array argument")
+    ndim = max(a.ndim for a in arrays); arrays = [a.reshape((1,) * (ndim - a.ndim) + a.shape) for a in arrays]
+    shape = tuple(max(a.shape[i] for a in arrays) for i in range(ndim))
+    out = []
+    for a in arrays:
+        target = tuple(1 if s == 1 else t for s, t in zip(a.shape, shape))
+        if target != a.shape:
+            padded = np.full(target, ExcelError.NA, dtype=object); padded[tuple(slice(0, s) for s in a.shape)] = a; a = padded
+        out.append(np.broadcast_to(a, shape))
+    return out
+
+def _spill_call(name: str, func, args: tuple, kwargs: dict):
+    """One spilled call: broadcasts the arguments, runs the vectorized kernel where the cells allow it, and the scalar
+    function on the remaining cells, with per-cell errors returned as ExcelError values."""
+    import numpy as np, pandas as pd
+    arrays = _spill_broadcast(list(args))
+    shape = arrays[0].shape
+    def cell(*values):
+        for v in values:
+            if isinstance(v, ExcelError): return v
+        try: return func(*values, **kwargs)
+        except Exception as e: return ExcelError.from_exception(e)
+    kind, arity, kernel, domain = _spill_kernel_table().get(name, (None, None, None, None))
+    if kernel is not None and not kwargs and arity in (None, len(arrays)) and all(a.dtype.kind in ("iu" if kind == "i" else "biuf") for a in arrays):
+        typed = [a.astype(np.int64 if kind == "i" else float, copy=False) for a in arrays]
+        with np.errstate(all="ignore"):
+            ok = np.ones(shape, dtype=bool) if domain is None else np.broadcast_to(domain(*typed), shape)
+            result = np.asarray(kernel(*[np.where(ok, t, 1) if domain is not None else t for t in typed]))
+        if not ok.all():
+            rest = np.frompyfunc(cell, len(arrays), 1)(*[a[~ok] for a in arrays])
+            result = result.astype(object); result[~ok] = rest
+    else: result = np.frompyfunc(cell, len(arrays), 1)(*arrays)
+    result = _uniform_cells(result)
+    for a in args:
+        if isinstance(a, pd.DataFrame) and a.shape == result.shape: return pd.DataFrame(result, index=a.index, columns=a.columns)
+    return _wrap_like(result, *args)
+
+class _Spill:
+    """
+    Opt-in Excel 365 spill semantics for the scalar (element-wise) functions, exposed as `excelfred.spilling`.
+
+    While enabled, a call with any list, tuple, NumPy array, pandas object or Range argument broadcasts its arguments
+    with Excel's rules and returns one result per cell, in the broadcast shape (a Series or DataFrame when an input
+    of that shape is one). Every function goes through the same dispatcher: math and bit functions have NumPy kernels,
+    the others run per cell, and a failing cell becomes an ExcelError value instead of failing the call. Calls
+    with only scalars are untouched, so `ABS(11, 7)` is still 18 while `ABS([11, -7])` spills to [11, 7].
+    Profiling wraps the spilled call as a whole, so a 1000-cell spill is timed as one call of the function.
+
+    **SAMPLE CODE**:
+
+     import excelfred as xl
+     with xl.spilling:
+         xl.CHAR([65, 66, 67])                  # ['A' 'B' 'C']
+         xl.BITAND([[12], [10]], [6, 3, 1])     # 2x3, column against row
+         xl.COMPLEX([1, 2], [3, 4, 5])          # ['1+3i' '2+4i' #N/A]
+         xl.evaluate("=ACOS({0.5, 2})")         # [1.047... #VALUE!]
+     xl.spilling.enable(["ABS", "CODE"]); xl.spilling.disable()
+    """
+    def __init__(self): self._names = set()
+    @property
+    def enabled(self) -> bool: return bool(self._names)
+    @property
+    def functions(self) -> tuple: return _SPILL_FUNCTIONS
+    def enable(self, functions=None):
+        """Installs the spilling dispatchers, on all element-wise functions or only on the given names."""
+        for name in functions or _SPILL_FUNCTIONS:
+            if name not in _SPILL_FUNCTIONS: raise ValueError(f"#VALUE! 🚫 {name} is not an element-wise function")
+            if name in self._names: continue
+            _dispatch_add(name, "spilling", lambda func, name=name: self._wrap(name, func)); self._names.add(name)
+        return self
+    def _wrap(self, name, func):
+        import functools
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not any(map(_spill_array, args)): return func(*args, **kwargs)
+            return _spill_call(name, func, args, kwargs)
+        return wrapper
+    def disable(self):
+        """Restores the scalar functions."""
+        for name in self._names: _dispatch_remove(name, "spilling")
+        self._names = set()
+        return self
+    def __enter__(self): return self.enable()
+    def __exit__(self, *exc): self.disable()
+
+spilling = _Spill()
+
+
+# pandas accessor
+_VECTORIZED_FUNCTIONS = ("BESSELI", "BESSELJ", "BESSELK", "BESSELY", "CEILING_MATH", "COMBIN", "COMBINA")   # broadcast array arguments element-wise, one result per element
+
+def _accessor_call(name: str, index, args: tuple, kwargs: dict, columns: dict, errors: str):
+    """Runs one function once per row. `columns` maps argument slots (positions or keyword names) to Series already aligned
+    to `index`. Vectorized functions get the columns directly, element-wise ones go through the spill kernels, anything
+    else through a NumPy row loop (np.frompyfunc) over the columns' values. Returns a Series on `index`."""
+    import numpy as np, pandas as pd
+    func = _dispatch_original(name)
+    _check_errors_mode(errors)
+    if name in _VECTORIZED_FUNCTIONS: result = func(*args, **kwargs, errors=errors)
+    elif name in _SPILL_FUNCTIONS and not kwargs: result = _spill_call(name, func, tuple(a.to_numpy() if isinstance(a, pd.Series) else a for a in args), {})
+    else:
+        slots = list(columns)
+        def row(*values):
+            call_args, call_kwargs = list(args), dict(kwargs)
+            for slot, v in zip(slots, values):
+                if isinstance(slot, int): call_args[slot] = v
+                else: call_kwargs[slot] = v
+            try: return func(*call_args, **call_kwargs)
+            except Exception as e:
+                if errors == "raise": raise
+                return ExcelError.from_exception(e)
+        cells = [c.to_numpy(dtype=object) if c.dtype.kind in "mM" else c.to_numpy() for c in columns.values()]
+        result = np.frompyfunc(row, len(cells), 1)(*cells) if cells else np.full(len(index), row(), dtype=object)
+    result = np.asarray(result.to_numpy() if isinstance(result, pd.Series) else result)
+    if errors == "raise" and result.dtype == object:
+        for i in np.flatnonzero(np.frompyfunc(lambda v: isinstance(v, ExcelError), 1, 1)(result).astype(bool))[:1]:
+            func(*[a.iloc[i] if isinstance(a, pd.Series) else a for a in args], **{k: v.iloc[i] if isinstance(v, pd.Series) else v for k, v in kwargs.items()})
+    return pd.Series(_uniform_cells(result), index=index, name=name)
+
+def _uniform_cells(result):
+    """An object array whose cells all share one non-error type, as a typed array; anything else unchanged."""
+    import numpy as np
+    if result.dtype == object and result.size and len({type(v) for v in result.flat}) == 1 and not isinstance(result.flat[0], ExcelError): return np.array(result.tolist())
+    return result
+
+class col:
+    """
+    Marks an accessor argument as a DataFrame column: `df.xl.COMBIN(col("n"), 2)` reads n from every row, while plain
+    strings such as unit names in `df.xl.CONVERT(col("distance"), "m", "ft")` are passed through unchanged.
+    """
+    __slots__ = ("name",)
+    def __init__(self, name): self.name = name
+    def __repr__(self): return f"col({self.name!r})"
+
+class _FrameAccessor:
+    """
+    `df.xl.<FUNCTION>(...)` calls an excelfred function once per row of a DataFrame and returns a Series on its index.
+    Arguments marked with `col("name")` and Series passed directly are read per row (Series are aligned on the index);
+    every other argument, strings included, is passed to every row. The BESSEL functions, CEILING_MATH, COMBIN and
+    COMBINA run vectorized on the columns, the spilling functions use their NumPy kernels, and the rest run in a NumPy
+    row loop over the column arrays, far cheaper than `df.apply(axis=1)`.
+    `errors="return"` gives ExcelError values for failing rows instead of raising.
+
+    **SAMPLE CODE**:
+
+     from excelfred import col
+     df.xl.ACCRINT(issue=col("issue"), first_interest=col("first"), settlement=col("settle"), rate=col("rate"), par=1000, frequency=2)
+     df.xl.COMBIN(col("n"), col("k"), errors="return")
+     df.xl.CONVERT(col("distance"), "m", "ft")
+    """
+    def __init__(self, obj): self._obj = obj
+    def __dir__(self): return sorted(n for n, f in globals().items() if n.isupper() and callable(f) and not isinstance(f, type))
+    def __getattr__(self, name):
+        func = globals().get(name)
+        if not (name.isupper() and callable(func) and not isinstance(func, type)): raise AttributeError(f"excelfred has no function '{name}'")
+        def call(*args, errors: str = "raise", **kwargs):
+            frame = self._obj; args = list(args); columns = {}
+            for slot, value in list(enumerate(args)) + list(kwargs.items()):
+                if isinstance(value, col):
+                    if value.name not in frame.columns: raise ValueError(f"#REF! 🚫 Column not found: {value.name}")
+                    value = frame[value.name]
+                if hasattr(value, "reindex") and hasattr(value, "index") and value.ndim == 1:
+                    value = value.reindex(frame.index) if not value.index.equals(frame.index) else value; columns[slot] = value
+                    if isinstance(slot, int): args[slot] = value
+                    else: kwargs[slot] = value
+            return _accessor_call(name, frame.index, tuple(args), kwargs, columns, errors)
+        call.__name__ = name; call.__doc__ = func.__doc__
+        return call
+
+class _SeriesAccessor(_FrameAccessor):
+    """
+    `s.xl.<FUNCTION>(...)` calls an excelfred function once per element, with the Series as the first argument, and
+    returns a Series on its index: `s.xl.CONVERT("m", "ft")`, `s.xl.CHAR()`, `s.xl.COMBIN(2)`.
+    """
+    def __getattr__(self, name):
+        call = _FrameAccessor.__getattr__(self, name)
+        def series_call(*args, errors: str = "raise", **kwargs): return _accessor_call(name, self._obj.index, (self._obj,) + args, kwargs, {0: self._obj}, errors)
+        series_call.__name__ = name; series_call.__doc__ = call.__doc__
+        return series_call
+
+def register_accessors():
+    """Registers the `df.xl` and `s.xl` pandas accessors. Importing excelfred does this when pandas is already imported;
+    call it once after importing pandas otherwise, since excelfred itself does not import pandas up front."""
+    import pandas as pd
+    pd.api.extensions.register_dataframe_accessor("xl")(_FrameAccessor)
+    pd.api.extensions.register_series_accessor("xl")(_SeriesAccessor)
+
+def _install_pandas_accessors():
+    import sys
+    if "pandas" in sys.modules: register_accessors()
+
+_install_pandas_accessors()
+
+
+# Function registry
+_VOLATILE_FUNCTIONS = ("CELL", "INDIRECT", "INFO", "NOW", "OFFSET", "RAND", "RANDARRAY", "RANDBETWEEN", "TODAY")   # recalculated on every Excel recalc
+
+class FunctionInfo:
+    """
+    Registry entry for one Excel function: its Python and Excel names, positional arity (`max_args` is None when
+    variadic), whether it broadcasts array arguments element-wise (`vectorized`), spills under `excelfred.spilling`
+    (`spills`), is volatile in Excel, and which argument positions take a `Reference`. Calling it calls the function
+    currently bound in the module, so profiling and spilling wrappers apply, and accepts errors="return" for any function.
+    A Range argument reaches a function that does not read Range buffers (`ranges` False) as `Range.tolist()`.
+    """
+    __slots__ = ("name", "excel_name", "min_args", "max_args", "keywords", "vectorized", "spills", "volatile", "reference_args", "ranges")
+    def __init__(self, name: str, func):
+        import inspect
+        params = inspect.signature(func).parameters.values()
+        positional = [p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+        self.name = name; self.excel_name = name.replace("_", ".")
+        self.min_args = sum(p.default is p.empty for p in positional)
+        self.max_args = None if any(p.kind == p.VAR_POSITIONAL for p in params) else len(positional)
+        self.keywords = tuple(p.name for p in params if p.kind == p.KEYWORD_ONLY)
+        self.vectorized = name in _VECTORIZED_FUNCTIONS; self.spills = name in _SPILL_FUNCTIONS
+        self.volatile = name in _VOLATILE_FUNCTIONS; self.reference_args = _REFERENCE_ARGS.get(name, ()); self.ranges = name in _RANGE_FUNCTIONS
+    @property
+    def func(self): return globals()[self.name]
+    def __call__(self, *args, errors: str = "raise", **kwargs):
+        """Calls the function; errors="return" gives the ExcelError of a failing call instead of raising, for every
+        function (those taking `errors` themselves mark bad elements of an array result instead)."""
+        func = globals()[self.name]
+        if not self.ranges and any(isinstance(a, Range) for a in args): args = [a.tolist() if isinstance(a, Range) else a for a in args]
+        if "errors" in self.keywords: return func(*args, errors=errors, **kwargs)
+        _check_errors_mode(errors)
+        if errors == "raise": return func(*args, **kwargs)
+        try: return func(*args, **kwargs)
+        except Exception as e: return ExcelError.from_exception(e)
+    def __repr__(self): return f"FunctionInfo({self.excel_name}, args={self.min_args}..{'n' if self.max_args is None else self.max_args})"
+
+class _Registry:
+    """
+    The Excel functions of the module, indexed once (on first use) by normalized name, exposed as `excelfred.registry`.
+    Lookups accept Python or Excel spellings in any case ("BETA_DIST", "beta.dist", "_xlfn.BETA.DIST") and cost one
+    dict access; `xl.A`-style listings come from a prefix index built at the same time.
+
+    **SAMPLE CODE**:
+
+     import excelfred as xl
+     xl.registry["beta.dist"]                  # FunctionInfo(BETA.DIST, args=4..6)
+     xl.registry["COMBIN"](10, 2)               # 45
+     "CONCAT" in xl.registry, len(xl.registry)
+     xl.registry.names("COUP")                 # ['COUPDAYS', 'COUPDAYSBF', ...] (Excel names)
+     xl.registry.to_frame()                     # one row per function with its metadata
+    """
+    def __init__(self): self._functions = None; self._prefixes = None
+    @staticmethod
+    def _key(name: str) -> str: return name.upper().removeprefix("_XLFN.").removeprefix("_XLWS.").replace(".", "_")
+    def _build(self):
+        g = globals(); functions = {}; prefixes = {}
+        for name, obj in list(g.items()):
+            if not callable(obj) or name.startswith("_") or not name.isupper() or isinstance(obj, type): continue
+            functions[name] = FunctionInfo(name, obj); prefixes.setdefault(name[0], []).append(name)
+        self._prefixes = {letter: tuple(sorted(names)) for letter, names in prefixes.items()}
+        self._functions = functions
+        return functions
+    def get(self, name: str, default=None) -> "FunctionInfo":
+        return (self._functions or self._build()).get(self._key(name), default)
+    def __getitem__(self, name: str) -> "FunctionInfo":
+        info = self.get(name)
+        if info is None: raise KeyError(f"#NAME? 🚫 Unknown function: {name}")
+        return info
+    def __contains__(self, name) -> bool: return isinstance(name, str) and self.get(name) is not None
+    def __iter__(self): return iter(sorted((self._functions or self._build()).values(), key=lambda info: info.name))
+    def __len__(self) -> int: return len(self._functions or self._build())
+    def names(self, prefix: str = "") -> list:
+        """Excel names of the functions starting with `prefix` (Python or Excel spelling), in alphabetical order."""
+        key = self._key(prefix)
+        return [info.excel_name for info in self if info.name.startswith(key)]
+    def listing(self, letter: str) -> tuple:
+        """Python names of the Excel functions starting with `letter`, in alphabetical order (no classes or helpers)."""
+        if self._prefixes is None: self._build()
+        return self._prefixes.get(letter.upper(), ())
+    def to_frame(self):
+        import pandas as pd
+        rows = [{"function": info.excel_name, **{field: getattr(info, field) for field in FunctionInfo.__slots__ if field != "excel_name"}} for info in self]
+        df = pd.DataFrame(rows).set_index("function"); df["max_args"] = df["max_args"].astype("Int64")
+        return df
+
+registry = _Registry()
+
+
+# Memoization
+def _memo_key(args: tuple, kwargs: dict):
+    """Hashable cache key for scalar arguments, or None when any argument is not a scalar (arrays, pandas objects, Range, ...).
+    Every value is tagged with its type, since functions may treat 2, 2.0, True and np.int64(2) differently; floats
+    are keyed by their hex form so NaN finds itself and -0.0 stays apart from 0.0."""
+    key = []
+    for name, v in [(None, a) for a in args] + sorted(kwargs.items()) if kwargs else ((None, a) for a in args):
+        t = type(v)
+        if t is float: part = (t, v.hex())
+        elif t is str or t is int or t is bool or v is None: part = (t, v)
+        else:
+            part = _memo_part(v)
+            if part is None: return None
+        key.append(part if name is None else (name, part))
+    return tuple(key)
+
+def _memo_part(v):
+    import numpy as np
+    if isinstance(v, (float, np.floating)): return (type(v), float(v).hex())
+    if isinstance(v, (str, int, ExcelError, np.integer, np.bool_, np.datetime64, np.timedelta64, complex)) or type(v).__name__ in ("Timestamp", "Timedelta", "datetime", "date"): return (type(v), v)
+    return None
+
+def _memo_cacheable(value) -> bool:
+    """Results kept in a cache must be immutable: scalars, strings, dates and ExcelError values (arrays are recomputed)."""
+    import numpy as np
+    return value is None or isinstance(value, (str, int, float, complex, ExcelError, np.generic)) or type(value).__name__ in ("Timestamp", "Timedelta", "datetime", "date")
+
+_PURE_FUNCTIONS = ("ABS", "ACCRINT", "ACCRINTM", "ACOS", "ACOSH", "ACOT", "ACOTH", "ADDRESS", "AMORLINC", "ARABIC", "ASIN", "ASINH",
+                   "ATAN", "ATAN2", "ATANH", "BAHTTEXT", "BASE", "BESSELI", "BESSELJ", "BESSELK", "BESSELY", "BETA_DIST", "BETA_INV",
+                   "BIN2DEC", "BIN2HEX", "BIN2OCT", "BINOM_DIST", "BINOM_DIST_RANGE", "BINOM_INV", "BITAND", "BITLSHIFT", "BITNAND",
+                   "BITNOR", "BITOR", "BITRSHIFT", "BITXAND", "BITXOR", "CEILING_MATH", "CHAR", "CHISQ_DIST", "CHISQ_DIST_RT", "CHISQ_INV",
+                   "CHISQ_INV_RT", "CODE", "COMBIN", "COMBINA", "COMPLEX", "CONFIDENCE_NORM", "CONFIDENCE_T", "CONVERT", "COS", "COSH",
+                   "COT", "COTH", "COUPDAYS", "COUPDAYSBF", "COUPDAYSNC", "COUPNCD", "COUPNUM", "COUPPCD", "CSC", "CSCH", "CUMIPMT",
+                   "CUMPRINC")   # same scalar arguments, same result: what memoization.enable() caches by default
+
+class _MemoCache:
+    __slots__ = ("entries", "bytes", "hits", "misses", "bypassed", "evictions")
+    def __init__(self):
+        from collections import OrderedDict
+        self.entries = OrderedDict(); self.bytes = 0; self.hits = self.misses = self.bypassed = self.evictions = 0
+
+class _Memoizer:
+    """
+    Opt-in result memoization for pure functions called again and again with the same scalar arguments, exposed as
+    `excelfred.memoization`.
+
+    `enable()` puts a bounded LRU cache in front of each chosen function (by default the scalar functions whose result
+    depends on their arguments alone, listed in `_PURE_FUNCTIONS`): at most `maxsize` entries per function and `budget` bytes across all of them, evicting the least recently
+    used entry of the largest cache first. Calls with a non-scalar argument, and results that are not immutable scalars,
+    skip the cache; raised errors are never cached. The cache is the innermost wrapper layer: under spilling, cells that
+    fall back to the scalar function are cached one by one, and profiling counts hits as calls like any other.
+
+    **SAMPLE CODE**:
+
+     import excelfred as xl
+     xl.memoization.enable(["CONVERT", "COMBIN", "CHISQ_INV"], maxsize=4096, budget=16 * 2**20)
+     for x in readings: xl.CONVERT(x, "mi", "km")
+     print(xl.memoization.report())   # DataFrame: hits, misses, bypassed, hit_rate, entries, bytes, evictions
+     xl.memoization.clear(); xl.memoization.disable()
+    """
+    def __init__(self):
+        import threading
+        self._names = set(); self._caches = {}; self._lock = threading.Lock(); self.maxsize = 1024; self.budget = 32 * 2**20; self._bytes = 0
+    @property
+    def enabled(self) -> bool: return bool(self._names)
+    @property
+    def bytes(self) -> int: return self._bytes
+    def enable(self, functions=None, maxsize: int = None, budget: int = None):
+        """Installs the caches on the given names (Python or Excel spelling) or on the default pure functions; `maxsize`
+        (entries per function) and `budget` (total bytes) apply to all caches."""
+        if maxsize is not None:
+            if maxsize < 1: raise ValueError("#VALUE! 🚫 maxsize must be at least 1")
+            self.maxsize = int(maxsize)
+        if budget is not None:
+            if budget < 0: raise ValueError("#VALUE! 🚫 budget must be non-negative")
+            self.budget = int(budget)
+        names = [registry[n].name for n in functions] if functions else _PURE_FUNCTIONS
+        for name in names:
+            if name in self._names: continue
+            cache = self._caches.setdefault(name, _MemoCache())
+            _dispatch_add(name, "memoization", lambda func, cache=cache: self._wrap(func, cache)); self._names.add(name)
+        with self._lock: self._trim()
+        return self
+    def _wrap(self, func, cache):
+        import functools, sys
+        lock = self._lock
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _memo_key(args, kwargs)
+            if key is None:
+                with lock: cache.bypassed += 1
+                return func(*args, **kwargs)
+            with lock:
+                entry = cache.entries.get(key)
+                if entry is not None: cache.entries.move_to_end(key); cache.hits += 1; return entry[0]
+                cache.misses += 1
+            value = func(*args, **kwargs)
+            if _memo_cacheable(value):
+                size = sys.getsizeof(key) + sum(sys.getsizeof(p) for p in key) + sys.getsizeof(value) + 64   # approximate: key tuples, result, dict slot
+                with lock:
+                    if key not in cache.entries:
+                        cache.entries[key] = (value, size); cache.bytes += size; self._bytes += size
+                        if len(cache.entries) > self.maxsize: self._evict(cache)
+                        if self._bytes > self.budget: self._trim()
+            return value
+        return wrapper
+    def _evict(self, cache):
+        _, (_, size) = cache.entries.popitem(last=False)
+        cache.bytes -= size; self._bytes -= size; cache.evictions += 1
+    def _trim(self):
+        """Evicts least recently used entries, from the largest cache first, until every cache fits `maxsize` and the total fits `budget`."""
+        for cache in self._caches.values():
+            while len(cache.entries) > self.maxsize: self._evict(cache)
+        while self._bytes > self.budget:
+            cache = max(self._caches.values(), key=lambda c: c.bytes)
+            if not cache.entries: break
+            self._evict(cache)
+    def clear(self):
+        """Empties every cache and zeroes the counters; installed caches keep working."""
+        with self._lock:
+            for cache in self._caches.values(): cache.entries.clear(); cache.bytes = 0; cache.hits = cache.misses = cache.bypassed = cache.evictions = 0
+            self._bytes = 0
+        return self
+    def disable(self):
+        """Restores the uncached functions and drops the cached results."""
+        for name in self._names: _dispatch_remove(name, "memoization")
+        self._names = set()
+        return self.clear()
+    def report(self):
+        """Returns a DataFrame indexed by function name, most hits first."""
+        import pandas as pd
+        rows = [{"function": name, "hits": c.hits, "misses": c.misses, "bypassed": c.bypassed, "hit_rate": c.hits / (c.hits + c.misses) if c.hits + c.misses else 0.0,
+                 "entries": len(c.entries), "bytes": c.bytes, "evictions": c.evictions} for name, c in self._caches.items() if c.hits or c.misses or c.bypassed]
+        cols = ["hits", "misses", "bypassed", "hit_rate", "entries", "bytes", "evictions"]
+        if not rows: return pd.DataFrame(columns=cols, index=pd.Index([], name="function"))
+        return pd.DataFrame(rows).set_index("function").sort_values("hits", ascending=False)[cols]
+
+memoization = _Memoizer()
@@ -0,0 +1,30 @@
+import os, subprocess, sys
+import numpy as np, pandas as pd, pytest
+import excelfred as xl
+from excelfred import col
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"n": [5, 6, 4], "k": [2, 3, 5], "m": ["m", "km", "m"], "d": [1.0, 2.0, 3.0]})
+
+def test_marked_columns_are_read_per_row(frame):
+    out = frame.xl.COMBIN(col("n"), col("k"), errors="return")
+    assert out.index.equals(frame.index) and out.iloc[0] == 10 and out.iloc[1] == 20 and isinstance(out.iloc[2], xl.ExcelError)
+
+def test_plain_strings_matching_a_column_stay_literal(frame):
+    out = frame.xl.CONVERT(col("d"), "m", "km")   # "m" is also a column name, but unmarked
+    assert np.allclose(out.to_numpy(dtype=float), [0.001, 0.002, 0.003])
+    assert list(frame.xl.CONVERT(col("d"), col("m"), "m")) == pytest.approx([1.0, 2000.0, 3.0])
+
+def test_series_arguments_align_on_the_index(frame):
+    k = pd.Series([1, 2, 2], index=[2, 1, 0])
+    assert list(frame.xl.COMBIN(col("n"), k)) == [10, 15, 4]
+
+def test_unknown_column_and_series_accessor(frame):
+    with pytest.raises(ValueError, match="#REF!"): frame.xl.COMBIN(col("missing"), 2)
+    assert list(frame["n"].xl.COMBIN(2)) == [10, 15, 6]
+
+def test_registration_needs_no_import_hook():
+    code = ("import sys, excelfred as xl; assert 'pandas' not in sys.modules and not any('excelfred' in type(f).__module__ for f in sys.meta_path);"
+            "import pandas as pd; assert not hasattr(pd.DataFrame, 'xl'); xl.register_accessors(); assert pd.DataFrame({'a': [3]}).xl.CHAR(xl.col('a')).tolist() == ['\\x03']")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.abspath(xl.__file__)))
@@ -0,0 +1,21 @@
+import numpy as np, pytest
+import excelfred as xl
+from excelfred import ExcelError
+
+def test_scalars_match_excel():
+    assert xl.BESSELJ(5, 2) == pytest.approx(0.04656511627775229)
+    assert xl.BESSELJ(10, 0) == pytest.approx(-0.24593576445134832)
+    assert xl.BESSELJ(5, 2.9) == xl.BESSELJ(5, 2)   # order truncated like Excel
+
+@pytest.mark.parametrize("name", ["BESSELI", "BESSELJ", "BESSELK", "BESSELY"])
+def test_arrays_broadcast_and_match_scalar_calls(name):
+    func = getattr(xl, name); x = np.array([0.5, 1.5, 4.0]); n = np.array([[0], [1], [3]])
+    grid = func(x, n)
+    assert grid.shape == (3, 3)
+    assert np.allclose(grid, [[func(float(a), int(b)) for a in x] for b in n.ravel()])
+
+def test_domain_errors_are_masked_per_element():
+    out = xl.BESSELI(np.array([1.0, -1.0]), np.array([1, -1]), errors="return")
+    assert out[0] == pytest.approx(0.565159103992485) and out[1] is ExcelError.NUM
+    assert np.isnan(xl.BESSELK(np.array([1.0, -1.0]), 1)[1])
+    with pytest.raises(ValueError, match="#NUM!"): xl.BESSELK(-1, 1)
@@ -0,0 +1,18 @@
+import numpy as np, pytest
+import excelfred as xl
+from excelfred import ExcelError
+
+def test_scalar_rounding_modes():
+    assert xl.CEILING_MATH(2.1) == 3 and xl.CEILING_MATH(-2.1) == -2 and xl.CEILING_MATH(-2.1, 1, 1) == -3
+    assert xl.CEILING_MATH(24.3, 5) == 25 and xl.CEILING_MATH(2.1, 0) == 0
+
+def test_arrays_broadcast_like_scalars():
+    number = np.array([2.1, -2.1, 24.3]); mode = np.array([0, 1, 0])
+    assert xl.CEILING_MATH(number, np.array([1, 1, 5]), mode).tolist() == [3, -3, 25]
+    assert [xl.CEILING_MATH(v, 2) for v in number] == xl.CEILING_MATH(number, 2).tolist()
+
+def test_negative_significance_is_masked_per_element():
+    out = xl.CEILING_MATH([4.3, 1], [1, -1], errors="return")
+    assert out[0] == 5 and out[1] is ExcelError.NUM
+    assert np.isnan(xl.CEILING_MATH(np.array([4.3, 1]), np.array([1, -1]))[1])
+    with pytest.raises(ValueError, match="#NUM!"): xl.CEILING_MATH(4.3, -1)
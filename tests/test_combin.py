@@ -0,0 +1,29 @@
+import numpy as np, pandas as pd, pytest
+import excelfred as xl
+from excelfred import ExcelError
+
+def test_scalars():
+    assert xl.COMBIN(10, 2) == 45 and xl.COMBINA(10, 2) == 55
+    assert xl.COMBIN(200, 100) == 90548514656103281165404177077484163874504589675413336841320
+
+def test_scalar_and_array_share_the_integer_rule():
+    assert xl.COMBIN(5.0, 2) == 10 and xl.COMBIN([5.0], 2).tolist() == [10.0]
+    assert xl.COMBIN("5", 2) == 10
+    with pytest.raises(ValueError, match="#VALUE!"): xl.COMBIN(5.5, 2)
+    assert xl.COMBIN(5.5, 2, errors="return") is ExcelError.VALUE
+    assert xl.COMBINA(3.0, 2) == 6 and xl.COMBINA([3.0], 2).tolist() == [6.0]
+
+def test_text_elements_are_value_errors_per_cell():
+    out = xl.COMBIN(["a", 5], 2, errors="return")
+    assert out[0] is ExcelError.VALUE and out[1] == 10
+    assert np.isnan(xl.COMBIN(["a", 5], 2)[0])
+    assert xl.COMBINA(["x", 10], 2, errors="return").tolist() == [ExcelError.VALUE, 55.0]
+
+def test_num_errors():
+    assert xl.COMBIN([5, 5.5, 3], 4, errors="return").tolist() == [5.0, ExcelError.VALUE, ExcelError.NUM]
+    with pytest.raises(ValueError, match="#NUM!"): xl.COMBIN(2, 3)
+    assert xl.COMBINA(0, 2, errors="return") is ExcelError.NUM
+
+def test_series_keeps_index():
+    out = xl.COMBIN(pd.Series([4, 6], index=["a", "b"]), 2)
+    assert list(out.index) == ["a", "b"] and out.tolist() == [6.0, 15.0]
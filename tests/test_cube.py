@@ -0,0 +1,132 @@
+import pandas as pd, pytest
+import excelfred as xl
+
+@pytest.fixture
+def cube():
+    df = pd.DataFrame({"Region": ["N", "N", "S", "S"], "Year": [2023, 2024, 2023, 2024], "Sales": [10.0, 20.0, 30.0, 40.0], "Cost": [4.0, 5.0, 6.0, 7.0]})
+    cube = xl.Cube("Sales")
+    cube.add_data(df)
+    cube.add_dimension("Region", {r: {"caption": r, "unique_name": f"[Region].[{r}]", "unary": 1} for r in ["N", "S"]})
+    cube.add_dimension("Year", {y: {"caption": str(y), "unique_name": f"[Year].[{y}]", "unary": 1} for y in [2023, 2024]})
+    cube.add_measure("Sales", "Sales", agg="sum")
+    cube.add_measure("Cost", "Cost", agg="sum")
+    cube.add_kpi("Margin", {"value": "=[Sales] - [Cost]", "goal": "=[Cost] * 2 + 1", "status": lambda c, ctx: 1.0})
+    return cube
+
+def test_expression_goal_goes_through_the_compiled_path(cube):
+    goal = xl.CUBEKPIMEMBER(cube, "Margin", "goal")
+    assert goal["kpi_part"] == "goal"
+    assert xl.CUBEVALUE(cube, "[Region].[N]", goal) == pytest.approx((4 + 5) * 2 + 1)
+    assert xl._kpi_goal_value(cube, cube.kpis["Margin"]["goal"], {"Region": "S", "Year": 2024}) == pytest.approx(7 * 2 + 1)
+
+def test_measure_name_goal_and_expression_value(cube):
+    assert xl._kpi_goal_value(cube, "Sales", {"Region": "S"}) == pytest.approx(70)
+    assert xl.CUBEVALUE(cube, xl.CUBEKPIMEMBER(cube, "Margin", 1)) == pytest.approx(100 - 22)
+
+def test_kpi_division_by_zero_marks_only_its_own_context(cube):
+    ratio = "=[Sales] / ([Cost] - 5)"
+    values = xl._kpi_text_values(cube, ratio, [[("Year", 2024)], [("Region", "N"), ("Region", "S")]])
+    assert values[0] is xl.ExcelError.DIV0 and values[1] == pytest.approx(40 / 2)
+    assert xl._kpi_goal_value(cube, ratio, {"Region": "S", "Year": 2024}) == pytest.approx(20)
+    with pytest.raises(ValueError, match="#DIV/0!"): xl._kpi_goal_value(cube, ratio, {"Region": "N", "Year": 2024})
+
+def test_kpi_arity_cache_does_not_keep_callables_alive():
+    import gc, weakref
+    status = lambda ctx: 1.0
+    assert xl._kpi_call_arity(status) == 1 and xl._kpi_call_arity(lambda cube, ctx: 0.0) == 2
+    ref = weakref.ref(status); del status; gc.collect()
+    assert ref() is None and xl._kpi_call_arity(str.upper) == 1
+
+@pytest.fixture
+def sales():
+    df = pd.DataFrame({"Product": ["Bike", "Bike", "Helmet", "Helmet", "Bike", "Helmet"], "Region": ["US", "US", "US", "EU", "EU", "EU"],
+                       "Year": [2023, 2024, 2023, 2023, 2023, 2024], "Sales": [1000, 1100, 300, 200, 700, 500], "InventoryEnd": [50, 55, 20, 18, 40, 35]})
+    cube = xl.Cube("SalesCube")
+    cube.add_data(df)
+    cube.add_dimension("Product", {"Bike": {"caption": "Bike", "unique_name": "[Product].[Bike]", "unary": 1},
+                                   "Helmet": {"caption": "Helmet", "unique_name": "[Product].[Helmet]", "unary": -1}})
+    cube.add_dimension("Region", {"US": {"caption": "United States", "unique_name": "[Region].[US]", "unary": 1},
+                                  "EU": {"caption": "Europe", "unique_name": "[Region].[EU]", "unary": 1}})
+    cube.add_dimension("Year", {y: {"caption": str(y), "unique_name": f"[Year].[{y}]", "unary": 1} for y in (2023, 2024)})
+    cube.add_measure("Sales", "Sales", agg="sum")
+    cube.add_measure("InventoryEnd", "InventoryEnd", agg="last_non_empty", time_dim="Year")
+    return cube
+
+def test_members_resolve_by_key_caption_and_unique_name(sales):
+    assert xl.CUBEMEMBER(sales, "[Region].[Europe]")["key"] == "EU"
+    assert xl.CUBEMEMBER(sales, "[Region].[EU]")["caption"] == "Europe"
+    assert xl.CUBEMEMBERPROPERTY(sales, "[Region].[US]", "caption") == "United States"
+    with pytest.raises(ValueError, match="#N/A"): xl.CUBEMEMBER(sales, "[Region].[Mars]")
+
+def test_bracketed_member_is_one_member_and_bare_dimension_is_all(sales):
+    assert xl.CUBEVALUE(sales, "[Region].[EU]", "Sales") == 200 + 700 + 500 and xl.CUBEVALUE(sales, "[Region]", "Sales") == 3800
+    assert xl.CUBEVALUE(sales, "[Region]", "Sales") == xl.CUBEVALUE(sales, "Region", "Sales") == xl.CUBEVALUE(sales, xl.CUBESET(sales, "Region"), "Sales")
+    assert xl.CUBEVALUE(sales, "[Region].[EU]", "Sales") != xl.CUBEVALUE(sales, "[Region]", "Sales")
+
+def test_measure_sorted_sets_and_ranked_members(sales):
+    ascending = xl.CUBESET(sales, "Region", None, 5, "Sales"); descending = xl.CUBESET(sales, "Region", None, 6, "Sales")
+    assert [m["key"] for m in ascending["members"]] == ["EU", "US"] and [m["key"] for m in descending["members"]] == ["US", "EU"]
+    top = xl.CUBESET(sales, "Region", None, 6, "Sales", top_n=1)
+    assert xl.CUBESETCOUNT(top) == 1 and xl.CUBERANKEDMEMBER(sales, descending, 1)["key"] == "US"
+    with pytest.raises(ValueError, match="#VALUE!"): xl.CUBESET(sales, "Region", None, 5)
+
+def test_top_n_applies_to_every_sort_order_and_accepts_numpy_integers(sales):
+    import numpy as np
+    assert [m["key"] for m in xl.CUBESET(sales, "Region", None, 1, top_n=np.int64(1))["members"]] == ["US"]   # captions descending
+    assert [m["key"] for m in xl.CUBESET(sales, "Region", None, 2, top_n=1)["members"]] == ["EU"]
+    assert xl.CUBESETCOUNT(xl.CUBESET(sales, "Product", top_n=1)) == 1
+    assert [m["key"] for m in xl.CUBESET(sales, "Region", None, 6, "Sales", top_n=np.int32(1))["members"]] == ["US"]
+    for bad in (True, 0, 1.0):
+        with pytest.raises(ValueError, match="#VALUE!"): xl.CUBESET(sales, "Region", None, 2, top_n=bad)
+
+def test_pooled_evaluation_matches_serial(sales):
+    members = (xl.CUBESET(sales, "Product"), xl.CUBESET(sales, "Region"), xl.CUBESET(sales, "Year"), "InventoryEnd")
+    assert xl.CUBEVALUE(sales, *members, workers=3, chunk_size=1) == xl.CUBEVALUE(sales, *members)
+
+def test_grid_matches_cubevalue_per_cell(sales):
+    grid = xl.CUBEVALUE_GRID(sales, "Sales", "Product", "Region", "[Year].[2023]")
+    for p in ("Bike", "Helmet"):
+        for r, caption in (("US", "United States"), ("EU", "Europe")):
+            assert grid.loc[p, caption] == xl.CUBEVALUE(sales, f"[Product].[{p}]", f"[Region].[{r}]", "[Year].[2023]", "Sales")
+
+def test_unary_operators_and_last_non_empty(sales):
+    assert xl.CUBEVALUE(sales, "[Product].[Helmet]", "Sales") == -1000
+    assert xl.CUBEVALUE(sales, xl.CUBESET(sales, "Product"), "Sales") == 2800 - 1000
+    assert xl.CUBEVALUE(sales, "[Product].[Bike]", "InventoryEnd") == 55 and xl.CUBEVALUE(sales, "[Region].[EU]", "InventoryEnd") == 35
+
+def test_fact_table_is_stored_compactly(sales):
+    assert isinstance(sales.data["Product"].dtype, pd.CategoricalDtype)
+    usage = sales.memory_usage()
+    assert usage.index[-1] == "Total" and usage.loc["Total", "bytes"] == usage["bytes"].iloc[:-1].sum()
+
+def test_save_and_memory_mapped_open_round_trip(sales, tmp_path):
+    sales.save(tmp_path / "cube")
+    reopened = xl.Cube.open(tmp_path / "cube")
+    assert all(reopened.data[c].tolist() == sales.data[c].tolist() and reopened.data[c].dtype == sales.data[c].dtype for c in sales.data)
+    assert xl.CUBEVALUE_GRID(reopened, "Sales", "Product", "Region").equals(xl.CUBEVALUE_GRID(sales, "Sales", "Product", "Region"))
+
+def test_snapshots_are_versioned_and_read_only(sales):
+    snap = sales.snapshot(); version = sales.version
+    sales.add_measure("Twice", "Sales", agg="sum")
+    assert sales.version == version + 1 and "Twice" not in snap.measures_meta
+    with pytest.raises(ValueError, match="read-only"): snap.add_measure("X", "Sales")
+
+def test_snapshots_own_their_members_and_lookups_do_not_write(sales):
+    snap = sales.snapshot(); index = dict(snap._member_index)
+    sales.dimensions["Region"]["US"]["caption"] = "USA"; sales.dimensions["Region"]["XX"] = {"caption": "Other"}
+    assert snap.dimensions["Region"]["US"]["caption"] == "United States" and "XX" not in snap.dimensions["Region"]
+    assert snap.find_member("Region", "europe") == "EU" and snap._member_index == index
+    sales.add_dimension("Region", sales.dimensions["Region"])
+    assert sales.snapshot().find_member("Region", "other") == "XX" and snap.find_member("Region", "other") is None
+
+def test_concurrent_reads_while_writing(sales):
+    import threading
+    expected = xl.CUBEVALUE(sales, "[Region].[US]", "Sales"); seen = []; stop = threading.Event()
+    def read():
+        while not stop.is_set(): seen.append(xl.CUBEVALUE(sales, "[Region].[US]", "Sales"))
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for t in readers: t.start()
+    for i in range(50): sales.add_measure(f"M{i}", "Sales")
+    stop.set()
+    for t in readers: t.join()
+    assert seen and set(seen) == {expected}
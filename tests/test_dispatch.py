@@ -0,0 +1,44 @@
+"""Profiling, spilling and memoization share one wrapper stack per function and must compose in any order."""
+import itertools
+import pytest
+import excelfred as xl
+
+FEATURES = {"profiling": lambda: xl.profiling, "spilling": lambda: xl.spilling, "memoization": lambda: xl.memoization}
+ORIGINAL_CHAR = xl.CHAR
+
+@pytest.fixture(autouse=True)
+def clean():
+    yield
+    for get in FEATURES.values(): get().disable()
+    xl.profiling.reset()
+    assert xl.CHAR is ORIGINAL_CHAR
+
+def check(active: set):
+    """xl.CHAR behaves exactly as the active features say."""
+    xl.profiling.reset(); xl.memoization.clear()
+    assert xl.CHAR(65) == "A" and xl.CHAR(65) == "A"
+    if "spilling" in active: assert xl.CHAR([66, 67]).tolist() == ["B", "C"]
+    else:
+        with pytest.raises(ValueError): xl.CHAR([66, 67])
+    report = xl.profiling.report()
+    calls = int(report.loc["CHAR", "calls"]) if "CHAR" in report.index else 0
+    assert (calls > 0) == ("profiling" in active)
+    memo = xl.memoization.report()
+    hits = int(memo.loc["CHAR", "hits"]) if "CHAR" in memo.index else 0
+    assert (hits > 0) == ("memoization" in active)
+
+@pytest.mark.parametrize("enable_order", list(itertools.permutations(FEATURES)), ids="-".join)
+@pytest.mark.parametrize("disable_order", list(itertools.permutations(FEATURES)), ids="-".join)
+def test_every_enable_disable_order(enable_order, disable_order):
+    active = set()
+    for name in enable_order:
+        FEATURES[name]().enable(["CHAR"]); active.add(name); check(active)
+    for name in disable_order:
+        FEATURES[name]().disable(); active.discard(name); check(active)
+    assert xl.CHAR is ORIGINAL_CHAR
+
+def test_profiling_off_costs_nothing_after_other_layers_leave():
+    xl.profiling.enable(["CHAR"]); xl.spilling.enable(["CHAR"]); xl.profiling.disable()
+    assert xl.spilling.enabled and xl.CHAR([65]).tolist() == ["A"]
+    xl.spilling.disable()
+    assert xl.CHAR is ORIGINAL_CHAR and not xl.profiling.enabled
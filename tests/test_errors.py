@@ -0,0 +1,26 @@
+import numpy as np, pytest
+import excelfred as xl
+from excelfred import ExcelError
+
+def test_error_values_are_singletons():
+    assert ExcelError("#NUM!") is ExcelError.NUM and repr(ExcelError.DIV0) == "#DIV/0!"
+    assert ExcelError.from_exception(ZeroDivisionError()) is ExcelError.DIV0
+    assert ExcelError.from_exception(ValueError("#N/A 🚫 missing")) is ExcelError.NA
+    assert ExcelError.from_exception(RuntimeError("boom")) is ExcelError.VALUE
+
+def test_return_mode_marks_bad_elements_only():
+    assert xl.COMBIN(-1, 2, errors="return") is ExcelError.NUM
+    out = xl.COMBIN([5, 5.5, 3], 4, errors="return")
+    assert out[0] == 5 and out[1] is ExcelError.VALUE and out[2] is ExcelError.NUM
+    with pytest.raises(ValueError, match="#VALUE!"): xl.COMBIN(5, 2, errors="ignore")
+
+def test_evaluate_returns_errors_on_request():
+    assert xl.evaluate("=COMBIN(2, 5)", errors="return") is ExcelError.NUM
+    with pytest.raises(ValueError, match="#NUM!"): xl.evaluate("=COMBIN(2, 5)")
+
+def test_registry_calls_return_errors_for_every_function():
+    assert xl.registry["BIN2DEC"]("2", errors="return") is ExcelError.VALUE
+    assert xl.registry["CHAR"](65, errors="return") == "A"
+    out = xl.registry["COMBIN"]([5, 5.5], 4, errors="return")   # functions with their own errors= keep per-element marks
+    assert out[0] == 5 and out[1] is ExcelError.VALUE
+    with pytest.raises(ValueError): xl.registry["BIN2DEC"]("2")
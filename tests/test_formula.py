@@ -0,0 +1,28 @@
+import pandas as pd, pytest
+import excelfred as xl
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"k": [4, 6, 8], "grp": ["a", "b", "b"], "v": [10, 20, 30]})
+
+def test_references_and_functions_over_a_frame(frame):
+    assert xl.evaluate('=AVERAGEIFS(C:C, A:A, ">5")', frame) == 25.0
+    assert xl.evaluate('=COUNTIF(B1:B3, "b") & " rows"', frame) == "2 rows"
+
+def test_frame_cells_are_python_values_and_ranges_are_lists(frame):
+    assert xl.evaluate("=AND(TRUE, A1>3)", frame) is True
+    assert xl.evaluate("=AVERAGE(A1:A3)", frame) == 6.0 and xl.evaluate("=AVERAGE(A1:C1)", frame) == 7.0
+    assert xl.evaluate("=A4", frame) is None and xl.evaluate("=COUNT(A1:A9)", frame) == 3
+
+def test_names_dotted_functions_and_operator_precedence():
+    assert xl.evaluate("=BETA.DIST(x, 2, 3, TRUE)", {"x": 0.5}) == pytest.approx(0.6875)
+    assert xl.evaluate('=CONVERT(1, "mi", "km") * 2') == pytest.approx(3.218688)
+    assert xl.evaluate("=2^3+-1*2%") == pytest.approx(7.98)
+    assert xl.evaluate("=A1+Sheet2!A1", {"A1": 1, "Sheet2": {"A1": 5}}) == 6
+
+def test_parsed_trees_are_cached_by_text():
+    assert xl._formula_tree("=1+COMBIN(4, 2)") is xl._formula_tree("=1+COMBIN(4, 2)")
+    assert xl.evaluate("=1+COMBIN(4, 2)") == 7
+
+def test_unknown_function_is_a_name_error():
+    with pytest.raises(ValueError, match="#NAME?"): xl.evaluate("=NOSUCH(1)")
@@ -0,0 +1,39 @@
+import threading
+import numpy as np, pytest
+import excelfred as xl
+
+@pytest.fixture(autouse=True)
+def off():
+    limits = xl.memoization.maxsize, xl.memoization.budget
+    yield
+    xl.memoization.disable(); xl.memoization.maxsize, xl.memoization.budget = limits
+
+def test_default_covers_the_pure_allow_list_only():
+    original = {name: xl.registry[name].func for name in ("CONVERT", "CELL", "CUBEVALUE", "CONCAT", "AVERAGE")}
+    xl.memoization.enable()
+    assert set(xl.memoization._names) == set(xl._PURE_FUNCTIONS) <= {f.name for f in xl.registry}
+    assert xl.CONVERT is not original["CONVERT"]
+    assert all(getattr(xl, name) is original[name] for name in ("CELL", "CUBEVALUE", "CONCAT", "AVERAGE"))
+
+def test_hits_misses_and_bypass_counts():
+    xl.memoization.enable(["CONVERT"])
+    for _ in range(3): assert xl.CONVERT(2.0, "mi", "km") == pytest.approx(3.218688)
+    xl.CONVERT(np.array([1.0, 2.0]), "m", "ft")
+    row = xl.memoization.report().loc["CONVERT"]
+    assert (row["hits"], row["misses"], row["bypassed"]) == (2, 1, 1)
+
+def test_bypass_count_is_exact_under_threads():
+    xl.memoization.enable(["COMBIN"]); values = np.array([5, 6])
+    def work():
+        for _ in range(2000): xl.COMBIN(values, 2)
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert xl.memoization.report().loc["COMBIN", "bypassed"] == 8000
+
+def test_budget_bounds_the_cache():
+    xl.memoization.enable(["CHAR"], maxsize=8)
+    for i in range(1, 40): xl.CHAR(i)
+    assert len(xl.memoization._caches["CHAR"].entries) == 8
+    xl.memoization.enable(budget=0)
+    assert xl.memoization.bytes == 0
@@ -0,0 +1,45 @@
+import numpy as np, pandas as pd, pytest
+import excelfred as xl
+
+def make_cube(data, **kw):
+    cube = xl.Cube("Sales")
+    cube.add_data(data, **kw)
+    cube.add_dimension("Region", {r: {"caption": r, "unique_name": f"[Region].[{r}]", "unary": 1} for r in ["N", "S", "E"]})
+    cube.add_dimension("Year", {y: {"caption": str(y), "unique_name": f"[Year].[{y}]", "unary": 1} for y in range(2020, 2024)})
+    cube.add_measure("Sales", "Sales", agg="sum")
+    return cube
+
+@pytest.fixture
+def facts():
+    rng = np.random.default_rng(1); n = 400
+    df = pd.DataFrame({"Region": np.array(["N", "S", "E"], dtype=object)[rng.integers(0, 3, n)], "Year": rng.integers(2020, 2024, n), "Sales": rng.random(n) * 100})
+    return df.sort_values("Year", kind="stable").reset_index(drop=True)
+
+@pytest.fixture
+def csv_paths(facts, tmp_path):
+    paths = []
+    for i in range(0, len(facts), 100):
+        paths.append(tmp_path / f"chunk_{i // 100}.csv"); facts.iloc[i:i + 100].to_csv(paths[-1], index=False)
+    return paths
+
+def test_out_of_core_matches_in_memory(facts, csv_paths):
+    memory, disk = make_cube(facts), make_cube(csv_paths, chunk_rows=25)
+    for expr in ["[Year].[2021]", "[Region].[S]"]:
+        for _ in range(2):   # first scan learns statistics and offsets, second reads by offset
+            assert xl.CUBEVALUE(disk, expr, "Sales") == pytest.approx(xl.CUBEVALUE(memory, expr, "Sales"))
+
+def test_pruned_csv_chunks_are_not_parsed(facts, csv_paths, monkeypatch):
+    cube = make_cube(csv_paths, chunk_rows=25)
+    expected = xl.CUBEVALUE(cube, "[Year].[2022]", "Sales")
+    calls = []; read_csv = pd.read_csv
+    monkeypatch.setattr(pd, "read_csv", lambda *a, **k: calls.append(k) or read_csv(*a, **k))
+    assert xl.CUBEVALUE(cube, "[Year].[2022]", "Sales") == pytest.approx(expected)
+    kept = sum(1 for st in cube.data.stats.values() if st["minmax"]["Year"][0] <= 2022 <= st["minmax"]["Year"][1])
+    assert len(calls) == kept < len(cube.data.stats) and not any("chunksize" in k for k in calls)
+
+def test_quoted_line_breaks_fall_back_to_full_reads(tmp_path):
+    path = tmp_path / "notes.csv"
+    pd.DataFrame({"Region": ["N", "S"], "Year": [2020, 2021], "Sales": [1.0, 2.0], "Note": ["a\nb", "c"]}).to_csv(path, index=False)
+    cube = make_cube([path], chunk_rows=1)
+    assert [xl.CUBEVALUE(cube, "[Year].[2021]", "Sales") for _ in range(2)] == [2.0, 2.0]
+    assert cube.data._offsets == {0: None}
@@ -0,0 +1,22 @@
+import pytest
+import excelfred as xl
+
+@pytest.fixture(autouse=True)
+def off():
+    yield
+    xl.profiling.disable(); xl.profiling.reset()
+
+def test_counts_calls_elements_and_error_codes():
+    original = xl.COMBIN
+    xl.profiling.enable(["COMBIN", "CONCAT"])
+    xl.COMBIN(10, 2); xl.COMBIN(10, 3); xl.CONCAT(range(100))
+    with pytest.raises(ValueError): xl.COMBIN(-1, 2)
+    report = xl.profiling.report()
+    assert report.loc["COMBIN", "calls"] == 3 and report.loc["CONCAT", "calls"] == 1
+    assert report.loc["CONCAT", "elements"] >= 100 and report.loc["COMBIN", "#NUM!"] == 1
+    xl.profiling.disable()
+    assert xl.COMBIN is original
+
+def test_reset_keeps_wrappers_counting():
+    xl.profiling.enable(["CHAR"]); xl.CHAR(65); xl.profiling.reset(); xl.CHAR(66)
+    assert xl.profiling.report().loc["CHAR", "calls"] == 1
@@ -0,0 +1,52 @@
+import numpy as np, pandas as pd, pytest
+import excelfred as xl
+from excelfred import Range, ExcelError
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"a": [1.0, 2, np.nan, 4, 5], "b": ["x", "Y", None, "x", ""], "c": [1, 2, 3, 4, 5], "d": [True, False, True, True, False]})
+
+def test_numeric_columns_are_views(frame):
+    r = Range(frame)
+    assert r.shape == (5, 4) and np.shares_memory(r.columns[0], frame["a"].to_numpy())
+
+def test_counts_follow_excel_range_rules(frame):
+    r = Range(frame)
+    assert xl.COUNT(r) == 9            # a: 4 numbers, c: 5; bools and text are not counted
+    assert xl.COUNTA(r) == 17 and xl.COUNTBLANK(r) == 3
+
+def test_logicals_mixed_with_numbers_are_not_numbers():
+    r = Range([True, 2])
+    assert xl.COUNT(r) == 1 and xl.AVERAGE(r) == 2
+    assert xl.AVERAGEA(r) == 1.5       # AVERAGEA reads TRUE as 1
+
+def test_scalar_is_a_one_cell_range():
+    r = Range(5)
+    assert r.shape == (1, 1) and xl.COUNT(r) == 1 and xl.AVERAGE(r) == 5
+    assert Range("x").shape == (1, 1) and xl.COUNTA(Range(None)) == 0
+
+def test_criteria(frame):
+    assert xl.COUNTIF(Range(frame["a"]), ">1") == 3
+    assert xl.COUNTIF(Range(frame["b"]), "x") == 2 and xl.COUNTIF(Range(frame["b"]), "<>x") == 3
+    assert xl.COUNTIFS(Range(frame["a"]), ">1", Range(frame["b"]), "x") == 1
+
+def test_averages_and_aggregates_match_plain_inputs(frame):
+    assert xl.AVERAGE(Range(frame["a"])) == xl.AVERAGE([1, 2, 4, 5])
+    assert xl.AVERAGEIF(Range(frame["b"]), "x", Range(frame["c"])) == 2.5
+    assert xl.AGGREGATE(9, 6, Range(frame["a"])) == 12
+    assert xl.CORREL(Range(frame["a"]), Range(frame["c"])) == pytest.approx(xl.CORREL(frame["a"], frame["c"]))
+    assert xl.COVARIANCE_P(Range(frame["a"]), Range(frame["c"])) == pytest.approx(xl.COVARIANCE_P(frame["a"], frame["c"]))
+
+def test_error_cells_are_masked():
+    r = Range([[1, ExcelError.NA], [None, "3"]])
+    assert r.errors.tolist() == [[False, True], [False, False]] and r.blank.tolist() == [[False, False], [True, False]]
+
+def test_reference_source(frame):
+    assert Range(xl.Reference("A1:C3", frame)).shape == (3, 3)
+    with pytest.raises(ValueError, match="#REF!"): Range(xl.Reference("A1:A9", frame))
+
+def test_registry_and_formulas_pass_other_functions_the_cells():
+    words, row = Range(["a", None, "b"]), Range([[1, 2, 3]])
+    assert words.tolist() == ["a", None, "b"] and row.tolist() == [[1, 2, 3]]
+    assert xl.registry["CONCAT"](words) == "ab" and xl.evaluate("=CONCAT(w)", {"w": words}) == "ab"
+    assert xl.evaluate("=COLUMNS(r)", {"r": row}) == 3 and xl.registry["COUNT"](row) == 3
@@ -0,0 +1,18 @@
+import numpy as np, pandas as pd
+import excelfred as xl
+from excelfred import Reference
+
+def test_a1_range_is_a_view_of_the_frame():
+    df = pd.DataFrame(np.arange(12).reshape(4, 3)); ref = Reference("Sheet1!$B$2:C4", df)
+    assert ref.sheet == "Sheet1" and ref.values.tolist() == [[4, 5], [7, 8], [10, 11]]
+    assert np.shares_memory(ref.values, df.to_numpy())
+
+def test_positions_feed_column_areas_and_cell():
+    ref = Reference("$B$2:C4", pd.DataFrame(np.zeros((4, 3))))
+    assert xl.COLUMN(ref) == [2, 3] and xl.COLUMNS(ref) == 2 and xl.CELL("address", ref) == "$B$2"
+    assert xl.AREAS(Reference("A1:B2,D4")) == 2 and xl.evaluate("=COLUMNS(B1:D3)") == 3
+
+def test_r1c1_relative_to_origin_and_whole_columns():
+    df = pd.DataFrame(np.arange(12).reshape(4, 3))
+    assert Reference("R2C2:R[2]C[1]", df, a1=False, origin=(2, 2)).address() == "$B$2:$C$4"
+    assert Reference("B:B", df).bounds() == (0, 1, 3, 1)
@@ -0,0 +1,23 @@
+import numpy as np, pytest
+import excelfred as xl
+
+def test_lookup_accepts_excel_and_python_spellings():
+    assert xl.registry["beta.dist"] is xl.registry["_xlfn.BETA.DIST"] is xl.registry["BETA_DIST"]
+    assert xl.registry["COMBIN"](10, 2) == 45 and "CONCAT" in xl.registry
+    assert xl.registry["BETA_DIST"].min_args == 4 and xl.registry["CONCAT"].max_args is None
+
+def test_vectorized_flag_lists_only_broadcasting_functions():
+    flagged = {f.name for f in xl.registry if f.vectorized}
+    assert flagged == {"BESSELI", "BESSELJ", "BESSELK", "BESSELY", "CEILING_MATH", "COMBIN", "COMBINA"}
+    assert not xl.registry["CUBEVALUE"].vectorized and not xl.registry["CUBEVALUE_GRID"].vectorized
+    for name in flagged:
+        out = xl.registry[name](*([np.array([1.0, 2.0])] * xl.registry[name].min_args))
+        assert np.shape(out) == (2,)
+
+def test_spills_and_volatile_flags():
+    assert xl.registry["ACOS"].spills and not xl.registry["COMBIN"].spills
+    assert xl.registry["CELL"].volatile and not xl.registry["ABS"].volatile
+
+def test_letter_listings_hold_only_excel_functions():
+    assert "COMBIN" in xl.C and "Cube" not in xl.C and "col" not in xl.C and "CUBEVALUE" in xl.C
+    assert xl.B == sorted(xl.B) and all(name.isupper() for name in xl.B) and xl.R == "No functions starting with 'R'"
@@ -0,0 +1,42 @@
+import numpy as np, pandas as pd, pytest
+import excelfred as xl
+from excelfred import ExcelError
+
+@pytest.fixture
+def spilling():
+    with xl.spilling: yield
+
+def test_scalar_calls_unchanged(spilling):
+    assert xl.ABS(11, 7) == 18
+    assert xl.CHAR(65) == "A"
+
+def test_array_arguments_spill(spilling):
+    assert xl.ABS([11, -7]).tolist() == [11, 7]
+    assert xl.CHAR([65, 66, 67]).tolist() == ["A", "B", "C"]
+    assert xl.BITAND([[12], [10]], [6, 3, 1]).tolist() == [[4, 0, 0], [2, 2, 0]]
+
+def test_out_of_domain_cells_take_scalar_errors(spilling):
+    out = xl.ACOS([0.5, 2])
+    assert out[0] == pytest.approx(np.arccos(0.5)) and out[1] is ExcelError.VALUE
+    assert xl.CHAR([65, 0]).tolist()[1] is ExcelError.VALUE
+
+def test_shorter_array_pads_with_na(spilling):
+    assert xl.COMPLEX([1, 2], [3, 4, 5]).tolist() == ["1+3i", "2+4i", ExcelError.NA]
+
+@pytest.mark.parametrize("name, args", [("ATAN", ([1, 2], [3, 4])), ("ATAN", ([1.0, 2.0], [3.0, 4.0])), ("ACOS", ([0.1, 0.2], [0.3, 0.4])),
+                                        ("CHAR", ([65, 66], [1, 2]))])
+def test_kernel_not_used_with_wrong_argument_count(spilling, name, args):
+    """Unary kernels must not see extra arguments (np.arctan would take the second array as its `out` buffer)."""
+    out = getattr(xl, name)(*args)
+    assert all(isinstance(v, ExcelError) for v in out.tolist())
+
+def test_series_and_frame_shapes_kept(spilling):
+    s = pd.Series([0.5, -1.0], index=["a", "b"])
+    assert list(xl.ASIN(s).index) == ["a", "b"]
+    df = pd.DataFrame({"x": [1.0, 2.0], "y": [3.0, 4.0]})
+    assert xl.COS(df).shape == (2, 2) and list(xl.COS(df).columns) == ["x", "y"]
+
+def test_disable_restores_scalar_function():
+    with xl.spilling: pass
+    assert not xl.spilling.enabled
+    with pytest.raises(Exception): xl.CHAR([65])
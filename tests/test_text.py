@@ -0,0 +1,26 @@
+import numpy as np, pandas as pd
+import excelfred as xl
+
+def test_arraytotext_formats():
+    assert xl.ARRAYTOTEXT(["apple", "banana", "cherry"]) == '["apple,banana,cherry"]'
+    assert xl.ARRAYTOTEXT(["apple", "banana", "cherry"], format=1) == '{"apple";"banana";"cherry"}'
+    assert xl.ARRAYTOTEXT([[1, 2], [3, 4], None], format=1) == '{"1";"2";"3";"4";""}'
+
+def test_arraytotext_frames_blank_nan_and_double_quotes():
+    df = pd.DataFrame({"a": [1.5, None], "b": ["x", 'y"z']})
+    assert xl.ARRAYTOTEXT(df, 1) == '{"1.5";"x";"";"y""z"}'
+
+def test_chunked_output_matches_one_string():
+    df = pd.DataFrame(np.arange(30).reshape(10, 3))
+    for fmt in (0, 1):
+        assert "".join(xl.ARRAYTOTEXT(df, fmt, chunk_size=4)) == xl.ARRAYTOTEXT(df, fmt)
+    assert "".join(xl.CONCAT(range(50), chunk_size=7)) == xl.CONCAT(range(50)) == "".join(map(str, range(50)))
+
+def test_concat_flattens_lists_and_formats_logicals():
+    assert xl.CONCAT("a", ["b", "c"], True, None) == "abcTRUE"
+
+def test_float32_and_datetime_columns_print_from_their_own_dtype():
+    df = pd.DataFrame({"f": np.array([0.1, 2.5], dtype=np.float32), "d": pd.to_datetime(["2024-01-01 00:00", "2024-01-02 10:30"])})
+    assert xl.ARRAYTOTEXT(df, 1) == '{"0.1";"2024-01-01 00:00:00";"2.5";"2024-01-02 10:30:00"}'
+    assert xl.CONCAT(np.array([0.1], dtype=np.float32), df["d"].to_numpy()) == "0.12024-01-01 00:00:002024-01-02 10:30:00"
+    assert xl.ARRAYTOTEXT(pd.DataFrame({"d": pd.to_datetime([None])}), 1) == '{""}'
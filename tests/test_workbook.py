@@ -0,0 +1,45 @@
+import pytest
+import excelfred as xl
+from excelfred import Workbook
+
+def test_edits_recalculate_only_downstream_cells():
+    wb = Workbook(); s = wb.add_sheet("Model")
+    s["A1"] = 100; s["A2"] = 0.2; s["B1"] = "=A1 * (1 + A2)"; s["B2"] = "=B1 * 2"; s["C1"] = "=A2 * 10"
+    assert s["B2"] == pytest.approx(240) and s["C1"] == pytest.approx(2)
+    s["A1"] = 50
+    assert wb.recalculate() == 2 and s["B2"] == pytest.approx(120)
+
+def test_cycle_leaves_unrelated_cells_readable():
+    wb = Workbook(); s = wb.add_sheet("S")
+    s["A1"] = "=B1 + 1"; s["B1"] = "=A1"; s["C1"] = "=A1 * 2"; s["D1"] = 5; s["E1"] = "=D1 * 3"
+    assert s["E1"] == 15 and s["D1"] == 5
+    for addr in ["A1", "B1", "C1", "A1:C1"]:
+        with pytest.raises(ValueError, match=r"#REF!.*Circular reference: S!A1 -> S!B1 -> S!A1|#REF!.*Circular reference: S!B1 -> S!A1 -> S!B1"): s[addr]
+    s["D1"] = 7
+    assert s["E1"] == 21
+
+def test_new_reader_of_a_cycle_joins_it_and_breaking_the_cycle_clears_it():
+    wb = Workbook(); s = wb.add_sheet("S")
+    s["A1"] = "=B1 + 1"; s["B1"] = "=A1"; s["D1"] = 1
+    assert s["D1"] == 1
+    s["C1"] = "=A1 * 2"
+    with pytest.raises(ValueError, match="Circular"): s["C1"]
+    s["B1"] = 4
+    assert (s["A1"], s["C1"]) == (5, 10) and not wb._circular
+
+def test_iterative_workbook_converges():
+    wb = Workbook(iterative=True); t = wb.add_sheet("S"); t["A1"] = "=B1 / 2 + 1"; t["B1"] = "=A1"
+    assert t["A1"] == pytest.approx(2, abs=0.01)
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_recalculation_matches_serial(executor):
+    def build(workers):
+        wb = Workbook(workers=workers, executor=executor); s = wb.add_sheet("S")
+        for i in range(1, 9):
+            s[f"A{i}"] = i; s[f"B{i}"] = f"=COMBIN(A{i} + 10, 3)"; s[f"C{i}"] = f'=CONVERT(B{i}, "m", "km") + A{i}'
+        s["D1"] = "=C1 + C2 + C3 + C4 + C5 + C6 + C7 + C8"
+        return wb, s
+    (serial, s1), (pooled, s2) = build(1), build(3)
+    assert s2["D1"] == pytest.approx(s1["D1"]) and s2["C1:C8"] == s1["C1:C8"]
+    s1["A3"] = 100; s2["A3"] = 100
+    assert s2["D1"] == pytest.approx(s1["D1"])